@@ -3,7 +3,7 @@ LSM KV Store - A simple LSM tree-based key-value store implementation.
 """
 
 from lsmkv.core.kvstore import LSMKVStore
-from lsmkv.core.dto import Entry, WALRecord, GetResult, OperationType
+from lsmkv.core.dto import Entry, WALRecord, GetResult, OperationType, OP_PUT, OP_DELETE
 from lsmkv.core.sstable_manager import SSTableManager
 from lsmkv.storage.bloom_filter import BloomFilter
 from lsmkv.storage.sparse_index import SparseIndex
@@ -17,6 +17,8 @@ __all__ = [
     "WALRecord", 
     "GetResult", 
     "OperationType",
+    "OP_PUT",
+    "OP_DELETE",
     "SSTableManager",
     "BloomFilter",
     "SparseIndex",
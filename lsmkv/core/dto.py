@@ -1,77 +1,170 @@
 """
 Data Transfer Objects for the LSM KV Store.
 """
-import json
+import struct
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 from enum import Enum
 
 
 class OperationType(Enum):
-    """Types of operations in the WAL."""
+    """Types of operations in the WAL (public API; records store OP_* codes)."""
     PUT = "PUT"
     DELETE = "DELETE"
 
 
+# WAL op codes, used directly on the hot path and on disk.
+# 0 is reserved so zero-filled regions never parse as records.
+OP_PUT = 1
+OP_DELETE = 2
+
+_OP_CODES = {OperationType.PUT: OP_PUT, OperationType.DELETE: OP_DELETE}
+
+# Enum value ("PUT"/"DELETE") -> op code, bound once so decoders never call OperationType(...)
+OP_CODES_BY_NAME = {member.value: _OP_CODES[member] for member in OperationType}
+
+# Binary WAL record header: [op(1)][key_length(4)][value_length(4)][timestamp(8)]
+WAL_HEADER = struct.Struct('<BIIQ')
+
+
+# The DTOs below declare __slots__ by hand rather than via dataclass(slots=True),
+# which only exists on Python 3.10+: no per-instance __dict__ on any version
+# (smaller objects, faster construction and attribute access).
+
+
 @dataclass
 class Entry:
-    """Represents a key-value entry in the store."""
+    """
+    Represents a key-value entry in the store.
+
+    A tombstone is an entry whose value is None; is_deleted is derived from
+    that rather than stored. Values written by put() are always strings
+    (possibly empty), so None is unambiguous.
+    """
+    __slots__ = ("key", "value", "timestamp")
+
     key: str
     value: Optional[str]
     timestamp: int
-    is_deleted: bool = False
+
+    def __init__(self, key: str, value: Optional[str], timestamp: int, is_deleted: bool = False):
+        """
+        Initialize an entry.
+
+        Args:
+            key: The key
+            value: The value (None for a tombstone)
+            timestamp: Write timestamp
+            is_deleted: Force a tombstone; the value is dropped
+        """
+        self.key = key
+        self.value = None if is_deleted else value
+        self.timestamp = timestamp
+
+    @property
+    def is_deleted(self) -> bool:
+        """True if this entry is a tombstone."""
+        return self.value is None
     
+    # Comparisons go straight to the keys; a non-Entry operand has no .key
+    # and falls back to NotImplemented via the (free on success) except path.
     def __lt__(self, other):
         """Compare entries by key for skiplist ordering."""
-        if not isinstance(other, Entry):
+        try:
+            return self.key < other.key
+        except AttributeError:
             return NotImplemented
-        return self.key < other.key
     
     def __eq__(self, other):
         """Compare entries by key."""
-        if not isinstance(other, Entry):
+        try:
+            return self.key == other.key
+        except AttributeError:
             return NotImplemented
-        return self.key == other.key
 
 
 @dataclass
 class WALRecord:
-    """Represents a record in the Write-Ahead Log."""
-    operation: OperationType
+    """
+    Represents a record in the Write-Ahead Log.
+
+    operation is an OP_* code; an OperationType member is accepted and
+    converted on construction.
+    """
+    __slots__ = ("operation", "key", "value", "timestamp")
+
+    operation: int
     key: str
     value: Optional[str]
     timestamp: int
+
+    def __post_init__(self):
+        if isinstance(self.operation, OperationType):
+            self.operation = _OP_CODES[self.operation]
     
-    def serialize(self) -> str:
-        """Serialize the WAL record to a JSON string."""
-        record = {
-            "op": self.operation.value,
-            "key": self.key,
-            "value": self.value,
-            "ts": self.timestamp
-        }
-        return json.dumps(record, separators=(',', ':')) + '\n'
+    def serialize(self) -> bytes:
+        """
+        Serialize the WAL record to length-prefixed binary form.
+        
+        Format: [op(1)][key_length(4)][value_length(4)][timestamp(8)][key][value]
+        
+        Returns:
+            Serialized record bytes
+        """
+        key_bytes = self.key.encode('utf-8')
+        value_bytes = (self.value or '').encode('utf-8')
+        header = WAL_HEADER.pack(
+            self.operation, len(key_bytes), len(value_bytes), self.timestamp
+        )
+        return header + key_bytes + value_bytes
 
     @staticmethod
-    def deserialize(line: str) -> 'WALRecord':
-        """Deserialize a WAL record from a JSON string."""
-        stripped = line.strip()
-        if not stripped:
-            raise ValueError("Empty WAL record")
+    def deserialize(data: bytes, offset: int = 0) -> Tuple['WALRecord', int]:
+        """
+        Deserialize a WAL record from binary data.
+        
+        Args:
+            data: Byte buffer containing serialized records
+            offset: Starting offset in data
+            
+        Returns:
+            Tuple of (WALRecord, offset just past the record)
+            
+        Raises:
+            ValueError: If the record is truncated or has an unknown op code
+        """
+        header_end = offset + WAL_HEADER.size
+        if header_end > len(data):
+            raise ValueError("Truncated WAL record header")
 
-        record = json.loads(stripped)
+        operation, key_length, value_length, timestamp = WAL_HEADER.unpack_from(data, offset)
+        if operation != OP_PUT and operation != OP_DELETE:
+            raise ValueError(f"Unknown WAL op code: {operation}")
+
+        key_end = header_end + key_length
+        value_end = key_end + value_length
+        if value_end > len(data):
+            raise ValueError("Truncated WAL record payload")
+
+        key = bytes(data[header_end:key_end]).decode('utf-8')
+        if operation == OP_DELETE:
+            value = None
+        else:
+            value = bytes(data[key_end:value_end]).decode('utf-8')
 
         return WALRecord(
-            operation=OperationType(record["op"]),
-            key=record["key"],
-            value=record["value"],
-            timestamp=record["ts"]
-        )
+            operation=operation,
+            key=key,
+            value=value,
+            timestamp=timestamp
+        ), value_end
 
 
 @dataclass
 class GetResult:
     """Result of a GET operation."""
+    __slots__ = ("key", "value", "found")
+
     key: str
     value: Optional[str]
     found: bool
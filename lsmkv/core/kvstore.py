@@ -1,16 +1,52 @@
 """
 Main LSM-based Key-Value Store implementation with MemtableManager and SSTableManager.
 """
+import logging
 import os
+import queue
 import threading
 import time
-from typing import Optional, List
+from concurrent.futures import Future
+from typing import Dict, Iterable, Optional, List, Tuple
 from lsmkv.storage.memtable import Memtable
 from lsmkv.storage.wal import WAL
 from lsmkv.storage.sstable import SSTableMetadata
 from lsmkv.core.memtable_manager import MemtableManager
 from lsmkv.core.sstable_manager import SSTableManager
-from lsmkv.core.dto import Entry, WALRecord, OperationType, GetResult
+from lsmkv.core.dto import Entry, WALRecord, GetResult, OP_PUT, OP_DELETE
+
+logger = logging.getLogger(__name__)
+
+
+# Size limits (module-level so validation reads them as globals)
+MAX_KEY_SIZE = 1024        # 1 KB
+MAX_VALUE_SIZE = 1048576   # 1 MB
+
+
+def _check_encodable(text: str, what: str):
+    """
+    Reject strings the WAL cannot store as UTF-8 (e.g. lone surrogates),
+    so a bad write is rejected before it reaches the WAL.
+    """
+    if text.isascii():
+        return
+    try:
+        text.encode('utf-8')
+    except UnicodeEncodeError as e:
+        raise ValueError(f"{what} is not valid UTF-8 text: {e.reason} at position {e.start}") from None
+
+
+class _PendingWrite:
+    """A write waiting in the group-commit queue; the committer assigns its timestamp."""
+
+    __slots__ = ("operation", "key", "value", "timestamp", "future")
+
+    def __init__(self, operation: int, key: str, value: Optional[str]):
+        self.operation = operation
+        self.key = key
+        self.value = value
+        self.timestamp = 0
+        self.future: "Future[bool]" = Future()
 
 
 class LSMKVStore:
@@ -28,7 +64,13 @@ class LSMKVStore:
         base_level_size_mb: float = 1.0,
         base_level_entries: int = 1000,
         max_l0_sstables: int = 4,
-        soft_limit_ratio: float = 0.85
+        soft_limit_ratio: float = 0.85,
+        optimize_filters_for_hits: bool = False,
+        prewarm_sstables: bool = False,
+        # Durability settings
+        durability: str = "sync",
+        wal_flush_interval_ms: int = 10,
+        group_commit_delay_us: int = 200
     ):
         """
         Initialize the KV store with leveled compaction.
@@ -44,13 +86,31 @@ class LSMKVStore:
             base_level_entries: L0 max entries (default: 1000)
             max_l0_sstables: Max SSTables in L0 before compaction (default: 4)
             soft_limit_ratio: Trigger compaction at % of hard limit (default: 0.85 = 85%)
+            optimize_filters_for_hits: Skip Bloom filters on the bottom SSTable
+                level; speeds up reads of existing keys, slows misses (default: False)
+            prewarm_sstables: Load existing SSTables' filters and indexes in the
+                background on open instead of on first read (default: False)
+            durability: WAL durability level (default: "sync"):
+                "sync" fsyncs before put/delete return;
+                "periodic" fsyncs in the background every wal_flush_interval_ms,
+                so a crash can lose writes from the last interval;
+                "async" leaves fsync to sync()/close(), so an OS crash can lose
+                every write since the last sync (a process crash loses none)
+            wal_flush_interval_ms: Background WAL flush interval for "periodic"
+            group_commit_delay_us: With "sync" durability, how long the committer
+                waits for more writers once a mid-sized batch has formed, so
+                they share one fsync (0 disables the wait)
         """
         self.data_dir = data_dir
         self.sstables_dir = os.path.join(data_dir, "sstables")
         self.memtable_size = memtable_size
         
         # Initialize storage components
-        self.wal = WAL(f"{data_dir}/wal.log")
+        self.wal = WAL(
+            f"{data_dir}/wal.log",
+            durability=durability,
+            flush_interval_ms=wal_flush_interval_ms
+        )
         
         # Initialize SSTableManager with leveled compaction
         self.sstable_manager = SSTableManager(
@@ -60,7 +120,9 @@ class LSMKVStore:
             base_level_size_mb=base_level_size_mb,
             base_level_entries=base_level_entries,
             max_l0_sstables=max_l0_sstables,
-            soft_limit_ratio=soft_limit_ratio
+            soft_limit_ratio=soft_limit_ratio,
+            optimize_filters_for_hits=optimize_filters_for_hits,
+            prewarm_sstables=prewarm_sstables
         )
         
         # Initialize MemtableManager with thread pool
@@ -72,57 +134,79 @@ class LSMKVStore:
             on_flush_callback=self._flush_memtable_to_sstable
         )
         
-        # Write lock: ensures WAL and memtable ordering stay consistent.
-        # Without this, concurrent put() can have different order in WAL vs memtable.
+        # Write lock: orders enqueues against close(), so no write can land
+        # behind the shutdown sentinel. Timestamps are assigned by the committer
+        # in queue order, so WAL and memtable order follow timestamp order.
         self._write_lock = threading.Lock()
 
+        # Group commit: writers enqueue, one committer thread batches WAL fsyncs
+        self._commit_queue: "queue.Queue[Optional[_PendingWrite]]" = queue.Queue()
+        self._committer: Optional[threading.Thread] = None
+        self._group_commit_delay = group_commit_delay_us / 1000000.0 if durability == "sync" else 0.0
+
         # Shutdown flag: rejects new writes during/after close()
         self._closed = False
 
-        # Timestamp generation: wall clock + guard against backward/same-microsecond
+        # Timestamp generation: monotonic clock anchored to wall-clock microseconds
+        # once at startup, so timestamps stay comparable across restarts while
+        # NTP steps during this session cannot move them backward.
+        self._ts_epoch_us = time.time_ns() // 1000 - time.monotonic_ns() // 1000
         self._last_timestamp = 0
-        self._timestamp_lock = threading.Lock()
+
+        # Newest timestamp applied to a memtable; WAL records past it may not be
+        # in any memtable yet, so WAL truncation never goes beyond it.
+        self._applied_timestamp = 0
 
         # Load existing data
         self.sstable_manager.load_from_manifest()
         self._recover_from_wal()
+
+        self._committer = threading.Thread(
+            target=self._commit_loop,
+            name="wal-committer",
+            daemon=True
+        )
+        self._committer.start()
     
     
     def _recover_from_wal(self):
         """Recover memtables from the WAL on startup."""
-        print("Recovering from WAL...")
-        records = self.wal.read_all()
-
         # Seed _last_timestamp so new writes win over both WAL and SSTable data.
         # WAL may be empty after clean shutdown; SSTables retain prior timestamps.
         # If clock drifted backward between sessions, new writes must still win.
-        max_ts = 0
+        # SSTable max comes from manifest metadata, so no data files are read.
+        max_ts = max(self.sstable_manager.get_max_timestamp(), self.wal.checkpoint)
+
+        # Clean shutdown leaves an empty WAL: nothing to replay
+        if self.wal.is_empty():
+            self._last_timestamp = max(self._last_timestamp, max_ts)
+            self._applied_timestamp = self._last_timestamp
+            return
+
+        logger.info("Recovering from WAL...")
+        # Records at or below the checkpoint were flushed before the last
+        # shutdown but shared a segment with newer ones
+        checkpoint = self.wal.checkpoint
+        records = [
+            (key, value, timestamp, operation == OP_DELETE)
+            for operation, key, value, timestamp in self.wal.read_raw_parallel()
+            if timestamp > checkpoint
+        ]
         if records:
-            max_ts = max(r.timestamp for r in records)
-        sstable_entries = self.sstable_manager.get_all_entries()
-        if sstable_entries:
-            max_ts = max(max_ts, max(e.timestamp for e in sstable_entries))
-        if max_ts > 0:
-            with self._timestamp_lock:
-                self._last_timestamp = max(self._last_timestamp, max_ts)
-
-        for record in records:
-            entry = Entry(
-                key=record.key,
-                value=record.value,
-                timestamp=record.timestamp,
-                is_deleted=(record.operation == OperationType.DELETE)
-            )
-            
-            if record.operation == OperationType.PUT:
-                self.memtable_manager.put(entry)
-            elif record.operation == OperationType.DELETE:
-                self.memtable_manager.delete(entry)
+            max_ts = max(max_ts, max(r[2] for r in records))
+
+        self.memtable_manager.put_raw_many(records)
+
+        if max_ts > self._last_timestamp:
+            self._last_timestamp = max_ts
+        self._applied_timestamp = self._last_timestamp
         
-        print(f"Recovered {len(records)} records from WAL")
+        logger.info("Recovered %d records from WAL", len(records))
     
-    MAX_KEY_SIZE = 1024        # 1 KB
-    MAX_VALUE_SIZE = 1048576   # 1 MB
+    MAX_KEY_SIZE = MAX_KEY_SIZE
+    MAX_VALUE_SIZE = MAX_VALUE_SIZE
+    GROUP_COMMIT_MAX_BATCH = 256  # Max writes coalesced into one WAL fsync
+    GROUP_COMMIT_WAIT_BATCH = 12  # Smaller batches commit at once; larger ones wait for siblings
 
     def _validate_key(self, key: str):
         """Validate key type and size."""
@@ -130,15 +214,17 @@ class LSMKVStore:
             raise TypeError(f"Key must be a string, got {type(key).__name__}")
         if not key:
             raise ValueError("Key cannot be empty")
-        if len(key) > self.MAX_KEY_SIZE:
-            raise ValueError(f"Key exceeds max size ({len(key)} > {self.MAX_KEY_SIZE} bytes)")
+        if len(key) > MAX_KEY_SIZE:
+            raise ValueError(f"Key exceeds max size ({len(key)} > {MAX_KEY_SIZE} bytes)")
+        _check_encodable(key, "Key")
 
     def _validate_value(self, value: str):
         """Validate value type and size."""
         if not isinstance(value, str):
             raise TypeError(f"Value must be a string, got {type(value).__name__}")
-        if len(value) > self.MAX_VALUE_SIZE:
-            raise ValueError(f"Value exceeds max size ({len(value)} > {self.MAX_VALUE_SIZE} bytes)")
+        if len(value) > MAX_VALUE_SIZE:
+            raise ValueError(f"Value exceeds max size ({len(value)} > {MAX_VALUE_SIZE} bytes)")
+        _check_encodable(value, "Value")
 
     def put(self, key: str, value: str) -> bool:
         """
@@ -155,33 +241,39 @@ class LSMKVStore:
 
         Raises:
             TypeError: If key or value is not a string
-            ValueError: If key is empty or exceeds size limits
+            ValueError: If key is empty or exceeds size limits, or key or value is not valid UTF-8 text
 
         Raises:
             TypeError: If key or value is not a string
-            ValueError: If key is empty or exceeds size limits
+            ValueError: If key is empty or exceeds size limits, or key or value is not valid UTF-8 text
         """
         self._validate_key(key)
         self._validate_value(value)
-        if self._closed:
-            raise RuntimeError("KV store is closed")
-        with self._write_lock:
-            timestamp = self._get_timestamp()
-            wal_record = WALRecord(
-                operation=OperationType.PUT,
-                key=key,
-                value=value,
-                timestamp=timestamp
-            )
-            self.wal.append(wal_record)
-            entry = Entry(
-                key=key,
-                value=value,
-                timestamp=timestamp,
-                is_deleted=False
-            )
-            self.memtable_manager.put(entry)
-        return True
+        return self._submit_write(OP_PUT, key, value).result()
+
+    def put_async(self, key: str, value: str) -> "Future[bool]":
+        """
+        Queue a put without waiting for it to commit.
+
+        The returned future resolves to True once the write is in the WAL
+        (durable per the store's durability level) and visible to reads,
+        or raises what put() would have raised.
+
+        Args:
+            key: The key to insert
+            value: The value to insert
+
+        Returns:
+            Future for the write
+
+        Raises:
+            TypeError: If key or value is not a string
+            ValueError: If key is empty or exceeds size limits, or key or value is not valid UTF-8 text
+            RuntimeError: If the store is closed
+        """
+        self._validate_key(key)
+        self._validate_value(value)
+        return self._submit_write(OP_PUT, key, value)
     
     def get(self, key: str) -> GetResult:
         """
@@ -204,29 +296,130 @@ class LSMKVStore:
         Raises:
             TypeError: If key is not a string
             ValueError: If key is empty
+            RuntimeError: If the store is closed
         """
+        if self._closed:
+            raise RuntimeError("KV store is closed")
         self._validate_key(key)
+        found, value = self._get_raw(key)
+        return GetResult(key=key, value=value, found=found)
+
+    def get_value(self, key: str) -> Optional[str]:
+        """
+        Retrieve a value without building a GetResult.
+
+        Args:
+            key: The key to look up
+
+        Returns:
+            The value, or None if the key is missing or deleted
+
+        Raises:
+            TypeError: If key is not a string
+            ValueError: If key is empty
+            RuntimeError: If the store is closed
+        """
         if self._closed:
             raise RuntimeError("KV store is closed")
+        self._validate_key(key)
+        return self._lookup_value(key)
+
+    def contains(self, key: str) -> bool:
+        """
+        Check whether a key has a live value.
+
+        Args:
+            key: The key to look up
+
+        Returns:
+            True if the key exists and is not deleted
+
+        Raises:
+            TypeError: If key is not a string
+            ValueError: If key is empty
+            RuntimeError: If the store is closed
+        """
+        return self.get_value(key) is not None
+
+    def mget(self, keys: Iterable[str]) -> Dict[str, GetResult]:
+        """
+        Retrieve many keys at once.
+
+        Each key is checked in the memtables first; only keys they do not
+        resolve go to the SSTables, as one batch that visits each SSTable
+        once (see SSTableManager.mget). Deleted keys are not found.
+
+        Args:
+            keys: The keys to look up (duplicates are looked up once)
+
+        Returns:
+            Dict mapping each requested key to its GetResult
+
+        Raises:
+            TypeError: If a key is not a string
+            ValueError: If a key is empty or not valid UTF-8 text
+            RuntimeError: If the store is closed
+        """
+        if self._closed:
+            raise RuntimeError("KV store is closed")
+        keys = list(dict.fromkeys(keys))
+        for key in keys:
+            self._validate_key(key)
+
+        values: Dict[str, Optional[str]] = {}
+        unresolved = []
+        for key in keys:
+            # Tombstones stop the search here too, with a None value
+            entry = self.memtable_manager.get(key)
+            if entry is not None:
+                values[key] = entry.value
+            else:
+                unresolved.append(key)
+
+        if unresolved:
+            for key, entry in self.sstable_manager.mget(unresolved).items():
+                values[key] = entry.value
+
+        results = {}
+        for key in keys:
+            value = values.get(key)
+            results[key] = GetResult(key=key, value=value, found=value is not None)
+        return results
+
+    def _get_raw(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        Look up a key without validation or the closed check.
+
+        For internal callers whose keys are already known to be valid.
+
+        Args:
+            key: The key to look up
+
+        Returns:
+            Tuple of (found, value)
+        """
+        value = self._lookup_value(key)
+        return value is not None, value
+
+    def _lookup_value(self, key: str) -> Optional[str]:
+        """
+        Core read path: newest version of key, or None if missing or deleted.
+
+        Tombstones carry a None value, so a tombstone found in a newer layer
+        stops the search and yields None directly.
+        """
         # 1. Check memtable manager (active + immutable queue)
-        # NOTE: MemtableManager now returns tombstones to stop search propagation
+        # NOTE: MemtableManager returns tombstones to stop search propagation
         entry = self.memtable_manager.get(key)
-        
-        if entry:
-            # Check if it's a tombstone (delete marker)
-            if entry.is_deleted:
-                return GetResult(key=key, value=None, found=False)
-            return GetResult(key=key, value=entry.value, found=True)
+        if entry is not None:
+            return entry.value
         
         # 2. Check SSTables (newest to oldest) via SSTableManager
         entry = self.sstable_manager.get(key)
-        if entry:
-            # Check if it's a tombstone
-            if entry.is_deleted:
-                return GetResult(key=key, value=None, found=False)
-            return GetResult(key=key, value=entry.value, found=True)
+        if entry is not None:
+            return entry.value
         
-        return GetResult(key=key, value=None, found=False)
+        return None
     
     def delete(self, key: str) -> bool:
         """
@@ -242,32 +435,127 @@ class LSMKVStore:
 
         Raises:
             TypeError: If key is not a string
-            ValueError: If key is empty
+            ValueError: If key is empty or not valid UTF-8 text
 
         Raises:
             TypeError: If key is not a string
-            ValueError: If key is empty
+            ValueError: If key is empty or not valid UTF-8 text
         """
         self._validate_key(key)
-        if self._closed:
-            raise RuntimeError("KV store is closed")
+        return self._submit_write(OP_DELETE, key, None).result()
+
+    def delete_async(self, key: str) -> "Future[bool]":
+        """
+        Queue a delete without waiting for it to commit; see put_async().
+
+        Args:
+            key: The key to delete
+
+        Returns:
+            Future for the write
+
+        Raises:
+            TypeError: If key is not a string
+            ValueError: If key is empty or not valid UTF-8 text
+            RuntimeError: If the store is closed
+        """
+        self._validate_key(key)
+        return self._submit_write(OP_DELETE, key, None)
+
+    def _submit_write(self, operation: int, key: str, value: Optional[str]) -> "Future[bool]":
+        """
+        Queue a write for group commit.
+
+        Args:
+            operation: OP_PUT or OP_DELETE
+            key: The key being written
+            value: The value (None for DELETE)
+
+        Returns:
+            Future resolved by the committer once the write is durable and visible
+
+        Raises:
+            RuntimeError: If the store is closed
+        """
+        pending = _PendingWrite(operation, key, value)
         with self._write_lock:
-            timestamp = self._get_timestamp()
-            wal_record = WALRecord(
-                operation=OperationType.DELETE,
-                key=key,
-                value=None,
-                timestamp=timestamp
-            )
-            self.wal.append(wal_record)
-            entry = Entry(
-                key=key,
-                value=None,
-                timestamp=timestamp,
-                is_deleted=True
-            )
-            self.memtable_manager.delete(entry)
-        return True
+            if self._closed:
+                raise RuntimeError("KV store is closed")
+            self._commit_queue.put(pending)
+        return pending.future
+
+    def _commit_loop(self):
+        """
+        Committer thread: drain queued writes, fsync them to the WAL as one
+        batch, then apply them to the memtable in submission order.
+        A None item is the shutdown sentinel; close() enqueues it last.
+
+        Batches below GROUP_COMMIT_WAIT_BATCH commit immediately (low load,
+        latency matters). Under contention the committer waits up to the
+        group-commit delay for more writers before paying the fsync, and a
+        full batch commits immediately.
+        """
+        while True:
+            batch = [self._commit_queue.get()]
+            while len(batch) < self.GROUP_COMMIT_MAX_BATCH:
+                try:
+                    batch.append(self._commit_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if self._group_commit_delay and batch[-1] is not None and \
+                    len(batch) >= self.GROUP_COMMIT_WAIT_BATCH:
+                deadline = time.monotonic() + self._group_commit_delay
+                while len(batch) < self.GROUP_COMMIT_MAX_BATCH and batch[-1] is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._commit_queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+            stop = batch[-1] is None
+            pending = [item for item in batch if item is not None]
+            if pending:
+                self._commit_batch(pending)
+            if stop:
+                return
+
+    def _commit_batch(self, pending: List[_PendingWrite]):
+        """
+        Timestamp a batch from one clock read, write it to the WAL with one
+        fsync, then apply it to the memtable.
+
+        Args:
+            pending: Queued writes, in submission order
+        """
+        timestamp = self._reserve_timestamps(len(pending))
+        records = []
+        for p in pending:
+            p.timestamp = timestamp
+            records.append(WALRecord(p.operation, p.key, p.value, timestamp))
+            timestamp += 1
+
+        try:
+            self.wal.append_batch(records)
+        except Exception as e:
+            for p in pending:
+                p.future.set_exception(e)
+            return
+
+        for p in pending:
+            try:
+                entry = Entry(p.key, p.value, p.timestamp)
+                if p.operation == OP_DELETE:
+                    self.memtable_manager.delete(entry)
+                else:
+                    self.memtable_manager.put(entry)
+                self._applied_timestamp = p.timestamp
+            except Exception as e:
+                p.future.set_exception(e)
+            else:
+                p.future.set_result(True)
     
     def _flush_memtable_to_sstable(self, memtable: Memtable):
         """
@@ -285,29 +573,28 @@ class LSMKVStore:
         # Delegate SSTable creation to SSTableManager
         self.sstable_manager.add_sstable(entries)
         
-        # Clear corresponding WAL entries
-        # Note: For simplicity, we clear entire WAL after flush
-        # In production, would track WAL offsets per memtable
-        self._clear_wal_for_flushed_data(entries)
+        # Drop WAL segments that are now fully covered by SSTables
+        self._truncate_wal(exclude=memtable)
     
-    def _clear_wal_for_flushed_data(self, flushed_entries: List[Entry]):
+    def _truncate_wal(self, exclude: Optional[Memtable] = None):
         """
-        Clear WAL entries for flushed data.
-        Uses WAL.replace_with_filtered for atomic read-filter-replace under single lock.
-        Prevents race where concurrent put() appends are lost.
+        Drop WAL segments whose records have all been flushed to SSTables.
+
+        Timestamps are assigned and applied in order, so every record older
+        than the oldest unflushed memtable entry is already in an SSTable.
+        _applied_timestamp is read first: records appended to the WAL but not
+        yet applied to a memtable are newer than it and are kept.
 
         Args:
-            flushed_entries: Entries that were flushed
+            exclude: A memtable that was just flushed but may still be tracked
         """
-        flushed_ts = {}
-        for entry in flushed_entries:
-            if entry.key not in flushed_ts or entry.timestamp > flushed_ts[entry.key]:
-                flushed_ts[entry.key] = entry.timestamp
-
-        def keep_record(r):
-            return r.key not in flushed_ts or r.timestamp > flushed_ts[r.key]
-
-        self.wal.replace_with_filtered(keep_record)
+        applied = self._applied_timestamp
+        oldest_unflushed = self.memtable_manager.unflushed_min_timestamp(exclude=exclude)
+        if oldest_unflushed is None:
+            upto = applied
+        else:
+            upto = min(oldest_unflushed - 1, applied)
+        self.wal.truncate_upto(upto)
     
     def flush(self) -> SSTableMetadata:
         """
@@ -325,10 +612,10 @@ class LSMKVStore:
         try:
             entries = immutable.get_all_entries()
             metadata = self.sstable_manager.add_sstable(entries)
-            self._clear_wal_for_flushed_data(entries)
-            return metadata
         finally:
             self.memtable_manager.remove_flushed_immutable(immutable)
+        self._truncate_wal()
+        return metadata
     
     def compact(self) -> SSTableMetadata:
         """
@@ -342,34 +629,55 @@ class LSMKVStore:
         self.sstable_manager.wait_for_compaction(timeout=30.0)
         return self.sstable_manager.compact()
     
-    def _get_timestamp(self) -> int:
-        """Get monotonically increasing timestamp in microseconds.
-        Uses time.time() (wall clock) so timestamps survive reboots and
-        newer-wins semantics work across restarts. Guards against NTP
-        clock going backward and same-microsecond collisions.
-        """
-        now = int(time.time() * 1000000)
-        with self._timestamp_lock:
-            if now <= self._last_timestamp:
-                now = self._last_timestamp + 1
-            self._last_timestamp = now
-            return now
+    def sync(self):
+        """
+        Make every acknowledged write durable on disk.
+
+        Only needed with "periodic" or "async" durability; with "sync"
+        every put/delete is already fsynced before it returns.
+        """
+        self.wal.sync()
+
+    def _reserve_timestamps(self, count: int) -> int:
+        """Reserve `count` consecutive timestamps in microseconds; return the first.
+        Reads time.monotonic_ns() (an integer, no float math) once, offset by the
+        wall-clock epoch captured at startup, so timestamps survive reboots and
+        newer-wins semantics work across restarts. Guards against collisions
+        with the previous batch and a wall clock that was behind the previous
+        session. Caller must be the committer thread (the only writer of
+        _last_timestamp once recovery is done).
+        """
+        first = time.monotonic_ns() // 1000 + self._ts_epoch_us
+        last = self._last_timestamp
+        if first <= last:
+            first = last + 1
+        self._last_timestamp = first + count - 1
+        return first
     
     def close(self):
         """Clean shutdown of the store. Flushes all pending data before shutdown."""
-        """Clean shutdown of the store. Flushes all pending data before shutdown."""
-        print("Closing KV store...")
-        self._closed = True
+        logger.debug("Closing KV store...")
+        with self._write_lock:
+            self._closed = True
+            self._commit_queue.put(None)
+
+        # 0. Drain the group-commit queue so every acknowledged write is in memory
+        if self._committer is not None:
+            self._committer.join()
 
         # 1. Flush all in-memory data (active + immutable queue) to SSTables
         self.memtable_manager.force_flush_all()
 
         # 2. Shutdown memtable manager FIRST — wait for all async flush workers.
-        #    They may call _clear_wal_for_flushed_data; WAL must not be cleared yet.
+        #    They may call _truncate_wal; WAL must not be cleared yet.
         self.memtable_manager.close()
 
-        # 3. NOW clear WAL — all flush workers are done, safe to clear
-        self.wal.clear()
+        # 3. NOW clear WAL — all flush workers are done, safe to clear.
+        #    Each flush already trimmed the records it covered, so this is
+        #    usually a no-op and is skipped.
+        if not self.wal.is_empty():
+            self.wal.clear()
+        self.wal.close()
 
         # 4. Shutdown SSTableManager (waits for pending compactions)
         self.sstable_manager.shutdown(wait=True, timeout=30.0)
@@ -377,7 +685,7 @@ class LSMKVStore:
         # 5. Close all SSTables (cleanup mmap) via SSTableManager
         self.sstable_manager.close()
 
-        print("KV store closed.")
+        logger.debug("KV store closed.")
     
     def stats(self) -> dict:
         """
@@ -1,14 +1,17 @@
 """
 MemtableManager - Manages active and immutable memtables with async flushing.
 """
+import logging
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional, List, Callable
+from typing import Optional, List, Callable, Tuple, Dict, Iterable
 from collections import deque
 from lsmkv.storage.memtable import Memtable
 from lsmkv.core.dto import Entry
 
+logger = logging.getLogger(__name__)
+
 
 class ImmutableMemtable:
     """Wrapper for immutable memtable awaiting flush."""
@@ -28,8 +31,8 @@ class ImmutableMemtable:
     
     def _estimate_size(self) -> int:
         """Estimate memory size of this memtable in bytes."""
-        # Rough estimate: 100 bytes per entry (key + value + overhead)
-        return len(self.memtable) * 100
+        # Tracked incrementally by the memtable (key + value + overhead per entry)
+        return self.memtable.size_bytes
     
     def get(self, key: str, include_tombstones: bool = False) -> Optional[Entry]:
         """Get entry from immutable memtable."""
@@ -87,9 +90,17 @@ class MemtableManager:
         # No maxlen — we handle overflow explicitly via _check_and_flush
         # to prevent silent data loss from deque auto-eviction
         self.immutable_queue = deque()
-        # No maxlen — we handle overflow explicitly via _check_and_flush
-        # to prevent silent data loss from deque auto-eviction
-        self.immutable_queue = deque()
+
+        # Sum of size_bytes over immutable_queue, kept in step with the deque
+        self._immutable_bytes = 0
+
+        # Memtables popped from the queue whose flush has not completed yet
+        self._flushing: List[Memtable] = []
+
+        # Read snapshot: key maps of every readable memtable, newest first.
+        # Rebuilt under self.lock whenever the set changes; readers load it
+        # without the lock.
+        self._snapshot: Tuple[Dict[str, Entry], ...] = (self.active.key_map,)
         
         # Sequence number for ordering
         self.sequence_number = 0
@@ -100,8 +111,10 @@ class MemtableManager:
             thread_name_prefix="flush-worker"
         )
         
-        # Synchronization
-        self.lock = threading.RLock()
+        # Synchronization. A plain Lock: no method re-acquires it, helpers
+        # called under it (_rotate_memtable, _check_and_flush, _publish_snapshot)
+        # never lock, and on_flush_callback always runs with it released.
+        self.lock = threading.Lock()
         
         # Stats
         self.total_flushes = 0
@@ -116,17 +129,46 @@ class MemtableManager:
         """
         with self.lock:
             self.active.put(entry)
-            if self.active.is_full():
-                to_flush_sync = self._rotate_memtable()
+            if len(self.active.key_map) >= self.memtable_size:  # active.is_full(), inlined
+                to_flush, synchronous = self._rotate_memtable()
             else:
-                to_flush_sync = None
-        if to_flush_sync is not None:
-            self._async_flush(to_flush_sync)
+                to_flush = None
+        if to_flush is not None:
+            self._dispatch_flush(to_flush, synchronous)
+    
+    def put_raw_many(self, records: Iterable[Tuple[str, Optional[str], int, bool]]):
+        """
+        Insert many (key, value, timestamp, is_deleted) records in order,
+        holding the lock across the batch instead of once per record.
+        Used by WAL replay; see Memtable.put_raw.
+        
+        The lock is only released to dispatch a flush when a rotation
+        triggers one.
+        
+        Args:
+            records: Records in timestamp order
+        """
+        remaining = iter(records)
+        while True:
+            to_flush = None
+            with self.lock:
+                active = self.active
+                for key, value, timestamp, is_deleted in remaining:
+                    active.put_raw(key, value, timestamp, is_deleted)
+                    if len(active.key_map) >= self.memtable_size:
+                        to_flush, synchronous = self._rotate_memtable()
+                        active = self.active
+                        if to_flush is not None:
+                            break
+                else:
+                    return
+            self._dispatch_flush(to_flush, synchronous)
     
     def get(self, key: str) -> Optional[Entry]:
         """
         Get an entry by key.
-        Search order: active → immutable queue (newest to oldest).
+        Search order: active → immutable queue → memtables being flushed
+        (newest to oldest). Takes no lock; see _publish_snapshot.
         
         IMPORTANT: Returns tombstone entries to stop search propagation.
         The caller (LSMKVStore) must check is_deleted flag.
@@ -137,21 +179,17 @@ class MemtableManager:
         Returns:
             Entry if found (including tombstones), None otherwise
         """
-        with self.lock:
-            # 1. Check active memtable first (most recent data)
-            # Include tombstones to stop search at delete markers
-            entry = self.active.get(key, include_tombstones=True)
-            if entry:
+        # Lock-free: one attribute load gives a consistent set of memtables.
+        # Active first, then the immutable queue and in-flight flushes,
+        # newest to oldest. Probing the key maps directly costs one C-level
+        # dict lookup per memtable (tombstones included, to stop the search).
+        for key_map in self._snapshot:
+            entry = key_map.get(key)
+            if entry is not None:
                 return entry
-            
-            # 2. Check immutable queue (newest to oldest)
-            for immutable in reversed(self.immutable_queue):
-                entry = immutable.get(key, include_tombstones=True)
-                if entry:
-                    return entry
-            
-            # 3. Not in memory (caller should check SSTables)
-            return None
+        
+        # Not in memory (caller should check SSTables)
+        return None
     
     def delete(self, entry: Entry):
         """
@@ -162,19 +200,19 @@ class MemtableManager:
         """
         with self.lock:
             self.active.delete(entry)
-            if self.active.is_full():
-                to_flush_sync = self._rotate_memtable()
+            if len(self.active.key_map) >= self.memtable_size:  # active.is_full(), inlined
+                to_flush, synchronous = self._rotate_memtable()
             else:
-                to_flush_sync = None
-        if to_flush_sync is not None:
-            self._async_flush(to_flush_sync)
+                to_flush = None
+        if to_flush is not None:
+            self._dispatch_flush(to_flush, synchronous)
     
-    def _rotate_memtable(self) -> Optional[ImmutableMemtable]:
+    def _rotate_memtable(self) -> Tuple[Optional[ImmutableMemtable], bool]:
         """
         Rotate active memtable to immutable queue and create new active.
         Triggers flush if queue is full or memory limit exceeded.
-        Returns immutable to flush synchronously if queue severely backed up, else None.
-        Caller must flush outside lock.
+        Returns (immutable to flush or None, synchronous); see _check_and_flush.
+        Caller must pass a non-None result to _dispatch_flush outside the lock.
         """
         # Move active to immutable
         immutable = ImmutableMemtable(
@@ -186,19 +224,23 @@ class MemtableManager:
         
         # Add to queue
         self.immutable_queue.append(immutable)
+        self._immutable_bytes += immutable.size_bytes
         
         # Create new active memtable
         self.active = Memtable(max_size=self.memtable_size)
+        self._publish_snapshot()
         
-        print(f"[MemtableManager] Rotated to immutable queue (size={len(self.immutable_queue)})")
+        logger.debug("Rotated to immutable queue (size=%d)", len(self.immutable_queue))
         
         return self._check_and_flush()
     
-    def _check_and_flush(self) -> Optional[ImmutableMemtable]:
+    def _check_and_flush(self) -> Tuple[Optional[ImmutableMemtable], bool]:
         """
         Check if flushing is needed. Pops one item if so.
-        Returns the immutable to flush synchronously if queue severely backed up,
-        else None (and submits to executor). Caller must NOT hold lock when doing sync flush.
+        Returns (popped immutable or None, synchronous): synchronous is True
+        when the queue is severely backed up and the caller should flush inline
+        instead of submitting to the executor. Nothing is submitted here, so
+        the executor's locks are never taken under self.lock.
         """
         should_flush = False
         reason = ""
@@ -209,29 +251,41 @@ class MemtableManager:
             reason = f"queue full ({len(self.immutable_queue)} >= {self.max_immutable})"
 
         # Reason 2: Memory limit
-        total_memory = sum(im.size_bytes for im in self.immutable_queue)
+        total_memory = self._immutable_bytes
         if total_memory >= self.max_memory_bytes:
             should_flush = True
             reason = f"memory limit ({total_memory} >= {self.max_memory_bytes} bytes)"
 
         if not should_flush:
-            return None
+            return None, False
 
         oldest = self.immutable_queue.popleft()
+        self._immutable_bytes -= oldest.size_bytes
+        self._flushing.append(oldest.memtable)
+        self._publish_snapshot()
         # Sync flush when at or above max to bound queue growth (prevents unbounded 1x-2x range)
         queue_at_limit = len(self.immutable_queue) >= self.max_immutable
 
         if queue_at_limit:
-            print(f"[MemtableManager] Queue at limit, flushing synchronously ({reason})")
+            logger.debug("Queue at limit, flushing synchronously (%s)", reason)
         else:
-            print(f"[MemtableManager] Flushing oldest memtable ({reason})")
+            logger.debug("Flushing oldest memtable (%s)", reason)
 
         self.total_flushes += 1
-
-        if queue_at_limit:
-            return oldest
-        self.flush_executor.submit(self._async_flush, oldest)
-        return None
+        return oldest, queue_at_limit
+    
+    def _dispatch_flush(self, immutable: ImmutableMemtable, synchronous: bool):
+        """
+        Flush a popped immutable inline or on the executor. Caller must NOT hold self.lock.
+        
+        Args:
+            immutable: The immutable memtable returned by _check_and_flush
+            synchronous: Flush in the calling thread instead of the executor
+        """
+        if synchronous:
+            self._async_flush(immutable)
+        else:
+            self.flush_executor.submit(self._async_flush, immutable)
     
     def _async_flush(self, immutable: ImmutableMemtable):
         """
@@ -246,16 +300,58 @@ class MemtableManager:
             # Call the flush callback if provided
             if self.on_flush_callback:
                 self.on_flush_callback(immutable.memtable)
+            self._finish_flush(immutable.memtable)
             
-            elapsed = time.time() - start_time
-            print(f"[Flush-Worker] Flushed memtable seq={immutable.sequence_number} "
-                  f"({len(immutable)} entries) in {elapsed:.3f}s")
+            logger.debug("Flushed memtable seq=%d (%d entries) in %.3fs",
+                         immutable.sequence_number, len(immutable), time.time() - start_time)
             
-        except Exception as e:
-            print(f"[Flush-Worker] Error flushing memtable: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error flushing memtable seq=%d", immutable.sequence_number)
     
+    def _finish_flush(self, memtable: Memtable):
+        """
+        Forget a memtable whose flush completed.
+        Memtables whose flush failed stay tracked, so their WAL records are kept.
+        """
+        with self.lock:
+            try:
+                self._flushing.remove(memtable)
+            except ValueError:
+                pass
+            self._publish_snapshot()
+
+    def _publish_snapshot(self):
+        """Rebuild the lock-free read snapshot. Caller must hold self.lock."""
+        key_maps = [self.active.key_map]
+        key_maps.extend(im.memtable.key_map for im in reversed(self.immutable_queue))
+        key_maps.extend(memtable.key_map for memtable in reversed(self._flushing))
+        self._snapshot = tuple(key_maps)
+
+    def unflushed_min_timestamp(self, exclude: Optional[Memtable] = None) -> Optional[int]:
+        """
+        Get the oldest timestamp still held only in memory.
+
+        Covers the active memtable, the immutable queue and memtables whose
+        flush is in progress. WAL records older than this are in SSTables.
+
+        Args:
+            exclude: A memtable to ignore (e.g. one that was just flushed)
+
+        Returns:
+            Oldest unflushed timestamp, or None if nothing is unflushed
+        """
+        with self.lock:
+            memtables = [self.active]
+            memtables.extend(im.memtable for im in self.immutable_queue)
+            memtables.extend(self._flushing)
+            oldest = None
+            for memtable in memtables:
+                if memtable is exclude or memtable.min_timestamp is None:
+                    continue
+                if oldest is None or memtable.min_timestamp < oldest:
+                    oldest = memtable.min_timestamp
+            return oldest
+
     def flush_active_sync(self) -> Optional['ImmutableMemtable']:
         """
         Atomically rotate the active memtable and return it as ImmutableMemtable.
@@ -279,6 +375,8 @@ class MemtableManager:
             )
             self.sequence_number += 1
             self.immutable_queue.append(immutable)
+            self._immutable_bytes += immutable.size_bytes
+            self._publish_snapshot()
             return immutable
 
     def remove_flushed_immutable(self, immutable: 'ImmutableMemtable'):
@@ -292,41 +390,50 @@ class MemtableManager:
         with self.lock:
             try:
                 self.immutable_queue.remove(immutable)
+                self._immutable_bytes -= immutable.size_bytes
             except ValueError:
                 pass  # Already removed (e.g. by force_flush_all)
+            self._publish_snapshot()
 
     def force_flush_all(self):
         """
         Force flush all immutable memtables synchronously.
         Useful before shutdown or manual flush.
-        Releases lock during I/O to avoid blocking put/get/delete.
+        
+        The active memtable and the whole immutable queue are taken in one
+        lock acquisition and flushed oldest first, so L0 keeps newest-last
+        order. Releases lock during I/O to avoid blocking put/get/delete.
         """
         while True:
-            to_flush = None
             with self.lock:
-                if self.immutable_queue:
-                    to_flush = self.immutable_queue.popleft()
-                elif len(self.active) > 0:
-                    to_flush = ImmutableMemtable(
+                to_flush = list(self.immutable_queue)
+                self.immutable_queue.clear()
+                self._immutable_bytes = 0
+                if len(self.active) > 0:
+                    to_flush.append(ImmutableMemtable(
                         memtable=self.active,
                         sequence_number=self.sequence_number
-                    )
+                    ))
                     self.sequence_number += 1
                     self.active = Memtable(max_size=self.memtable_size)
                     self.total_rotations += 1
-                else:
+                if not to_flush:
                     break
-            if to_flush and self.on_flush_callback:
-                self.on_flush_callback(to_flush.memtable)
+                self._flushing.extend(im.memtable for im in to_flush)
+                self._publish_snapshot()
+            for immutable in to_flush:
+                if self.on_flush_callback:
+                    self.on_flush_callback(immutable.memtable)
+                self._finish_flush(immutable.memtable)
     
     def close(self):
         """Shutdown the manager and wait for pending flushes."""
-        print("[MemtableManager] Shutting down...")
+        logger.debug("Shutting down...")
         
         # Shutdown thread pool gracefully
         self.flush_executor.shutdown(wait=True)
         
-        print("[MemtableManager] All flush workers stopped")
+        logger.debug("All flush workers stopped")
     
     def stats(self) -> dict:
         """
@@ -335,20 +442,25 @@ class MemtableManager:
         Returns:
             Dictionary with stats
         """
+        # Copy the counters under the lock; build the dict after releasing it
         with self.lock:
-            total_memory = sum(im.size_bytes for im in self.immutable_queue)
-            
-            return {
-                "active_memtable_size": len(self.active),
-                "active_memtable_full": self.active.is_full(),
-                "immutable_count": len(self.immutable_queue),
-                "immutable_queue_full": len(self.immutable_queue) >= self.max_immutable,
-                "total_memory_bytes": total_memory,
-                "memory_limit_bytes": self.max_memory_bytes,
-                "total_rotations": self.total_rotations,
-                "total_async_flushes": self.total_flushes,
-                "max_queue_size": self.max_immutable,
-            }
+            active_size = len(self.active)
+            immutable_count = len(self.immutable_queue)
+            total_memory = self._immutable_bytes
+            total_rotations = self.total_rotations
+            total_flushes = self.total_flushes
+        
+        return {
+            "active_memtable_size": active_size,
+            "active_memtable_full": active_size >= self.memtable_size,
+            "immutable_count": immutable_count,
+            "immutable_queue_full": immutable_count >= self.max_immutable,
+            "total_memory_bytes": total_memory,
+            "memory_limit_bytes": self.max_memory_bytes,
+            "total_rotations": total_rotations,
+            "total_async_flushes": total_flushes,
+            "max_queue_size": self.max_immutable,
+        }
     
     def get_all_immutable_memtables(self) -> List[ImmutableMemtable]:
         """
@@ -10,16 +10,22 @@ This class encapsulates all SSTable-related functionality including:
 - Background manifest reload with atomic swap
 - Thread-safe operations
 """
+import heapq
+import logging
 import os
+from bisect import bisect_left, bisect_right
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Optional, Dict, Set, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Dict, Set, Tuple, Union
 from lsmkv.core.dto import Entry
-from lsmkv.storage.sstable import SSTable, SSTableMetadata, LazySSTable
+from lsmkv.storage.sstable import SSTable, SSTableMetadata, LazySSTable, Record
 from lsmkv.storage.manifest import Manifest, ManifestEntry
 from lsmkv.storage.level_manifest import LevelManifestManager
 
+logger = logging.getLogger(__name__)
+
 
 class SSTableManager:
     """
@@ -27,7 +33,7 @@ class SSTableManager:
     
     Level organization:
     - Level 0: Multiple SSTables allowed, duplicates OK
-    - Level 1+: Single SSTable per level, no duplicates
+    - Level 1+: Multiple SSTables with disjoint key ranges, no duplicates
     
     Compaction triggers:
     - Entry count exceeds level limit
@@ -56,7 +62,9 @@ class SSTableManager:
                  base_level_size_mb: float = 1.0,
                  base_level_entries: int = 1000,
                  max_l0_sstables: int = 4,
-                 soft_limit_ratio: float = 0.85):
+                 soft_limit_ratio: float = 0.85,
+                 optimize_filters_for_hits: bool = False,
+                 prewarm_sstables: bool = False):
         """
         Initialize SSTable manager with leveled compaction.
         
@@ -68,6 +76,11 @@ class SSTableManager:
             base_level_entries: L0 max entries (default: 1000)
             max_l0_sstables: Max SSTables in L0 before compaction (default: 4)
             soft_limit_ratio: Trigger compaction at this % of hard limit (default: 0.85 = 85%)
+            optimize_filters_for_hits: Skip Bloom filters on the bottom level,
+                where most lookups for existing keys end (default: False)
+            prewarm_sstables: After load_from_manifest, load every SSTable's
+                Bloom filter, sparse index and mmap in the background, so
+                first reads don't pay for it (default: False, load on demand)
         """
         self.sstables_dir = sstables_dir
         
@@ -87,21 +100,46 @@ class SSTableManager:
         # Level-based organization - uses LazySSTable for memory efficiency
         self.levels: Dict[int, List[LazySSTable]] = {}
         
+        # Per-level totals for compaction checks; recomputed only when a
+        # level's SSTable list changes (see _refresh_level_totals)
+        self._level_entries: Dict[int, int] = {}
+        self._level_bytes: Dict[int, int] = {}
+        # Deepest level holding any SSTable (0 when empty), same cadence
+        self._max_nonempty_level = 0
+        
+        # Immutable view of every SSTable in lookup order (L0 newest first,
+        # then L1, L2, ...) as (min_key, max_key, sstable, use_bloom_filter),
+        # republished on every level change so get() can scan it without
+        # taking the lock
+        self._read_snapshot: Tuple[Tuple[Optional[str], Optional[str], LazySSTable, bool], ...] = ()
+        
+        # The same items grouped per level as (pivots, items). When a level's
+        # key ranges are disjoint its items are sorted by min_key and pivots
+        # lists those min_keys, so get() bisects to the one candidate;
+        # otherwise pivots is None and the items are scanned newest first
+        self._read_levels: Tuple[Tuple[Optional[List[str]], tuple], ...] = ()
+        
         # Configuration
         self.level_ratio = level_ratio
         self.base_level_size_mb = base_level_size_mb
         self.base_level_entries = base_level_entries
         self.max_l0_sstables = max_l0_sstables
         self.soft_limit_ratio = soft_limit_ratio  # 85% threshold
+        self.optimize_filters_for_hits = optimize_filters_for_hits
+        self.prewarm_sstables = prewarm_sstables
+        
+        # Per-level limits, indexed by level; extended by _ensure_level_limits
+        self._max_bytes_per_level: List[int] = [int(base_level_size_mb * 1024 * 1024)]
+        self._max_entries_per_level: List[int] = [base_level_entries]
         
         # Thread safety - use RLock for reentrant operations
         self.lock = threading.RLock()
         
-        # Background compaction thread pool (non-blocking compaction)
-        self.compaction_executor = ThreadPoolExecutor(
-            max_workers=1,  # Single compaction thread to avoid conflicts
-            thread_name_prefix="compact-worker"
-        )
+        # Background compaction thread pools (non-blocking compaction), one
+        # single-worker pool per source level, created on first use. A deep
+        # compaction no longer delays L0->L1; jobs that share SSTables are
+        # still serialized by _compacting_sstable_ids.
+        self._compaction_executors: Dict[int, ThreadPoolExecutor] = {}
         
         # Background manifest reload thread pool
         self._manifest_reload_executor = ThreadPoolExecutor(
@@ -109,8 +147,25 @@ class SSTableManager:
             thread_name_prefix="manifest-reload"
         )
         
-        # Track SSTables being compacted (snapshot isolation)
+        # Background prewarm of loaded SSTables (see prewarm_sstables)
+        self._prewarm_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="prewarm"
+        )
+        self._prewarm_future: Optional[Future] = None
+        self._prewarm_cancelled = threading.Event()
+        
+        # Deletes compacted-away SSTables off the compaction thread; unmapping
+        # and unlinking release the GIL, so several deletions overlap
+        self._deletion_executor = ThreadPoolExecutor(
+            max_workers=4,
+            thread_name_prefix="sst-delete"
+        )
+        
+        # Track SSTables being compacted (snapshot isolation), and the
+        # deletions of compaction inputs still in flight
         self._compacting_sstable_ids: Set[int] = set()
+        self._pending_deletions: Set[Future] = set()
         self._compaction_lock = threading.Lock()
         
         # Pending manifest reload flag and lock (prevents TOCTOU double submission)
@@ -125,16 +180,10 @@ class SSTableManager:
         # Create SSTables directory if it doesn't exist
         os.makedirs(self.sstables_dir, exist_ok=True)
         
-        print(f"[SSTableManager] Initialized with leveled compaction:")
-        print(f"  - Level ratio: {level_ratio}")
-        print(f"  - Soft limit: {int(soft_limit_ratio * 100)}% of hard limit")
-        print(f"  - Lazy loading: enabled (SSTables loaded on demand)")
-        print(f"  - Background compaction: enabled (non-blocking)")
-        print(f"  - Per-level manifests: {self.data_dir}/manifests/")
-        print(f"  - L0 max: {max_l0_sstables} SSTables, {base_level_entries} entries, {base_level_size_mb}MB")
-        print(f"  - L0 soft: {int(max_l0_sstables * soft_limit_ratio)} SSTables, "
-              f"{int(base_level_entries * soft_limit_ratio)} entries")
-        print(f"  - L1 max: {base_level_entries * level_ratio} entries, {base_level_size_mb * level_ratio}MB")
+        logger.debug("Initialized with leveled compaction: level ratio %d, soft limit %d%%, "
+                     "manifests in %s/manifests/, L0 max %d SSTables / %d entries / %sMB",
+                     level_ratio, int(soft_limit_ratio * 100), self.data_dir,
+                     max_l0_sstables, base_level_entries, base_level_size_mb)
     
     def _get_level_max_size_bytes(self, level: int) -> int:
         """
@@ -146,8 +195,8 @@ class SSTableManager:
         Returns:
             Maximum size in bytes for this level
         """
-        base_size_bytes = int(self.base_level_size_mb * 1024 * 1024)
-        return base_size_bytes * (self.level_ratio ** level)
+        self._ensure_level_limits(level)
+        return self._max_bytes_per_level[level]
     
     def _get_level_max_entries(self, level: int) -> int:
         """
@@ -159,7 +208,27 @@ class SSTableManager:
         Returns:
             Maximum entries for this level
         """
-        return self.base_level_entries * (self.level_ratio ** level)
+        self._ensure_level_limits(level)
+        return self._max_entries_per_level[level]
+    
+    def _ensure_level_limits(self, level: int):
+        """
+        Extend the per-level limit tables up to and including level.
+        
+        Each level's limits are the previous level's times level_ratio.
+        Both getters may run on the compaction thread, so extension happens
+        under the lock; the bytes table is extended first, so a long enough
+        entries table means both are.
+        
+        Args:
+            level: Highest level that needs limits
+        """
+        if level < len(self._max_entries_per_level):
+            return
+        with self.lock:
+            while len(self._max_entries_per_level) <= level:
+                self._max_bytes_per_level.append(self._max_bytes_per_level[-1] * self.level_ratio)
+                self._max_entries_per_level.append(self._max_entries_per_level[-1] * self.level_ratio)
     
     def _get_level_stats(self, level: int) -> dict:
         """
@@ -178,25 +247,79 @@ class SSTableManager:
                 "total_size_bytes": 0,
             }
         
-        sstables = self.levels[level]
-        total_size = 0
-        for s in sstables:
-            try:
-                if s.exists():
-                    total_size += s.size_bytes()
-            except (OSError, FileNotFoundError):
-                pass  # SSTable may have been deleted by concurrent compaction
-        
-        # Get entries count from level manifest (more efficient than searching all entries)
-        level_manifest = self.level_manifest_manager.get_level_manifest(level)
-        total_entries = level_manifest.total_entries()
-        
         return {
-            "num_sstables": len(sstables),
-            "total_entries": total_entries,
-            "total_size_bytes": total_size,
+            "num_sstables": len(self.levels[level]),
+            "total_entries": self._level_entries.get(level, 0),
+            "total_size_bytes": self._level_bytes.get(level, 0),
         }
     
+    def _refresh_level_totals(self, *levels: int):
+        """
+        Recompute the cached entry and byte totals for the given levels.
+        
+        Called with the lock held after every change to a level's SSTable
+        list, so compaction checks read the totals without rescanning.
+        SSTable sizes are cached per SSTable, so this does no filesystem
+        I/O for SSTables it has already measured. Also republishes the
+        lock-free read snapshot.
+        
+        Args:
+            levels: Levels whose SSTable lists changed
+        """
+        for level in levels:
+            total_entries = 0
+            total_size = 0
+            for sstable in self.levels.get(level, []):
+                if sstable.metadata is not None:
+                    total_entries += sstable.metadata.num_entries
+                try:
+                    total_size += sstable.size_bytes()
+                except (OSError, FileNotFoundError):
+                    pass  # SSTable may have been deleted by concurrent compaction
+            self._level_entries[level] = total_entries
+            self._level_bytes[level] = total_size
+        
+        # A key present in the tree is usually found in the bottom level,
+        # so its filters mostly answer "maybe" and can be skipped on request
+        bottom_level = max((level for level, sstables in self.levels.items() if sstables), default=0)
+        self._max_nonempty_level = bottom_level
+        skip_bloom_level = bottom_level if self.optimize_filters_for_hits and bottom_level > 0 else None
+        
+        runs = [
+            tuple(
+                (sstable.metadata.min_key, sstable.metadata.max_key, sstable, level != skip_bloom_level)
+                if sstable.metadata is not None else (None, None, sstable, level != skip_bloom_level)
+                for sstable in reversed(self.levels[level])
+            )
+            for level in sorted(self.levels.keys())
+        ]
+        self._read_snapshot = tuple(chain.from_iterable(runs))
+        self._read_levels = tuple(self._index_run(run) for run in runs if run)
+    
+    @staticmethod
+    def _index_run(run: tuple) -> Tuple[Optional[List[str]], tuple]:
+        """
+        Sort one level's snapshot items by min_key if their ranges are disjoint.
+        
+        Levels above L0 are disjoint after compaction, and L0 often is too
+        under sequential writes. Levels built by hand (add_sstable with an
+        explicit level) may overlap, so disjointness is checked, not assumed.
+        
+        Args:
+            run: The level's (min_key, max_key, sstable, use_bloom_filter)
+                items, newest first
+            
+        Returns:
+            (pivots, items sorted by min_key), or (None, run) if the level
+            has overlapping or unknown key ranges
+        """
+        if any(item[0] is None for item in run):
+            return None, run
+        by_min_key = sorted(run, key=lambda item: item[0])
+        if any(prev[1] >= cur[0] for prev, cur in zip(by_min_key, by_min_key[1:])):
+            return None, run
+        return [item[0] for item in by_min_key], tuple(by_min_key)
+    
     def load_from_manifest(self):
         """
         Load existing SSTables from level manifests using LAZY LOADING.
@@ -215,18 +338,35 @@ class SSTableManager:
             # Discover all existing level manifests
             self.level_manifest_manager.discover_levels()
             
+            # A crash during a trivial move can leave an SSTable listed at
+            # both levels; the deeper listing wins (it was written first)
+            deepest_level = {}
+            for level in self.level_manifest_manager.get_levels():
+                for entry in self.level_manifest_manager.get_level_entries(level):
+                    deepest_level[entry.sstable_id] = level
+            
             # Load SSTable METADATA from all level manifests (no actual file I/O)
             for level in self.level_manifest_manager.get_levels():
                 level_entries = self.level_manifest_manager.get_level_entries(level)
                 
+                stale_ids = [e.sstable_id for e in level_entries
+                             if deepest_level[e.sstable_id] != level]
+                if stale_ids:
+                    self.level_manifest_manager.remove_sstables(stale_ids, level=level)
+                
                 for entry in level_entries:
+                    if deepest_level[entry.sstable_id] != level:
+                        continue
+                    
                     # Create LazySSTable with metadata (no disk I/O)
                     metadata = SSTableMetadata(
                         sstable_id=entry.sstable_id,
                         dirname=entry.dirname,
                         num_entries=entry.num_entries,
                         min_key=entry.min_key,
-                        max_key=entry.max_key
+                        max_key=entry.max_key,
+                        max_timestamp=entry.max_timestamp,
+                        num_tombstones=entry.num_tombstones
                     )
                     
                     lazy_sstable = LazySSTable(
@@ -241,14 +381,45 @@ class SSTableManager:
                             self.levels[level] = []
                         self.levels[level].append(lazy_sstable)
             
+            self._refresh_level_totals(*self.levels)
+            
             total_sstables = sum(len(sstables) for sstables in self.levels.values())
             if total_sstables > 0:
-                print(f"[SSTableManager] Loaded {total_sstables} existing SSTables from level manifests")
-                for level, sstables in sorted(self.levels.items()):
-                    print(f"  - Level {level}: {len(sstables)} SSTable(s)")
+                logger.debug("Loaded %d existing SSTables from level manifests (%s)", total_sstables,
+                             ", ".join(f"L{level}: {len(sstables)}"
+                                       for level, sstables in sorted(self.levels.items())))
+            
+            if self.prewarm_sstables and total_sstables > 0:
+                self._prewarm_future = self._prewarm_executor.submit(
+                    self._prewarm, self._read_snapshot
+                )
     
-    def add_sstable(self, entries: List[Entry], level: int = 0, 
-                    auto_compact: bool = True) -> SSTableMetadata:
+    def _prewarm(self, snapshot: tuple):
+        """
+        Background worker: load the SSTables of a read snapshot.
+        
+        Walks them in lookup order (L0 newest first, then L1, L2, ...), so
+        the SSTables every lookup may reach are ready first. Bloom filters
+        that lookups skip (optimize_filters_for_hits) are not loaded.
+        
+        Args:
+            snapshot: Read snapshot to prewarm
+        """
+        start_time = time.time()
+        for _, _, sstable, use_bloom_filter in snapshot:
+            if self._prewarm_cancelled.is_set():
+                return
+            try:
+                sstable.prewarm(use_bloom_filter)
+            except (OSError, ValueError):
+                # Compacted away (and deleted) since the snapshot was taken
+                logger.debug("Skipped prewarming %s", sstable.dirname)
+        logger.debug("Prewarmed %d SSTables in %.3fs", len(snapshot), time.time() - start_time)
+    
+    def add_sstable(self, entries: Iterable[Union[Entry, Record]], level: int = 0, 
+                    auto_compact: bool = True,
+                    expected_entries: Optional[int] = None,
+                    bypass_page_cache: bool = False) -> SSTableMetadata:
         """
         Create a new SSTable from entries and add to specified level.
         
@@ -261,16 +432,22 @@ class SSTableManager:
         6. Triggers auto-compaction if enabled
         
         Args:
-            entries: List of entries to write (must be sorted by key)
+            entries: Entries or raw records to write (must be sorted by key);
+                may be an iterator, which is streamed to disk
             level: Level to add SSTable to (default: 0)
             auto_compact: Whether to trigger auto-compaction (default: True)
+            expected_entries: Upper bound on the entry count for sizing the
+                Bloom filter (see SSTable.write)
+            bypass_page_cache: Keep the new SSTable out of the page cache
+                (compaction output; see SSTable.write)
             
         Returns:
             Metadata about the created SSTable
+            
+        Raises:
+            ValueError: If entries is empty (raised by SSTable.write before
+                anything is written; the peeked SSTable ID is not consumed)
         """
-        if not entries:
-            raise ValueError("Cannot create SSTable from empty entries")
-        
         with self.lock:
             # Get next SSTable ID from level manifest manager
             sstable_id = self.level_manifest_manager.get_next_id()
@@ -279,7 +456,8 @@ class SSTableManager:
             sstable = SSTable(self.sstables_dir, sstable_id)
             
             # Write entries (creates data.db, bloom_filter.bf, sparse_index.idx)
-            metadata = sstable.write(entries)
+            metadata = sstable.write(entries, expected_entries=expected_entries,
+                                     bypass_page_cache=bypass_page_cache)
             
             # Add to level-specific manifest
             self.level_manifest_manager.add_sstable(
@@ -288,7 +466,9 @@ class SSTableManager:
                 min_key=metadata.min_key,
                 max_key=metadata.max_key,
                 level=level,
-                sstable_id=sstable_id
+                sstable_id=sstable_id,
+                max_timestamp=metadata.max_timestamp,
+                num_tombstones=metadata.num_tombstones
             )
             
             # Wrap in LazySSTable for consistent handling
@@ -306,11 +486,13 @@ class SSTableManager:
             if level not in self.levels:
                 self.levels[level] = []
             self.levels[level].append(lazy_sstable)
+            self._refresh_level_totals(level)
             
             # Trigger background manifest reload for other readers
             self._trigger_manifest_reload()
             
-            print(f"[SSTableManager] Created SSTable {metadata.dirname} at L{level} with {metadata.num_entries} entries")
+            logger.debug("Created SSTable %s at L%d with %d entries",
+                         metadata.dirname, level, metadata.num_entries)
             
             need_auto_compact = auto_compact
         
@@ -325,7 +507,11 @@ class SSTableManager:
         Search SSTables for a key using level-based search.
 
         Search order: L0 (newest to oldest) → L1 → L2 → ...
-        Snapshot taken under lock; I/O performed without lock to avoid serializing reads.
+        Lock-free: scans the published read snapshot, so lookups never wait
+        on each other or on a writer holding the lock for SSTable I/O.
+        SSTables whose key range excludes the key are skipped before any
+        Bloom filter probe or access bookkeeping; in a level with disjoint
+        ranges the one candidate SSTable is found by bisection.
 
         Args:
             key: The key to search for
@@ -333,18 +519,63 @@ class SSTableManager:
         Returns:
             Entry if found, None otherwise
         """
-        with self.lock:
-            snapshot = {
-                level: list(sstables)
-                for level, sstables in sorted(self.levels.items())
-            }
-        for level in sorted(snapshot.keys()):
-            for sstable in reversed(snapshot[level]):
-                entry = sstable.get(key)
+        for pivots, run in self._read_levels:
+            if pivots is not None:
+                index = bisect_right(pivots, key)
+                if not index:
+                    continue
+                _, max_key, sstable, use_bloom_filter = run[index - 1]
+                if key > max_key:
+                    continue
+                entry = sstable.get(key, use_bloom_filter)
+                if entry:
+                    return entry
+                continue
+            
+            for min_key, max_key, sstable, use_bloom_filter in run:
+                if min_key is not None and (key < min_key or key > max_key):
+                    continue
+                entry = sstable.get(key, use_bloom_filter)
                 if entry:
                     return entry
         return None
     
+    def mget(self, keys: Iterable[str]) -> Dict[str, Entry]:
+        """
+        Look up many keys, visiting each SSTable once for the whole batch.
+        
+        The loops of get() are inverted: the outer loop walks the read
+        snapshot in lookup order and the inner loop probes only the keys
+        still unresolved. Pending keys are kept sorted, so each SSTable's
+        key range selects its candidates by bisection rather than by
+        comparing every key.
+        
+        Args:
+            keys: Keys to look up (duplicates are ignored)
+            
+        Returns:
+            Dict of key -> newest entry (tombstones included, as with get())
+            for the keys found; missing keys are absent
+        """
+        results: Dict[str, Entry] = {}
+        pending = sorted(set(keys))
+        for min_key, max_key, sstable, use_bloom_filter in self._read_snapshot:
+            if not pending:
+                break
+            if min_key is None:
+                lo, hi = 0, len(pending)
+            else:
+                lo, hi = bisect_left(pending, min_key), bisect_right(pending, max_key)
+            found = False
+            for key in pending[lo:hi]:
+                entry = sstable.get(key, use_bloom_filter)
+                if entry:
+                    results[key] = entry
+                    found = True
+            if found:
+                pending = [key for key in pending if key not in results]
+        return results
+    
     def get_all_entries(self) -> List[Entry]:
         """
         Get all entries from all SSTables across all levels.
@@ -361,6 +592,33 @@ class SSTableManager:
                     all_entries.extend(sstable.read_all())
             return all_entries
     
+    def get_max_timestamp(self) -> int:
+        """
+        Get the largest entry timestamp across all SSTables.
+        
+        Uses the max_timestamp recorded in each SSTable's metadata, so no
+        data files are read. SSTables from manifests written before the field
+        existed fall back to scanning their entries once; the result is cached
+        in their metadata.
+        
+        Returns:
+            Largest timestamp, or 0 if there are no SSTables
+        """
+        with self.lock:
+            max_ts = 0
+            for sstables in self.levels.values():
+                for sstable in sstables:
+                    metadata = sstable.metadata
+                    if metadata is not None and metadata.max_timestamp is not None:
+                        ts = metadata.max_timestamp
+                    else:
+                        ts = max((e.timestamp for e in sstable.read_all()), default=0)
+                        if metadata is not None:
+                            metadata.max_timestamp = ts
+                    if ts > max_ts:
+                        max_ts = ts
+            return max_ts
+    
     def _should_compact_level(self, level: int) -> bool:
         """
         Check if a level should be compacted to next level.
@@ -412,8 +670,9 @@ class SSTableManager:
         Compact a specific level to the next level.
         
         Process:
-        - L0 → L1: Merge all L0 SSTables, possibly merge with L1
-        - L1+ → L(N+1): Merge single SSTable with next level
+        - L0 → L1: Merge all L0 SSTables with the overlapping L1 SSTables
+        - L1+ → L(N+1): Merge the oldest SSTable with the overlapping
+          SSTables of the next level
         
         Args:
             level: Level to compact (source level)
@@ -426,110 +685,152 @@ class SSTableManager:
         
         next_level = level + 1
         
-        print(f"[SSTableManager] Compacting L{level} → L{next_level}")
-        
-        # Collect entries from current level
-        current_entries = []
-        for sstable in self.levels[level]:
-            current_entries.extend(sstable.read_all())
-        
-        print(f"[SSTableManager] L{level}: {len(self.levels[level])} SSTable(s), {len(current_entries)} entries")
-        
-        # If next level exists, merge with it
-        next_entries = []
-        if next_level in self.levels and self.levels[next_level]:
-            for sstable in self.levels[next_level]:
-                next_entries.extend(sstable.read_all())
-            print(f"[SSTableManager] L{next_level}: {len(self.levels[next_level])} SSTable(s), {len(next_entries)} entries (will merge)")
+        logger.debug("Compacting L%d → L%d", level, next_level)
         
-        # Merge all entries
-        all_entries = current_entries + next_entries
-
-        # Deduplicate: keep entry with highest timestamp per key
-        key_map = {}
-        for entry in all_entries:
-            if entry.key not in key_map:
-                key_map[entry.key] = entry
-            else:
-                if entry.timestamp > key_map[entry.key].timestamp:
-                    key_map[entry.key] = entry
+        with self.lock:
+            source_sstables, next_sstables = self._pick_compaction_inputs(level)
+        logger.debug("L%d: %d SSTable(s), %d entries",
+                     level, len(source_sstables), self._count_entries(source_sstables))
+        
+        # Merge with the overlapping part of the next level
+        if next_sstables:
+            logger.debug("L%d: %d SSTable(s), %d entries (will merge)",
+                         next_level, len(next_sstables), self._count_entries(next_sstables))
 
         # Only drop tombstones at the bottommost level to prevent resurrection.
         # Must hold lock: concurrent background compaction could add a lower level
         # between check and tombstone drop, causing deleted keys to resurrect.
         with self.lock:
-            is_bottommost = not any(
-                lvl > next_level and self.levels.get(lvl)
-                for lvl in self.levels
-            )
+            is_bottommost = next_level >= self._max_nonempty_level
 
-        if is_bottommost:
-            merged_entries = [e for e in key_map.values() if not e.is_deleted]
-        else:
-            merged_entries = list(key_map.values())
+        inputs = source_sstables + next_sstables
+        merged_entries = self._merge_sstables(inputs, drop_tombstones=is_bottommost)
 
-        if not merged_entries:
-            print(f"[SSTableManager] No entries after compaction (all deleted at bottommost)")
-            self._delete_level_sstables(level)
-            if next_level in self.levels:
-                self._delete_level_sstables(next_level)
+        source_ids = {s.sstable_id for s in source_sstables}
+        next_ids = {s.sstable_id for s in next_sstables}
+        
+        if merged_entries is None:
+            logger.debug("No entries after compaction (all deleted at bottommost)")
+            self._finalize_compaction(level, next_level, source_ids, next_ids, None)
             return None
-
-        # Sort by key
-        merged_entries.sort(key=lambda e: e.key)
-
-        print(f"[SSTableManager] After merge: {len(merged_entries)} entries (bottommost={is_bottommost})")
-        merged_entries.sort(key=lambda e: e.key)
-
-        print(f"[SSTableManager] After merge: {len(merged_entries)} entries (bottommost={is_bottommost})")
-        
-        # Record old SSTables before creating new (crash-safe: create before delete)
-        old_source = list(self.levels[level])
-        old_next = list(self.levels.get(next_level, []))
-        
-        # Create new SSTable first — only after it's persisted do we delete old
-        metadata = self.add_sstable(merged_entries, level=next_level, auto_compact=False)
-        new_sstable_id = metadata.sstable_id
-        
-        # Delete old SSTables (exclude new one at next_level)
-        for sstable in old_source:
-            self.levels[level] = [s for s in self.levels[level] if s.sstable_id != sstable.sstable_id]
-            self.level_manifest_manager.remove_sstables([sstable.sstable_id], level=level)
-            if sstable.exists():
-                sstable.delete()
-        for sstable in old_next:
-            self.levels[next_level] = [s for s in self.levels[next_level] if s.sstable_id != sstable.sstable_id]
-            self.level_manifest_manager.remove_sstables([sstable.sstable_id], level=next_level)
-            if sstable.exists():
-                sstable.delete()
-        
-        print(f"[SSTableManager] Created {metadata.dirname} at L{next_level}")
+        
+        # Create new SSTable first — only after it's persisted do we delete old.
+        # The merge streams straight into the new SSTable's data file.
+        new_sstable, metadata = self._create_sstable_for_compaction(
+            merged_entries, next_level, expected_entries=self._count_entries(inputs)
+        )
+        
+        logger.debug("After merge: %d entries (bottommost=%s)", metadata.num_entries, is_bottommost)
+        
+        self._finalize_compaction(level, next_level, source_ids, next_ids, new_sstable)
         
         return metadata
     
-    def _delete_level_sstables(self, level: int):
+    @staticmethod
+    def _merge_sorted_runs(runs: List[Iterable[Record]], drop_tombstones: bool) -> Iterator[Record]:
         """
-        Delete all SSTables at a specific level.
+        Merge key-sorted runs into one key-sorted run, newest record per key.
+        
+        A k-way heap merge ordered by (key, -timestamp) puts the newest
+        version of each key first, so one pass keeps it and skips the rest.
+        Equal timestamps keep the record from the earlier run. Runs are
+        consumed lazily, one frontier record per run at a time.
         
         Args:
-            level: Level to clear
+            runs: (key, timestamp, is_deleted, line) record iterables, each
+                sorted by key (e.g. SSTable.iter_records())
+            drop_tombstones: Drop keys whose newest record is a tombstone
+            
+        Yields:
+            Merged records sorted by key
         """
-        if level not in self.levels:
-            return
+        last_key = None
+        for record in heapq.merge(*runs, key=lambda r: (r[0], -r[1])):
+            key = record[0]
+            if key == last_key:
+                continue
+            last_key = key
+            if drop_tombstones and record[2]:
+                continue
+            yield record
+    
+    def _merge_sstables(self, sstables: List[LazySSTable],
+                        drop_tombstones: bool) -> Optional[Iterator[Record]]:
+        """
+        Stream-merge SSTables as raw records, streaming each from its data
+        file. Surviving lines go to SSTable.write() without being decoded
+        into Entry objects or re-encoded.
         
-        # Get SSTable IDs
-        sstable_ids = [s.sstable_id for s in self.levels[level]]
+        Compaction inputs are read once and then deleted, so their pages
+        are dropped from the page cache as each one is finished instead
+        of evicting pages that point lookups still use.
         
-        # Delete SSTable directories
-        for sstable in self.levels[level]:
-            if sstable.exists():
-                sstable.delete()
+        Inputs are read on this thread: decoding holds the GIL, so reader
+        threads would not speed it up. Each input is opened for sequential
+        access instead, so the kernel reads ahead on all of them at once
+        while the merge runs.
         
-        # Clear level manifest (more efficient than removing individual entries)
-        self.level_manifest_manager.clear_level(level)
+        Args:
+            sstables: SSTables to merge; earlier ones win timestamp ties
+            drop_tombstones: Drop keys whose newest entry is a tombstone
+            
+        Returns:
+            Iterator over the merged records, or None if nothing survives
+        """
+        merged = self._merge_sorted_runs(
+            [sstable.iter_records(bypass_page_cache=True) for sstable in sstables], drop_tombstones
+        )
+        first = next(merged, None)
+        if first is None:
+            return None
+        return chain((first,), merged)
+    
+    @staticmethod
+    def _count_entries(sstables: List[LazySSTable]) -> int:
+        """
+        Sum the entry counts recorded in the SSTables' metadata.
         
-        # Clear in-memory level
-        self.levels[level] = []
+        Args:
+            sstables: SSTables to count
+            
+        Returns:
+            Total entries (an upper bound on a merge of them)
+        """
+        return sum(s.metadata.num_entries for s in sstables if s.metadata is not None)
+    
+    def _pick_compaction_inputs(self, level: int) -> Tuple[List[LazySSTable], List[LazySSTable]]:
+        """
+        Choose the SSTables a compaction of the given level rewrites.
+        
+        L0 SSTables may overlap each other, so all of L0 is compacted.
+        Above L0 only the oldest SSTable is picked. Either way, only the
+        next-level SSTables whose key range overlaps the picked ones are
+        merged with them, so a compaction rewrites a slice of the next
+        level rather than all of it. Must be called with the lock held.
+        
+        Args:
+            level: Level to compact (source level)
+            
+        Returns:
+            Tuple of (source_sstables, next_sstables)
+        """
+        source_sstables = list(self.levels.get(level, []))
+        if level > 0:
+            source_sstables = source_sstables[:1]
+        next_sstables = list(self.levels.get(level + 1, []))
+        
+        if not source_sstables or any(s.metadata is None for s in source_sstables):
+            return source_sstables, next_sstables
+        
+        min_key = min(s.metadata.min_key for s in source_sstables)
+        max_key = max(s.metadata.max_key for s in source_sstables)
+        next_sstables = [
+            s for s in next_sstables
+            if s.metadata is None
+            or not (s.metadata.max_key < min_key or s.metadata.min_key > max_key)
+        ]
+        return source_sstables, next_sstables
+    
     
     def _auto_compact(self):
         """
@@ -543,21 +844,28 @@ class SSTableManager:
         2. Submit to background thread
         3. Background thread performs merge
         4. Only after new SSTable is persisted, old ones are deleted
+        
+        Which levels need compaction is decided in one pass under the lock,
+        so every level is judged against the same state; the snapshots and
+        submissions happen after it is released.
         """
         # Check each level from L0 upward
-        max_level = max(self.levels.keys()) if self.levels else 0
-        
-        for level in range(max_level + 1):
-            if self._should_compact_level(level):
-                # Check if already compacting this level
-                with self._compaction_lock:
-                    level_sstable_ids = {s.sstable_id for s in self.levels.get(level, [])}
-                    if level_sstable_ids & self._compacting_sstable_ids:
-                        # Already compacting some of these SSTables
-                        continue
-                
-                # Take snapshot and submit to background
-                self._submit_background_compaction(level)
+        with self.lock:
+            candidates = [
+                (level, {s.sstable_id for s in self.levels[level]})
+                for level in sorted(self.levels)
+                if self._should_compact_level(level)
+            ]
+        
+        for level, level_sstable_ids in candidates:
+            # Check if already compacting this level
+            with self._compaction_lock:
+                if level_sstable_ids & self._compacting_sstable_ids:
+                    # Already compacting some of these SSTables
+                    continue
+            
+            # Take snapshot and submit to background
+            self._submit_background_compaction(level)
     
     def _submit_background_compaction(self, level: int):
         """
@@ -570,137 +878,225 @@ class SSTableManager:
         if not snapshot:
             return
         
-        source_level, next_level, source_ids, next_ids, source_entries, next_entries = snapshot
+        source_level, next_level, source_ids, next_ids, source_sstables, next_sstables = snapshot
         
-        # Mark SSTables as being compacted
+        # Mark SSTables as being compacted, unless another job already has them
         with self._compaction_lock:
+            if (source_ids | next_ids) & self._compacting_sstable_ids:
+                return
             self._compacting_sstable_ids.update(source_ids)
             self._compacting_sstable_ids.update(next_ids)
         
         stats = self._get_level_stats(level)
-        print(f"[SSTableManager] L{level} needs compaction: {stats['num_sstables']} SSTables, "
-              f"{stats['total_entries']} entries (background)")
+        logger.debug("L%d needs compaction: %d SSTables, %d entries (background)",
+                     level, stats['num_sstables'], stats['total_entries'])
         
-        # Submit to background thread (non-blocking)
-        self.compaction_executor.submit(
+        # Submit to the source level's background thread (non-blocking)
+        self._get_compaction_executor(source_level).submit(
             self._background_compact,
-            source_level, next_level, source_ids, next_ids, source_entries, next_entries
+            source_level, next_level, source_ids, next_ids, source_sstables, next_sstables
         )
         self.background_compactions += 1
     
+    def _get_compaction_executor(self, level: int) -> ThreadPoolExecutor:
+        """Return the compaction executor for a source level, creating it if needed."""
+        with self._compaction_lock:
+            executor = self._compaction_executors.get(level)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix=f"compact-L{level}"
+                )
+                self._compaction_executors[level] = executor
+            return executor
+    
     def _take_compaction_snapshot(self, level: int) -> Optional[Tuple]:
         """
         Take a snapshot of SSTables for compaction.
         
-        Copies sstable references under lock; reads entries without lock to avoid
-        blocking add_sstable/get during disk I/O.
-        Returns tuple: (source_level, next_level, source_ids, next_ids, source_entries, next_entries)
+        Copies sstable references under lock; the compaction worker streams
+        their entries later, without the lock, so disk I/O never blocks
+        add_sstable/get.
+        Returns tuple: (source_level, next_level, source_ids, next_ids, source_sstables, next_sstables)
         """
         with self.lock:
             if level not in self.levels or not self.levels[level]:
                 return None
             
             next_level = level + 1
-            source_sstables = list(self.levels[level])
+            source_sstables, next_sstables = self._pick_compaction_inputs(level)
             source_ids = {s.sstable_id for s in source_sstables}
-            next_sstables = list(self.levels[next_level]) if next_level in self.levels else []
             next_ids = {s.sstable_id for s in next_sstables}
         
-        # Read entries outside lock — disk I/O should not block other operations
-        source_entries = []
-        for sstable in source_sstables:
-            source_entries.extend(sstable.read_all())
-        next_entries = []
-        for sstable in next_sstables:
-            next_entries.extend(sstable.read_all())
-        
-        return (level, next_level, source_ids, next_ids, source_entries, next_entries)
+        return (level, next_level, source_ids, next_ids, source_sstables, next_sstables)
     
     def _background_compact(self, source_level: int, next_level: int,
                             source_ids: Set[int], next_ids: Set[int],
-                            source_entries: List[Entry], next_entries: List[Entry]):
+                            source_sstables: List[LazySSTable], next_sstables: List[LazySSTable]):
         """
         Background compaction worker.
         
         Process:
-        1. Merge entries from snapshot (already read)
-        2. Create new SSTable (persisted to disk)
-        3. Only after success: atomically update levels and manifests
-        4. Delete old SSTables
+        1. Trivially move the source SSTables if nothing needs merging
+        2. Otherwise stream-merge the snapshot's SSTables
+        3. Create new SSTable (persisted to disk)
+        4. Only after success: atomically update levels and manifests
+        5. Delete old SSTables
         """
+        completed = False
         try:
             start_time = time.time()
             
-            print(f"[Compact-Worker] Starting L{source_level} → L{next_level} compaction")
-            print(f"[Compact-Worker] Source: {len(source_ids)} SSTables, {len(source_entries)} entries")
-            if next_entries:
-                print(f"[Compact-Worker] Merging with L{next_level}: {len(next_ids)} SSTables, {len(next_entries)} entries")
-            
-            # Merge all entries
-            all_entries = source_entries + next_entries
-            
-            # Deduplicate: keep entry with highest timestamp per key
-            key_map = {}
-            for entry in all_entries:
-                if entry.key not in key_map:
-                    key_map[entry.key] = entry
-                else:
-                    if entry.timestamp > key_map[entry.key].timestamp:
-                        key_map[entry.key] = entry
+            logger.debug("Starting L%d → L%d compaction: %d source SSTables (%d entries), "
+                         "%d overlapping SSTables (%d entries)",
+                         source_level, next_level,
+                         len(source_ids), self._count_entries(source_sstables),
+                         len(next_ids), self._count_entries(next_sstables))
             
             # Only drop tombstones at the bottommost level to prevent resurrection
             with self.lock:
-                is_bottommost = not any(
-                    lvl > next_level and self.levels.get(lvl)
-                    for lvl in self.levels
+                is_bottommost = next_level >= self._max_nonempty_level
+                current_ids = {s.sstable_id for s in self.levels.get(source_level, [])}
+                moved = source_ids <= current_ids and self._can_trivially_move(
+                    source_sstables, self.levels.get(next_level, []), is_bottommost
                 )
+                if moved:
+                    self._move_sstables(source_sstables, source_level, next_level)
+            
+            if moved:
+                logger.debug("Moved %d SSTable(s) L%d → L%d (no overlap, not rewritten)",
+                             len(source_sstables), source_level, next_level)
+                self.total_compactions += 1
+                completed = True
+                return
 
-            if is_bottommost:
-                merged_entries = [e for e in key_map.values() if not e.is_deleted]
-            else:
-                merged_entries = list(key_map.values())
+            inputs = source_sstables + next_sstables
+            merged_entries = self._merge_sstables(inputs, drop_tombstones=is_bottommost)
 
-            if not merged_entries:
-                print(f"[Compact-Worker] No entries after merge (all deleted at bottommost)")
+            if merged_entries is None:
+                logger.debug("No entries after merge (all deleted at bottommost)")
                 self._finalize_compaction(source_level, next_level, source_ids, next_ids, None)
                 return
 
-            # Sort by key
-            merged_entries.sort(key=lambda e: e.key)
-
-            print(f"[Compact-Worker] After merge: {len(merged_entries)} entries (bottommost={is_bottommost})")
+            # Create new SSTable (this persists to disk); the merge streams into it
+            new_sstable, new_metadata = self._create_sstable_for_compaction(
+                merged_entries, next_level, expected_entries=self._count_entries(inputs)
+            )
 
-            # Create new SSTable (this persists to disk)
-            new_sstable, new_metadata = self._create_sstable_for_compaction(merged_entries, next_level)
+            logger.debug("After merge: %d entries (bottommost=%s)", new_metadata.num_entries, is_bottommost)
             
             # Atomically finalize: update levels, manifests, delete old
             self._finalize_compaction(source_level, next_level, source_ids, next_ids, new_sstable)
             
             elapsed = time.time() - start_time
-            print(f"[Compact-Worker] Completed L{source_level} → L{next_level} in {elapsed:.3f}s")
+            logger.debug("Completed L%d → L%d in %.3fs", source_level, next_level, elapsed)
             
             self.total_compactions += 1
+            completed = True
             
-            # Check if next level now needs compaction (cascade)
-            with self.lock:
-                if self._should_compact_level(next_level):
-                    self._submit_background_compaction(next_level)
-            
-        except Exception as e:
-            print(f"[Compact-Worker] Error during compaction: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error during L%d → L%d compaction", source_level, next_level)
         finally:
             # Remove from compacting set
             with self._compaction_lock:
                 self._compacting_sstable_ids -= source_ids
                 self._compacting_sstable_ids -= next_ids
+            
+            if completed:
+                self._cascade_compaction(source_level, next_level)
+    
+    @staticmethod
+    def _manifest_entry(metadata: SSTableMetadata, level: int) -> ManifestEntry:
+        """Build the level manifest entry describing an SSTable."""
+        return ManifestEntry(
+            sstable_id=metadata.sstable_id,
+            dirname=metadata.dirname,
+            num_entries=metadata.num_entries,
+            min_key=metadata.min_key,
+            max_key=metadata.max_key,
+            level=level,
+            max_timestamp=metadata.max_timestamp,
+            num_tombstones=metadata.num_tombstones
+        )
+    
+    def _cascade_compaction(self, source_level: int, next_level: int):
+        """
+        Schedule follow-up compactions after a background compaction.
+        
+        A compaction only takes part of a level above L0, so the source
+        level may still be over its limit; the next level may now be too.
+        """
+        with self.lock:
+            for level in (source_level, next_level):
+                if self._should_compact_level(level):
+                    self._submit_background_compaction(level)
+    
+    @staticmethod
+    def _can_trivially_move(source_sstables: List[LazySSTable],
+                            next_sstables: List[LazySSTable],
+                            is_bottommost: bool) -> bool:
+        """
+        Check whether source SSTables can move to the next level unmerged.
+        
+        Like LevelDB's trivial move: when the source key ranges don't
+        overlap each other or any next-level SSTable, merging would only
+        copy the data, so the manifest can re-label the files instead.
+        Moving into the bottommost level is refused while a source SSTable
+        may hold tombstones, since only a rewrite there drops them.
+        
+        Args:
+            source_sstables: SSTables being compacted out of the source level
+            next_sstables: SSTables currently at the next level
+            is_bottommost: Whether the next level is the bottommost level
+            
+        Returns:
+            True if the source SSTables can be moved as-is
+        """
+        if any(s.metadata is None for s in source_sstables):
+            return False
+        if any(s.metadata is None for s in next_sstables):
+            return False
+        if is_bottommost and any(s.metadata.num_tombstones != 0 for s in source_sstables):
+            return False
+        
+        ranges = sorted(
+            (s.metadata.min_key, s.metadata.max_key)
+            for s in list(source_sstables) + list(next_sstables)
+        )
+        return all(prev[1] < cur[0] for prev, cur in zip(ranges, ranges[1:]))
+    
+    def _move_sstables(self, sstables: List[LazySSTable], source_level: int, next_level: int):
+        """
+        Re-label SSTables from source_level to next_level without rewriting.
+        
+        Must be called with the lock held. The next level's manifest is
+        written before the source level's entries are removed, so a crash
+        in between leaves a duplicate listing that load_from_manifest
+        resolves in favour of the deeper level.
+        """
+        moved_ids = {s.sstable_id for s in sstables}
+        
+        self.level_manifest_manager.replace_sstables(
+            next_level, [], [self._manifest_entry(s.metadata, next_level) for s in sstables]
+        )
+        self.level_manifest_manager.remove_sstables(list(moved_ids), level=source_level)
+        
+        self.levels[source_level] = [
+            s for s in self.levels.get(source_level, [])
+            if s.sstable_id not in moved_ids
+        ]
+        self.levels.setdefault(next_level, []).extend(sstables)
+        
+        self._refresh_level_totals(source_level, next_level)
+        self._trigger_manifest_reload()
     
-    def _create_sstable_for_compaction(self, entries: List[Entry], level: int) -> Tuple[SSTable, SSTableMetadata]:
+    def _create_sstable_for_compaction(self, entries: Iterable[Union[Entry, Record]], level: int,
+                                       expected_entries: Optional[int] = None) -> Tuple[SSTable, SSTableMetadata]:
         """
         Create a new SSTable for compaction result.
         
         This creates the SSTable on disk but does NOT update in-memory state.
+        The output is written around the page cache (see SSTable.write).
         """
         # Get next SSTable ID (thread-safe)
         with self.lock:
@@ -708,7 +1104,7 @@ class SSTableManager:
         
         # Create SSTable (file I/O, no lock needed)
         sstable = SSTable(self.sstables_dir, sstable_id)
-        metadata = sstable.write(entries)
+        metadata = sstable.write(entries, expected_entries=expected_entries, bypass_page_cache=True)
         
         return sstable, metadata
     
@@ -720,11 +1116,31 @@ class SSTableManager:
         
         Only called after new SSTable is persisted to disk.
         Updates in-memory state, manifests, and deletes old SSTables.
+        
+        The next level's manifest swaps the old SSTables for the new one in
+        a single atomic write, before the source level's entries are
+        removed. A crash between the two writes leaves the source SSTables
+        listed above the merged output, which holds the same newest
+        versions, so no read changes.
         """
         # Collect old LazySSTable objects to close/delete after releasing lock
         # Must collect the actual objects to properly close their mmap handles
         old_sstables_to_delete: List[LazySSTable] = []
         
+        # Wrap the new SSTable and measure it before taking the lock, so the
+        # level totals refresh below does no filesystem I/O while holding it
+        lazy_sstable = None
+        if new_sstable:
+            lazy_sstable = LazySSTable(
+                sstables_dir=self.sstables_dir,
+                sstable_id=new_sstable.sstable_id,
+                metadata=new_sstable.metadata
+            )
+            # Pre-set the loaded SSTable
+            lazy_sstable._sstable = new_sstable
+            lazy_sstable._loaded = True
+            lazy_sstable.size_bytes()
+        
         with self.lock:
             # Collect and remove old SSTables from source level
             if source_level in self.levels:
@@ -753,46 +1169,45 @@ class SSTableManager:
                 if next_level not in self.levels:
                     self.levels[next_level] = []
                 
-                # Wrap in LazySSTable for consistent handling
-                lazy_sstable = LazySSTable(
-                    sstables_dir=self.sstables_dir,
-                    sstable_id=new_sstable.sstable_id,
-                    metadata=new_sstable.metadata
-                )
-                # Pre-set the loaded SSTable
-                lazy_sstable._sstable = new_sstable
-                lazy_sstable._loaded = True
-                
                 self.levels[next_level].append(lazy_sstable)
-                
-                # Update manifest for new SSTable
-                self.level_manifest_manager.add_sstable(
-                    dirname=new_sstable.dirname,
-                    num_entries=new_sstable.metadata.num_entries if new_sstable.metadata else 0,
-                    min_key=new_sstable.metadata.min_key if new_sstable.metadata else "",
-                    max_key=new_sstable.metadata.max_key if new_sstable.metadata else "",
-                    level=next_level,
-                    sstable_id=new_sstable.sstable_id
-                )
-                
-                print(f"[Compact-Worker] Created {new_sstable.dirname} at L{next_level}")
+                logger.debug("Created %s at L%d", new_sstable.dirname, next_level)
             
-            # Trigger background manifest reload
-            self._trigger_manifest_reload()
+            self._refresh_level_totals(source_level, next_level)
             
-            # Clear manifests for old SSTables
+            # Swap the next level's entries, then clear the source level's
+            new_entries = [self._manifest_entry(new_sstable.metadata, next_level)] if new_sstable else []
+            if next_ids or new_entries:
+                self.level_manifest_manager.replace_sstables(next_level, list(next_ids), new_entries)
             self.level_manifest_manager.remove_sstables(list(source_ids), level=source_level)
-            if next_ids:
-                self.level_manifest_manager.remove_sstables(list(next_ids), level=next_level)
+            
+            # Trigger background manifest reload
+            self._trigger_manifest_reload()
         
-        # Delete old SSTable files (outside lock, just file I/O)
+        # Delete old SSTable files in the background (outside lock, just file I/O)
         # Use the actual LazySSTable objects which have the open mmap handles
         # LazySSTable.delete() calls close() internally before removing files
         for old_sstable in old_sstables_to_delete:
             try:
-                old_sstable.delete()
-            except Exception as e:
-                print(f"[Compact-Worker] Warning: Failed to delete {old_sstable.dirname}: {e}")
+                future = self._deletion_executor.submit(self._delete_sstable, old_sstable)
+            except RuntimeError:
+                self._delete_sstable(old_sstable)  # Executor already shut down
+                continue
+            with self._compaction_lock:
+                self._pending_deletions.add(future)
+            future.add_done_callback(self._deletion_done)
+    
+    @staticmethod
+    def _delete_sstable(sstable: LazySSTable):
+        """Delete an SSTable that is no longer listed, logging any failure."""
+        try:
+            sstable.delete()
+        except Exception as e:
+            logger.warning("Failed to delete %s: %s", sstable.dirname, e)
+    
+    def _deletion_done(self, future: Future):
+        """Stop tracking a finished background deletion."""
+        with self._compaction_lock:
+            self._pending_deletions.discard(future)
     
     def _trigger_manifest_reload(self):
         """
@@ -806,7 +1221,11 @@ class SSTableManager:
         with self._manifest_reload_lock:
             if not self._manifest_reload_pending.is_set():
                 self._manifest_reload_pending.set()
-                self._manifest_reload_executor.submit(self._background_manifest_reload)
+                try:
+                    self._manifest_reload_executor.submit(self._background_manifest_reload)
+                except RuntimeError:
+                    # Shut down; the manifests on disk are already current
+                    self._manifest_reload_pending.clear()
     
     def _background_manifest_reload(self):
         """
@@ -830,15 +1249,16 @@ class SSTableManager:
             # Reload each level manifest
             for level in self.level_manifest_manager.get_levels():
                 level_manifest = self.level_manifest_manager.get_level_manifest(level)
-                # Force reload from disk
+                # Reload from disk; a no-op unless the file changed since
+                # this process last read or wrote it
                 level_manifest._load()
             
             # The in-memory levels dict is already up-to-date because
             # we update it atomically in add_sstable and _finalize_compaction
             # This reload just ensures the manifest files are in sync
             
-        except Exception as e:
-            print(f"[Manifest-Reload] Error during reload: {e}")
+        except Exception:
+            logger.exception("Error during manifest reload")
     
     def compact(self, target_level: Optional[int] = None) -> SSTableMetadata:
         """
@@ -848,13 +1268,12 @@ class SSTableManager:
         Otherwise, finds the highest level and compacts everything there.
         
         Process:
-        1. Read all entries from all SSTables across all levels
-        2. Deduplicate by keeping latest version (highest timestamp)
+        1. Stream-merge all SSTables across all levels in key order
+        2. Keep the latest version of each key (highest timestamp)
         3. Remove tombstones (deleted entries)
-        4. Sort entries by key
-        5. Delete all old SSTable directories
-        6. Create new compacted SSTable at target level
-        7. Update manifest
+        4. Write the new compacted SSTable for the target level
+        5. Update the manifests (one write per level)
+        6. Delete all old SSTable directories
         
         Args:
             target_level: Level to compact to (default: highest existing level + 1)
@@ -877,60 +1296,73 @@ class SSTableManager:
                 max_level = max(self.levels.keys()) if self.levels else 0
                 target_level = max_level + 1 if max_level == 0 else max_level
             
-            # Collect all entries from all SSTables
-            all_entries = self.get_all_entries()
+            # Every SSTable is an input, in the same order as get_all_entries()
+            inputs = [
+                sstable
+                for level in sorted(self.levels.keys())
+                for sstable in self.levels[level]
+            ]
+            total_entries = self._count_entries(inputs)
             
-            if not all_entries:
+            if not total_entries:
                 raise ValueError("No entries found in SSTables")
             
-            print(f"[SSTableManager] Full compaction: {total_sstables} SSTables across {len(self.levels)} levels → L{target_level}")
-            print(f"[SSTableManager] Total entries: {len(all_entries)}")
-            
-            # Build a map to keep only the latest entry for each key
-            key_map = {}
-            for entry in all_entries:
-                if entry.key not in key_map:
-                    key_map[entry.key] = entry
-                else:
-                    # Keep entry with higher timestamp
-                    if entry.timestamp > key_map[entry.key].timestamp:
-                        key_map[entry.key] = entry
-            
-            # Remove tombstones (deleted entries)
-            compacted_entries = [
-                entry for entry in key_map.values()
-                if not entry.is_deleted
-            ]
+            logger.debug("Full compaction: %d SSTables (%d entries) across %d levels → L%d",
+                         total_sstables, total_entries, len(self.levels), target_level)
+            
+            # Keep the latest entry for each key and drop tombstones
+            compacted_entries = self._merge_sstables(inputs, drop_tombstones=True)
             
-            if not compacted_entries:
+            if compacted_entries is None:
                 raise ValueError("No live entries after compaction (all deleted)")
             
-            # Sort entries by key
-            compacted_entries.sort(key=lambda e: e.key)
+            # Create new compacted SSTable first — only after it's persisted do we delete old
+            sstable_id = self.level_manifest_manager.get_next_id()
+            sstable = SSTable(self.sstables_dir, sstable_id)
+            metadata = sstable.write(compacted_entries, expected_entries=total_entries,
+                                     bypass_page_cache=True)
+            lazy_sstable = LazySSTable(
+                sstables_dir=self.sstables_dir,
+                sstable_id=sstable_id,
+                metadata=metadata
+            )
+            lazy_sstable._sstable = sstable
+            lazy_sstable._loaded = True
             
-            print(f"[SSTableManager] After deduplication: {len(compacted_entries)} unique live entries")
+            logger.debug("After deduplication: %d unique live entries", metadata.num_entries)
             
-            # Record old SSTables before creating new one (crash-safe: create before delete)
-            old_sstables_by_level = {
-                level: list(sstables)
+            # One manifest write per level: the target level swaps its old
+            # SSTables for the new one atomically, the others are cleared
+            old_sstables = [s for sstables in self.levels.values() for s in sstables]
+            old_ids_by_level = {
+                level: [s.sstable_id for s in sstables]
                 for level, sstables in self.levels.items()
+                if sstables
             }
+            self.level_manifest_manager.replace_sstables(
+                target_level, old_ids_by_level.pop(target_level, []),
+                [self._manifest_entry(metadata, target_level)]
+            )
+            for level, old_ids in old_ids_by_level.items():
+                self.level_manifest_manager.remove_sstables(old_ids, level=level)
             
-            # Create new compacted SSTable first — only after it's persisted do we delete old
-            metadata = self.add_sstable(compacted_entries, level=target_level, auto_compact=False)
-            new_sstable_id = metadata.sstable_id
-            
-            # Delete old SSTables (keep the new one at target_level)
-            for level, sstables in old_sstables_by_level.items():
-                old_ids = [s.sstable_id for s in sstables]
-                self.levels[level] = [s for s in self.levels[level] if s.sstable_id not in old_ids]
-                if old_ids:
-                    self.level_manifest_manager.remove_sstables(old_ids, level=level)
-                for sstable in sstables:
-                    if sstable.exists():
-                        sstable.delete()
+            for level in self.levels:
+                self.levels[level] = []
+            self.levels[target_level] = [lazy_sstable]
+            self._refresh_level_totals(*self.levels)
+            self._trigger_manifest_reload()
+            
+            # Delete old SSTables only after the manifests no longer list them
+            deletions = []
+            for sstable in old_sstables:
+                try:
+                    deletions.append(self._deletion_executor.submit(self._delete_sstable, sstable))
+                except RuntimeError:
+                    self._delete_sstable(sstable)  # Executor already shut down
+            for future in deletions:
+                future.result()
             
-            print(f"[SSTableManager] Full compaction complete: {metadata.dirname} at L{target_level}")
+            logger.debug("Full compaction complete: %s at L%d", metadata.dirname, target_level)
             
             return metadata
     
@@ -942,19 +1374,20 @@ class SSTableManager:
             sstable_id: ID of SSTable to remove
         """
         with self.lock:
-            # Find the level containing this SSTable
+            # Find the level containing this SSTable and remove it in place;
+            # IDs are unique, so no other level needs rebuilding
             target_level = None
-            for level in self.levels:
-                for sstable in self.levels[level]:
+            for level, sstables in self.levels.items():
+                for index, sstable in enumerate(sstables):
                     if sstable.sstable_id == sstable_id:
                         target_level = level
+                        del sstables[index]
                         break
                 if target_level is not None:
                     break
             
-            # Remove from in-memory collection
-            for level in self.levels:
-                self.levels[level] = [s for s in self.levels[level] if s.sstable_id != sstable_id]
+            if target_level is not None:
+                self._refresh_level_totals(target_level)
             
             # Remove from level manifest
             self.level_manifest_manager.remove_sstables([sstable_id], level=target_level)
@@ -967,34 +1400,35 @@ class SSTableManager:
         """
         with self.lock:
             total_sstables = sum(len(sstables) for sstables in self.levels.values())
-            print(f"[SSTableManager] Closing {total_sstables} SSTables across {len(self.levels)} levels...")
+            logger.debug("Closing %d SSTables across %d levels...", total_sstables, len(self.levels))
             
             for level in self.levels:
                 for sstable in self.levels[level]:
                     sstable.close()
             
-            print(f"[SSTableManager] All SSTables closed")
+            logger.debug("All SSTables closed")
     
     def stats(self) -> dict:
         """
         Calculate statistics about SSTables across all levels.
         
+        Sizes come from the cached per-level totals, so this is O(levels)
+        and does no filesystem I/O.
+        
         Returns:
             Dictionary with SSTable statistics including per-level breakdown
         """
         with self.lock:
             total_sstables = sum(len(sstables) for sstables in self.levels.values())
-            total_size = sum(
-                s.size_bytes() 
-                for sstables in self.levels.values() 
-                for s in sstables
-            )
             
             # Per-level stats
             level_stats = {}
+            total_size = 0
             for level in sorted(self.levels.keys()):
+                level_size = self._level_bytes.get(level, 0)
+                total_size += level_size
                 level_stats[f"l{level}_sstables"] = len(self.levels[level])
-                level_stats[f"l{level}_size_bytes"] = sum(s.size_bytes() for s in self.levels[level])
+                level_stats[f"l{level}_size_bytes"] = level_size
             
             return {
                 "num_sstables": total_sstables,
@@ -1007,11 +1441,12 @@ class SSTableManager:
         """
         Get the total number of SSTables across all levels.
         
+        Lock-free: the read snapshot lists every SSTable exactly once.
+        
         Returns:
             Total number of SSTables
         """
-        with self.lock:
-            return sum(len(sstables) for sstables in self.levels.values())
+        return len(self._read_snapshot)
     
     def is_empty(self) -> bool:
         """
@@ -1020,8 +1455,7 @@ class SSTableManager:
         Returns:
             True if no SSTables exist, False otherwise
         """
-        with self.lock:
-            return self.count() == 0
+        return self.count() == 0
     
     def __len__(self) -> int:
         """Support len() operator."""
@@ -1070,10 +1504,6 @@ class SSTableManager:
         """
         return self.get_all_sstables()
     
-    def __len__(self) -> int:
-        """Support len() operator."""
-        return self.count()
-    
     def __str__(self) -> str:
         """String representation."""
         with self.lock:
@@ -1083,7 +1513,8 @@ class SSTableManager:
     
     def wait_for_compaction(self, timeout: float = 30.0) -> bool:
         """
-        Wait for any pending background compactions to complete.
+        Wait for any pending background compactions to complete, including
+        the deletion of their input SSTables.
         
         Args:
             timeout: Maximum time to wait in seconds
@@ -1094,7 +1525,7 @@ class SSTableManager:
         start = time.time()
         while time.time() - start < timeout:
             with self._compaction_lock:
-                if not self._compacting_sstable_ids:
+                if not self._compacting_sstable_ids and not self._pending_deletions:
                     return True
             time.sleep(0.1)
         return False
@@ -1112,10 +1543,16 @@ class SSTableManager:
             wait: If True, wait for pending operations to complete
             timeout: Maximum time to wait if wait=True
         """
+        self._prewarm_cancelled.set()
         if wait:
             self.wait_for_compaction(timeout)
-        self.compaction_executor.shutdown(wait=wait)
+        with self._compaction_lock:
+            executors = list(self._compaction_executors.values())
+        for executor in executors:
+            executor.shutdown(wait=wait)
+        self._deletion_executor.shutdown(wait=wait)
         self._manifest_reload_executor.shutdown(wait=wait)
+        self._prewarm_executor.shutdown(wait=wait)
     
     def get_lazy_load_stats(self) -> dict:
         """
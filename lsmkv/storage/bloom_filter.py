@@ -4,7 +4,7 @@ Bloom filter wrapper using pybloomfiltermmap3 for efficient mmap-based operation
 Requires: pip install pybloomfiltermmap3
 """
 import os
-from typing import Optional
+from typing import Iterable, Optional
 
 try:
     from pybloomfilter import BloomFilter as PyBloomFilter
@@ -62,6 +62,17 @@ class BloomFilter:
         """
         self._bloom.add(key)
     
+    def add_many(self, keys: Iterable[str]):
+        """
+        Add many keys to the Bloom filter in one call.
+        
+        The hashing loop runs in C, without a Python method call per key.
+        
+        Args:
+            keys: The keys to add
+        """
+        self._bloom.update(keys)
+    
     def might_contain(self, key: str) -> bool:
         """
         Check if a key might be in the set.
@@ -15,11 +15,14 @@ Directory structure:
         └── ...
 """
 import json
+import logging
 import os
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from threading import RLock
 from lsmkv.storage.manifest import ManifestEntry
 
+logger = logging.getLogger(__name__)
+
 
 class LevelManifest:
     """
@@ -46,17 +49,28 @@ class LevelManifest:
         self.filepath = os.path.join(manifest_dir, f"level_{level}.json")
         self.entries: List[ManifestEntry] = []
         self.lock = RLock()
+        # (inode, mtime_ns, size) of the file self.entries matches
+        self._file_stat: Optional[Tuple[int, int, int]] = None
         
         os.makedirs(manifest_dir, exist_ok=True)
         self._load()
     
+    @staticmethod
+    def _stat_key(filepath: str) -> Tuple[int, int, int]:
+        """Identify a version of the manifest file (every save replaces the inode)."""
+        st = os.stat(filepath)
+        return st.st_ino, st.st_mtime_ns, st.st_size
+    
     def _load(self):
-        """Load manifest from disk."""
+        """Load manifest from disk, unless the file is unchanged since the last load or save."""
         if not os.path.exists(self.filepath):
             return
         
         with self.lock:
             try:
+                file_stat = self._stat_key(self.filepath)
+                if file_stat == self._file_stat:
+                    return
                 with open(self.filepath, 'r') as f:
                     data = json.load(f)
                     self.entries = [
@@ -66,8 +80,9 @@ class LevelManifest:
                     # Ensure all entries have correct level
                     for entry in self.entries:
                         entry.level = self.level
+                self._file_stat = file_stat
             except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not load level {self.level} manifest: {e}")
+                logger.warning("Could not load level %d manifest: %s", self.level, e)
                 self.entries = []
     
     def _save(self):
@@ -79,14 +94,16 @@ class LevelManifest:
             "entries": [entry.to_dict() for entry in self.entries]
         }
         
-        # Atomic write: temp file + rename
+        # Atomic write: temp file + rename. Compact JSON in one write: an
+        # indent makes json fall back to its pure-Python encoder
         temp_filepath = self.filepath + ".tmp"
         with open(temp_filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+            f.write(json.dumps(data))
             f.flush()
             os.fsync(f.fileno())
         
         os.replace(temp_filepath, self.filepath)
+        self._file_stat = self._stat_key(self.filepath)
     
     def add_sstable(self, entry: ManifestEntry):
         """
@@ -105,14 +122,42 @@ class LevelManifest:
         """
         Remove SSTables from this level's manifest.
         
+        The file is rewritten once for the whole batch, and not at all if
+        none of the IDs are listed in this level.
+        
         Args:
             sstable_ids: List of SSTable IDs to remove
         """
+        remove_ids = set(sstable_ids)
         with self.lock:
-            self.entries = [
+            entries = [
                 entry for entry in self.entries
-                if entry.sstable_id not in sstable_ids
+                if entry.sstable_id not in remove_ids
             ]
+            if len(entries) == len(self.entries):
+                return
+            self.entries = entries
+            self._save()
+    
+    def replace_sstables(self, sstable_ids: List[int], entries: List[ManifestEntry]):
+        """
+        Remove some SSTables and add others in a single manifest write.
+        
+        The file is replaced atomically, so a crash leaves either the old
+        entries or the new ones, never neither.
+        
+        Args:
+            sstable_ids: List of SSTable IDs to remove
+            entries: ManifestEntries to add
+        """
+        with self.lock:
+            remove_ids = set(sstable_ids)
+            for entry in entries:
+                entry.level = self.level
+            self.entries = [
+                entry for entry in self.entries
+                if entry.sstable_id not in remove_ids
+            ] + list(entries)
             self._save()
     
     def clear(self):
@@ -199,7 +244,7 @@ class GlobalManifest:
                     self.version = data.get("version", 2)
                     self.metadata = data.get("metadata", {})
             except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not load global manifest: {e}")
+                logger.warning("Could not load global manifest: %s", e)
     
     def _save(self):
         """Save global manifest to disk."""
@@ -296,7 +341,7 @@ class LevelManifestManager:
         if self.global_manifest.get_metadata("migrated_from_v1"):
             return
         
-        print("[LevelManifestManager] Migrating from single manifest to level-based manifests...")
+        logger.info("Migrating from single manifest to level-based manifests...")
         
         try:
             with open(self.old_manifest_path, 'r') as f:
@@ -323,10 +368,10 @@ class LevelManifestManager:
             backup_path = self.old_manifest_path + ".backup"
             os.rename(self.old_manifest_path, backup_path)
             
-            print(f"[LevelManifestManager] Migrated {len(old_entries)} entries, old manifest backed up")
+            logger.info("Migrated %d entries, old manifest backed up", len(old_entries))
             
-        except Exception as e:
-            print(f"Warning: Migration failed: {e}")
+        except Exception:
+            logger.exception("Manifest migration failed")
     
     def _get_or_create_level_manifest(self, level: int) -> LevelManifest:
         """Get or create a manifest for a specific level."""
@@ -341,7 +386,9 @@ class LevelManifestManager:
     
     def add_sstable(self, dirname: str, num_entries: int, 
                     min_key: str, max_key: str, level: int = 0,
-                    sstable_id: Optional[int] = None) -> int:
+                    sstable_id: Optional[int] = None,
+                    max_timestamp: Optional[int] = None,
+                    num_tombstones: Optional[int] = None) -> int:
         """
         Add an SSTable to the appropriate level manifest.
         
@@ -352,6 +399,8 @@ class LevelManifestManager:
             max_key: Largest key
             level: Level to add to
             sstable_id: Optional SSTable ID (if None, auto-assigns)
+            max_timestamp: Largest entry timestamp in the SSTable
+            num_tombstones: Number of deleted entries in the SSTable
             
         Returns:
             Assigned SSTable ID
@@ -369,7 +418,9 @@ class LevelManifestManager:
                 num_entries=num_entries,
                 min_key=min_key,
                 max_key=max_key,
-                level=level
+                level=level,
+                max_timestamp=max_timestamp,
+                num_tombstones=num_tombstones
             )
             
             level_manifest = self._get_or_create_level_manifest(level)
@@ -395,6 +446,24 @@ class LevelManifestManager:
                 for level_manifest in self._level_manifests.values():
                     level_manifest.remove_sstables(sstable_ids)
     
+    def replace_sstables(self, level: int, sstable_ids: List[int],
+                         entries: List[ManifestEntry]):
+        """
+        Atomically swap SSTables in one level's manifest (one write).
+        
+        Args:
+            level: Level whose manifest to update
+            sstable_ids: List of SSTable IDs to remove
+            entries: ManifestEntries to add (their sstable_ids must be assigned)
+        """
+        with self.lock:
+            for entry in entries:
+                # Ensure global ID counter is updated
+                self.global_manifest.set_next_id(entry.sstable_id + 1)
+            
+            level_manifest = self._get_or_create_level_manifest(level)
+            level_manifest.replace_sstables(sstable_ids, entries)
+    
     def clear_level(self, level: int):
         """Clear all SSTables from a specific level."""
         with self.lock:
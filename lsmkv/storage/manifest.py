@@ -2,16 +2,27 @@
 Manifest file implementation for storing SSTable metadata.
 """
 import json
+import logging
 import os
+import sys
 from typing import List, Optional
 from threading import Lock
 
+logger = logging.getLogger(__name__)
+
+
+def _intern_key(key: Optional[str]) -> Optional[str]:
+    """Intern a loaded range key so equal keys across entries share one string."""
+    return sys.intern(key) if key is not None else None
+
 
 class ManifestEntry:
     """Entry in the manifest file."""
     
     def __init__(self, sstable_id: int, dirname: str, num_entries: int, 
-                 min_key: str, max_key: str, level: int = 0):
+                 min_key: str, max_key: str, level: int = 0,
+                 max_timestamp: Optional[int] = None,
+                 num_tombstones: Optional[int] = None):
         """
         Initialize a manifest entry.
         
@@ -22,6 +33,10 @@ class ManifestEntry:
             min_key: Smallest key in the SSTable
             max_key: Largest key in the SSTable
             level: Level in the LSM tree (0 for L0)
+            max_timestamp: Largest entry timestamp (None for entries written
+                by older versions)
+            num_tombstones: Number of deleted entries (None for entries
+                written by older versions)
         """
         self.sstable_id = sstable_id
         self.dirname = dirname
@@ -29,6 +44,8 @@ class ManifestEntry:
         self.min_key = min_key
         self.max_key = max_key
         self.level = level
+        self.max_timestamp = max_timestamp
+        self.num_tombstones = num_tombstones
         
         # Legacy support: filename is same as dirname for backward compatibility
         self.filename = dirname
@@ -41,7 +58,9 @@ class ManifestEntry:
             "num_entries": self.num_entries,
             "min_key": self.min_key,
             "max_key": self.max_key,
-            "level": self.level
+            "level": self.level,
+            "max_timestamp": self.max_timestamp,
+            "num_tombstones": self.num_tombstones
         }
     
     @staticmethod
@@ -54,9 +73,11 @@ class ManifestEntry:
             sstable_id=data["sstable_id"],
             dirname=dirname,
             num_entries=data["num_entries"],
-            min_key=data["min_key"],
-            max_key=data["max_key"],
-            level=data.get("level", 0)
+            min_key=_intern_key(data["min_key"]),
+            max_key=_intern_key(data["max_key"]),
+            level=data.get("level", 0),
+            max_timestamp=data.get("max_timestamp"),
+            num_tombstones=data.get("num_tombstones")
         )
 
 
@@ -91,7 +112,7 @@ class Manifest:
                         for entry in data.get("entries", [])
                     ]
             except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not load manifest: {e}")
+                logger.warning("Could not load manifest: %s", e)
                 self.entries = []
                 self.next_sstable_id = 0
     
@@ -104,10 +125,11 @@ class Manifest:
             "entries": [entry.to_dict() for entry in self.entries]
         }
         
-        # Write to temp file first, then rename for atomicity
+        # Write to temp file first, then rename for atomicity. Compact JSON
+        # in one write: an indent makes json fall back to its pure-Python encoder
         temp_filepath = self.filepath + ".tmp"
         with open(temp_filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+            f.write(json.dumps(data))
             f.flush()
             os.fsync(f.fileno())
         
@@ -9,6 +9,9 @@ from lsmkv.core.dto import Entry
 class Memtable:
     """In-memory table using skiplist and dictionary for fast lookups."""
     
+    # Approximate per-entry bookkeeping on top of key and value characters
+    ENTRY_OVERHEAD_BYTES = 40
+    
     def __init__(self, max_size: int = 1000):
         """
         Initialize the memtable.
@@ -21,6 +24,19 @@ class Memtable:
         # Use dict for O(1) lookups
         self.key_map: Dict[str, Entry] = {}
         self.max_size = max_size
+        # Oldest write timestamp held (None when empty); bounds WAL truncation
+        self.min_timestamp: Optional[int] = None
+        # Approximate memory held, maintained on every write
+        self.size_bytes = 0
+    
+    def _track_size(self, old: Optional[Entry], key: str, value: Optional[str]):
+        """Adjust size_bytes for a write of value to key replacing old."""
+        if old is None:
+            self.size_bytes += len(key) + self.ENTRY_OVERHEAD_BYTES
+        elif old.value is not None:
+            self.size_bytes -= len(old.value)
+        if value is not None:
+            self.size_bytes += len(value)
     
     def put(self, entry: Entry):
         """
@@ -30,8 +46,39 @@ class Memtable:
             entry: The entry to insert
         """
         # Update both skiplist and dict
+        self._track_size(self.key_map.get(entry.key), entry.key, entry.value)
         self.skiplist[entry.key] = entry
         self.key_map[entry.key] = entry
+        if self.min_timestamp is None or entry.timestamp < self.min_timestamp:
+            self.min_timestamp = entry.timestamp
+    
+    def put_raw(self, key: str, value: Optional[str], timestamp: int, is_deleted: bool):
+        """
+        Insert or update an entry from its fields, used by WAL replay.
+        
+        An Entry is only allocated when the key is new; an existing entry
+        is updated in place. Entries handed out by get() may therefore
+        change, so this is meant for recovery before the store serves reads.
+        
+        Args:
+            key: The key
+            value: The value (None for tombstones)
+            timestamp: Write timestamp
+            is_deleted: True to store a tombstone
+        """
+        entry = self.key_map.get(key)
+        if is_deleted:
+            value = None
+        self._track_size(entry, key, value)
+        if entry is None:
+            entry = Entry(key, value, timestamp, is_deleted)
+            self.skiplist[key] = entry
+            self.key_map[key] = entry
+        else:
+            entry.value = value
+            entry.timestamp = timestamp
+        if self.min_timestamp is None or timestamp < self.min_timestamp:
+            self.min_timestamp = timestamp
     
     def get(self, key: str, include_tombstones: bool = False) -> Optional[Entry]:
         """
@@ -60,8 +107,11 @@ class Memtable:
             entry: The entry to delete (with is_deleted=True)
         """
         # Store tombstone in both skiplist and dict
+        self._track_size(self.key_map.get(entry.key), entry.key, entry.value)
         self.skiplist[entry.key] = entry
         self.key_map[entry.key] = entry
+        if self.min_timestamp is None or entry.timestamp < self.min_timestamp:
+            self.min_timestamp = entry.timestamp
     
     def is_full(self) -> bool:
         """
@@ -75,7 +125,10 @@ class Memtable:
     def clear(self):
         """Clear all entries from the memtable."""
         self.skiplist = SkipListDict(capacity=max(self.max_size * 2, 16))
-        self.key_map = {}
+        # In place: MemtableManager read snapshots hold a reference to key_map
+        self.key_map.clear()
+        self.min_timestamp = None
+        self.size_bytes = 0
     
     def __len__(self) -> int:
         """Return the number of entries in the memtable."""
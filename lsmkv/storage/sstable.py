@@ -12,16 +12,80 @@ import os
 import json
 import mmap
 import threading
-from typing import List, Optional, TYPE_CHECKING
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
 from lsmkv.core.dto import Entry
 from lsmkv.storage.bloom_filter import BloomFilter
 from lsmkv.storage.sparse_index import SparseIndex
 
+# orjson is optional; it encodes/decodes the same JSON lines several times faster
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# An entry as stored: (key, timestamp, is_deleted, encoded data-file line).
+# Compaction merges these so surviving lines are copied without re-encoding.
+Record = Tuple[str, int, bool, bytes]
+
+
+def _drop_page_cache(fd: int, sync: bool = False):
+    """
+    Advise the kernel to drop a file's cached pages (no-op where
+    posix_fadvise is unavailable, e.g. macOS and Windows).
+    
+    Args:
+        fd: Open file descriptor
+        sync: fsync first; dirty pages cannot be dropped until written back
+    """
+    if sync:
+        os.fsync(fd)
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def _advise_sequential(fd: int):
+    """
+    Advise the kernel that a file will be read sequentially, so it reads
+    ahead aggressively in the background (no-op where posix_fadvise is
+    unavailable).
+    
+    Args:
+        fd: Open file descriptor
+    """
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def _dir_size_bytes(path: str) -> int:
+    """
+    Sum the sizes of the regular files in a directory.
+    
+    scandir reports the file type from the directory listing, so this
+    costs one stat per file rather than an existence check, an isfile
+    and a getsize each.
+    
+    Args:
+        path: Directory to measure
+        
+    Raises:
+        FileNotFoundError: If the directory does not exist
+    """
+    with os.scandir(path) as entries:
+        return sum(entry.stat().st_size for entry in entries if entry.is_file())
+
 
 class SSTableMetadata:
     """Metadata for an SSTable."""
     
-    def __init__(self, sstable_id: int, dirname: str, num_entries: int, min_key: str, max_key: str):
+    def __init__(self, sstable_id: int, dirname: str, num_entries: int, min_key: str, max_key: str,
+                 max_timestamp: Optional[int] = None, num_tombstones: Optional[int] = None):
         """
         Initialize SSTable metadata.
         
@@ -31,12 +95,16 @@ class SSTableMetadata:
             num_entries: Number of entries in the SSTable
             min_key: Smallest key in the SSTable
             max_key: Largest key in the SSTable
+            max_timestamp: Largest entry timestamp (None if unknown, e.g. old manifests)
+            num_tombstones: Number of deleted entries (None if unknown, e.g. old manifests)
         """
         self.sstable_id = sstable_id
         self.dirname = dirname
         self.num_entries = num_entries
         self.min_key = min_key
         self.max_key = max_key
+        self.max_timestamp = max_timestamp
+        self.num_tombstones = num_tombstones
     
     def to_dict(self) -> dict:
         """Convert metadata to dictionary."""
@@ -45,7 +113,9 @@ class SSTableMetadata:
             "dirname": self.dirname,
             "num_entries": self.num_entries,
             "min_key": self.min_key,
-            "max_key": self.max_key
+            "max_key": self.max_key,
+            "max_timestamp": self.max_timestamp,
+            "num_tombstones": self.num_tombstones
         }
     
     @staticmethod
@@ -56,7 +126,9 @@ class SSTableMetadata:
             dirname=data["dirname"],
             num_entries=data["num_entries"],
             min_key=data["min_key"],
-            max_key=data["max_key"]
+            max_key=data["max_key"],
+            max_timestamp=data.get("max_timestamp"),
+            num_tombstones=data.get("num_tombstones")
         )
 
 
@@ -81,6 +153,12 @@ class SSTable:
     BLOOM_FILTER_FILE = "bloom_filter.bf"
     SPARSE_INDEX_FILE = "sparse_index.idx"
     
+    # Encoded lines buffered per data-file write when streaming entries
+    WRITE_BATCH_LINES = 1024
+    
+    # Read buffer for streaming a whole data file (iter_entries/iter_records)
+    READ_BUFFER_BYTES = 1 << 20
+    
     def __init__(self, sstable_dir: str, sstable_id: int):
         """
         Initialize an SSTable.
@@ -105,20 +183,46 @@ class SSTable:
         self._mmap = None
         self._file = None
         self._read_lock = threading.Lock()
+        self._load_lock = threading.Lock()
     
-    def write(self, entries: List[Entry], block_size: int = 4) -> SSTableMetadata:
+    def write(self, entries: Iterable[Union[Entry, Record]], block_size: int = 4,
+              expected_entries: Optional[int] = None,
+              bypass_page_cache: bool = False) -> SSTableMetadata:
         """
         Write entries to the SSTable with Bloom filter and sparse index.
         
+        Entries may be any iterable, e.g. a compaction merge; they are
+        encoded and written in batches, so an iterator is never held in
+        memory in full. Records from iter_records() are also accepted;
+        their lines are written as-is.
+        
         Args:
-            entries: List of entries to write (must be sorted by key)
+            entries: Entries or records to write (must be sorted by key;
+                the order is asserted, so the check is skipped under -O)
             block_size: Index every Nth entry (default: 4)
+            expected_entries: Upper bound on the entry count, used to size
+                the Bloom filter (default: len(entries); an iterable
+                without a length is materialized when this is omitted)
+            bypass_page_cache: Sync the data file and drop it from the page
+                cache once written, for output that will not be read soon
+                (compaction), so it does not evict hot pages
             
         Returns:
             Metadata about the written SSTable
         """
-        if not entries:
+        if expected_entries is None:
+            if not isinstance(entries, (list, tuple)):
+                entries = list(entries)
+            expected_entries = len(entries)
+        
+        # Peek so an empty input fails before anything is created on disk
+        entries = iter(entries)
+        first = next(entries, None)
+        if first is None:
             raise ValueError("Cannot write empty SSTable")
+        records = chain((first,), entries)
+        if not isinstance(first, tuple):
+            records = ((e.key, e.timestamp, e.is_deleted, self._encode_entry(e)) for e in records)
         
         # Create SSTable directory
         os.makedirs(self.base_dir, exist_ok=True)
@@ -126,33 +230,56 @@ class SSTable:
         # Create Bloom filter with file path (uses mmap automatically)
         # and sparse index
         bloom_filter = BloomFilter(
-            expected_elements=len(entries), 
+            expected_elements=max(1, expected_entries),
             false_positive_rate=0.01,
             filepath=self.bloom_filter_filepath
         )
         sparse_index = SparseIndex(block_size=block_size)
-        
-        # Write entries to data file and build index/filter
-        with open(self.data_filepath, 'w') as f:
-            for i, entry in enumerate(entries):
-                # Track current byte offset
-                offset = f.tell()
-                
-                # Add to Bloom filter
-                bloom_filter.add(entry.key)
+        max_timestamp = 0
+        num_entries = 0
+        num_tombstones = 0
+        min_key = last_key = None
+        
+        # Encode entries and build index/filter in one pass. Byte offsets are
+        # summed from the encoded lines (text-mode tell() is slow), and lines
+        # are written, and their keys added to the Bloom filter,
+        # WRITE_BATCH_LINES at a time.
+        lines = []
+        keys = []
+        offset = 0
+        with open(self.data_filepath, 'wb') as f:
+            for key, timestamp, is_deleted, line in records:
+                if timestamp > max_timestamp:
+                    max_timestamp = timestamp
+                if is_deleted:
+                    num_tombstones += 1
                 
                 # Add to sparse index (every Nth entry)
-                if i % block_size == 0:
-                    sparse_index.add_entry(entry.key, offset)
+                if num_entries % block_size == 0:
+                    sparse_index.add_entry(key, offset)
+                
+                lines.append(line)
+                keys.append(key)
+                offset += len(line)
+                num_entries += 1
+                if min_key is None:
+                    min_key = key
+                assert last_key is None or last_key <= key, \
+                    f"SSTable entries out of key order: {last_key!r} > {key!r}"
+                last_key = key
                 
-                # Serialize entry as JSON
-                entry_dict = {
-                    "key": entry.key,
-                    "value": entry.value,
-                    "timestamp": entry.timestamp,
-                    "is_deleted": entry.is_deleted
-                }
-                f.write(json.dumps(entry_dict) + '\n')
+                if len(lines) >= self.WRITE_BATCH_LINES:
+                    f.write(b''.join(lines))
+                    lines.clear()
+                    bloom_filter.add_many(keys)
+                    keys.clear()
+            
+            f.write(b''.join(lines))
+            bloom_filter.add_many(keys)
+            
+            if bypass_page_cache:
+                f.flush()
+                _drop_page_cache(f.fileno(), sync=True)
         
         # Bloom filter is already saved (mmap-backed by pybloomfiltermmap3)
         # Just sync to ensure it's written to disk
@@ -165,9 +292,11 @@ class SSTable:
         self.metadata = SSTableMetadata(
             sstable_id=self.sstable_id,
             dirname=self.dirname,
-            num_entries=len(entries),
-            min_key=entries[0].key,
-            max_key=entries[-1].key
+            num_entries=num_entries,
+            min_key=min_key,
+            max_key=last_key,
+            max_timestamp=max_timestamp,
+            num_tombstones=num_tombstones
         )
         
         # Cache the components
@@ -176,22 +305,45 @@ class SSTable:
         
         return self.metadata
     
+    # The _ensure_* loaders use double-checked locking: readers and the
+    # prewarm worker may race to load the same component.
+    
     def _ensure_bloom_filter_loaded(self):
         """Lazy load Bloom filter."""
-        if self._bloom_filter is None and os.path.exists(self.bloom_filter_filepath):
-            self._bloom_filter = BloomFilter.load_from_file(self.bloom_filter_filepath)
+        if self._bloom_filter is None:
+            with self._load_lock:
+                if self._bloom_filter is None and os.path.exists(self.bloom_filter_filepath):
+                    self._bloom_filter = BloomFilter.load_from_file(self.bloom_filter_filepath)
     
     def _ensure_sparse_index_loaded(self):
         """Lazy load sparse index."""
-        if self._sparse_index is None and os.path.exists(self.sparse_index_filepath):
-            self._sparse_index = SparseIndex.load_from_file(self.sparse_index_filepath)
+        if self._sparse_index is None:
+            with self._load_lock:
+                if self._sparse_index is None and os.path.exists(self.sparse_index_filepath):
+                    self._sparse_index = SparseIndex.load_from_file(self.sparse_index_filepath)
     
     def _ensure_mmap_ready(self):
         """Ensure mmap is ready for reading."""
-        if self._mmap is None and os.path.exists(self.data_filepath):
-            self._file = open(self.data_filepath, 'r+b')
-            if os.path.getsize(self.data_filepath) > 0:
-                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._file is None:
+            with self._load_lock:
+                if self._file is None and os.path.exists(self.data_filepath):
+                    file = open(self.data_filepath, 'r+b')
+                    if os.path.getsize(self.data_filepath) > 0:
+                        self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._file = file
+    
+    def prewarm(self, use_bloom_filter: bool = True):
+        """
+        Load the components get() needs, so the first lookup does no loading.
+        
+        Args:
+            use_bloom_filter: Also load the Bloom filter (skip it for
+                SSTables whose lookups bypass the filter)
+        """
+        if use_bloom_filter:
+            self._ensure_bloom_filter_loaded()
+        self._ensure_sparse_index_loaded()
+        self._ensure_mmap_ready()
     
     def read_all(self) -> List[Entry]:
         """
@@ -219,18 +371,104 @@ class SSTable:
         for line in content.split('\n'):
             line = line.strip()
             if line:
-                entry_dict = json.loads(line)
-                entry = Entry(
-                    key=entry_dict["key"],
-                    value=entry_dict["value"],
-                    timestamp=entry_dict["timestamp"],
-                    is_deleted=entry_dict["is_deleted"]
-                )
-                entries.append(entry)
+                entries.append(self._entry_from_line(line))
         
         return entries
     
-    def get(self, key: str) -> Optional[Entry]:
+    def iter_entries(self, bypass_page_cache: bool = False) -> Iterator[Entry]:
+        """
+        Yield entries in key order without reading the whole SSTable.
+        
+        Reads through its own file handle rather than the shared mmap, so
+        a long-running consumer (e.g. compaction) neither holds the read
+        lock nor depends on this SSTable staying loaded.
+        
+        Args:
+            bypass_page_cache: Drop the file's pages from the page cache once
+                fully read (pages mapped by readers stay resident)
+        
+        Yields:
+            Entries in key order
+        """
+        if not os.path.exists(self.data_filepath):
+            return
+        with open(self.data_filepath, 'rb', buffering=self.READ_BUFFER_BYTES) as f:
+            _advise_sequential(f.fileno())
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield self._entry_from_line(line)
+            if bypass_page_cache:
+                _drop_page_cache(f.fileno())
+    
+    def iter_records(self, bypass_page_cache: bool = False) -> Iterator[Record]:
+        """
+        Yield (key, timestamp, is_deleted, line) records in key order.
+        
+        Like iter_entries(), but the value is left encoded inside the raw
+        line, so compaction can copy surviving lines to its output without
+        building an Entry or re-encoding JSON.
+        
+        Args:
+            bypass_page_cache: Drop the file's pages from the page cache once
+                fully read (pages mapped by readers stay resident)
+        
+        Yields:
+            Records in key order; line includes its trailing newline
+        """
+        if not os.path.exists(self.data_filepath):
+            return
+        with open(self.data_filepath, 'rb', buffering=self.READ_BUFFER_BYTES) as f:
+            _advise_sequential(f.fileno())
+            for line in f:
+                if not line.strip():
+                    continue
+                if not line.endswith(b'\n'):
+                    line += b'\n'
+                entry_dict = _json_loads(line)
+                yield (entry_dict["key"], entry_dict["timestamp"], entry_dict["is_deleted"], line)
+            if bypass_page_cache:
+                _drop_page_cache(f.fileno())
+    
+    @staticmethod
+    def _encode_entry(entry: Entry) -> bytes:
+        """
+        Encode one entry as a data-file line.
+        
+        Args:
+            entry: Entry to encode
+            
+        Returns:
+            UTF-8 JSON line including the trailing newline
+        """
+        entry_dict = {
+            "key": entry.key,
+            "value": entry.value,
+            "timestamp": entry.timestamp,
+            "is_deleted": entry.is_deleted
+        }
+        return (_json_dumps(entry_dict) + '\n').encode('utf-8')
+    
+    @staticmethod
+    def _entry_from_line(line) -> Entry:
+        """
+        Decode one data-file line.
+        
+        Args:
+            line: JSON line (str or bytes) without the trailing newline
+            
+        Returns:
+            The decoded entry
+        """
+        entry_dict = _json_loads(line)
+        return Entry(
+            key=entry_dict["key"],
+            value=entry_dict["value"],
+            timestamp=entry_dict["timestamp"],
+            is_deleted=entry_dict["is_deleted"]
+        )
+    
+    def get(self, key: str, use_bloom_filter: bool = True) -> Optional[Entry]:
         """
         Get an entry by key from the SSTable.
         
@@ -242,6 +480,8 @@ class SSTable:
         
         Args:
             key: The key to look up
+            use_bloom_filter: If False, skip step 1 (and never load the
+                filter); worthwhile where lookups are expected to hit
             
         Returns:
             The entry if found, None otherwise
@@ -250,10 +490,11 @@ class SSTable:
             return None
         
         # Check Bloom filter first (fast negative lookup)
-        self._ensure_bloom_filter_loaded()
-        if self._bloom_filter and not self._bloom_filter.might_contain(key):
-            # Definitely not in this SSTable
-            return None
+        if use_bloom_filter:
+            self._ensure_bloom_filter_loaded()
+            if self._bloom_filter and not self._bloom_filter.might_contain(key):
+                # Definitely not in this SSTable
+                return None
         
         # Load sparse index and mmap
         self._ensure_sparse_index_loaded()
@@ -318,7 +559,7 @@ class SSTable:
                 continue
             
             try:
-                entry_dict = json.loads(line)
+                entry_dict = _json_loads(line)
                 entry_key = entry_dict["key"]
                 
                 # Check if this is the key we're looking for
@@ -345,13 +586,10 @@ class SSTable:
     
     def size_bytes(self) -> int:
         """Get the total size of the SSTable (all files) in bytes."""
-        total_size = 0
-        if os.path.exists(self.base_dir):
-            for filename in os.listdir(self.base_dir):
-                filepath = os.path.join(self.base_dir, filename)
-                if os.path.isfile(filepath):
-                    total_size += os.path.getsize(filepath)
-        return total_size
+        try:
+            return _dir_size_bytes(self.base_dir)
+        except FileNotFoundError:
+            return 0
     
     def close(self):
         """Close mmap and file handles."""
@@ -428,6 +666,9 @@ class LazySSTable:
         self._access_count = 0
         self._access_lock = threading.Lock()
         self._loaded = False
+        
+        # On-disk size, measured once: SSTable files never change after writing
+        self._size_bytes: Optional[int] = None
     
     @property
     def metadata(self) -> Optional[SSTableMetadata]:
@@ -471,12 +712,13 @@ class LazySSTable:
             
             return self._sstable
     
-    def get(self, key: str) -> Optional[Entry]:
+    def get(self, key: str, use_bloom_filter: bool = True) -> Optional[Entry]:
         """
         Get an entry by key (loads SSTable on demand).
         
         Args:
             key: The key to look up
+            use_bloom_filter: Whether to probe the Bloom filter (see SSTable.get)
             
         Returns:
             Entry if found, None otherwise
@@ -493,7 +735,18 @@ class LazySSTable:
         if sstable is None:
             return None
         
-        return sstable.get(key)
+        return sstable.get(key, use_bloom_filter)
+    
+    def prewarm(self, use_bloom_filter: bool = True):
+        """
+        Load the SSTable and its lookup components ahead of the first read.
+        
+        Args:
+            use_bloom_filter: Also load the Bloom filter (see SSTable.prewarm)
+        """
+        sstable = self._ensure_loaded()
+        if sstable is not None:
+            sstable.prewarm(use_bloom_filter)
     
     def read_all(self) -> List[Entry]:
         """Read all entries (loads SSTable on demand)."""
@@ -506,6 +759,19 @@ class LazySSTable:
         
         return sstable.read_all()
     
+    def iter_entries(self, bypass_page_cache: bool = False) -> Iterator[Entry]:
+        """
+        Yield entries in key order (see SSTable.iter_entries).
+        
+        Streams from the data file without loading the Bloom filter,
+        sparse index or mmap, so compaction inputs are never loaded.
+        """
+        return SSTable(self.sstables_dir, self.sstable_id).iter_entries(bypass_page_cache)
+    
+    def iter_records(self, bypass_page_cache: bool = False) -> Iterator[Record]:
+        """Yield raw records in key order (see SSTable.iter_records)."""
+        return SSTable(self.sstables_dir, self.sstable_id).iter_records(bypass_page_cache)
+    
     def exists(self) -> bool:
         """Check if SSTable exists on disk."""
         base_dir = os.path.join(self.sstables_dir, self.dirname)
@@ -513,14 +779,14 @@ class LazySSTable:
         return os.path.exists(base_dir) and os.path.exists(data_filepath)
     
     def size_bytes(self) -> int:
-        """Get total size in bytes."""
-        base_dir = os.path.join(self.sstables_dir, self.dirname)
-        total_size = 0
-        if os.path.exists(base_dir):
-            for filename in os.listdir(base_dir):
-                filepath = os.path.join(base_dir, filename)
-                if os.path.isfile(filepath):
-                    total_size += os.path.getsize(filepath)
+        """Get total size in bytes (cached after the first measurement)."""
+        if self._size_bytes is not None:
+            return self._size_bytes
+        try:
+            total_size = _dir_size_bytes(os.path.join(self.sstables_dir, self.dirname))
+        except FileNotFoundError:
+            return 0  # Not written yet, or deleted; don't cache
+        self._size_bytes = total_size
         return total_size
     
     def close(self):
@@ -547,6 +813,7 @@ class LazySSTable:
         if os.path.exists(base_dir):
             import shutil
             shutil.rmtree(base_dir)
+        self._size_bytes = None  # The cached size no longer describes anything on disk
     
     def is_loaded(self) -> bool:
         """Check if the SSTable is currently loaded in memory."""
@@ -1,32 +1,324 @@
 """
 Write-Ahead Log implementation for durability.
+
+The log is a preallocated, memory-mapped file. Appends copy record bytes
+into the mapping at a write cursor; durability comes from msync of the
+dirty byte range instead of a write() + fsync() per append. The unused tail
+of the file is zero-filled, and op code 0 is reserved, so a reader stops
+cleanly at the end of the written region.
+
+The log is split into segments. New records always go to the file at
+`filepath`; sealing a segment renames it to `filepath.NNNNNN`. Once every
+record in a sealed segment has been flushed to an SSTable, the whole file
+is unlinked, so trimming the WAL never rewrites it.
+
+The highest timestamp known to be flushed is persisted next to the log in
+`filepath.ckpt`. Records at or below it may still sit in a partly covered
+segment; recovery skips them instead of replaying them.
 """
+import logging
 import os
+import json
+import mmap
+import struct
 import threading
-from typing import List
-from lsmkv.core.dto import WALRecord, OperationType
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from lsmkv.core.dto import WALRecord, WAL_HEADER, OP_PUT, OP_DELETE, OP_CODES_BY_NAME
+
+logger = logging.getLogger(__name__)
+
+# orjson is optional; only the one-time legacy JSON conversion parses JSON
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# WALs written before the binary format were JSON lines; op codes never collide with '{'
+LEGACY_JSON_PREFIX = b'{'
+
+# Durability levels:
+# - sync:     copy into the mapping + msync before append returns (no loss on crash)
+# - periodic: copy into the mapping; background msync every flush interval
+#             (a crash loses at most one interval of acknowledged writes)
+# - async:    copy into the mapping, msync only on sync()/close()
+#             (survives process crashes; an OS crash loses unsynced writes)
+DURABILITY_LEVELS = ("sync", "periodic", "async")
+
+# Checkpoint file: one little-endian u64 timestamp
+CHECKPOINT_FORMAT = struct.Struct('<Q')
+
+# Decoded record as (operation, key, value, timestamp), without a WALRecord
+RawRecord = Tuple[int, str, Optional[str], int]
 
 
 class WAL:
     """Write-Ahead Log for ensuring durability of operations."""
 
-    def __init__(self, filepath: str):
+    # Wake the periodic flusher early once this many bytes are unsynced
+    FLUSH_BYTES = 1024 * 1024
+
+    # Preallocation: the file starts at INITIAL_SIZE and doubles on demand.
+    # A segment that would grow past SEGMENT_SIZE is sealed instead.
+    INITIAL_SIZE = 1024 * 1024
+    SEGMENT_SIZE = 64 * 1024 * 1024
+
+    # read_all_parallel splits segments larger than this into several chunks
+    PARALLEL_CHUNK_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, filepath: str, durability: str = "sync",
+                 flush_interval_ms: int = 10):
         """
         Initialize the WAL.
 
         Args:
             filepath: Path to the WAL file
+            durability: One of "sync", "periodic", "async" (default: "sync")
+            flush_interval_ms: Background flush interval for "periodic" durability
         """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability!r}")
+
         self.filepath = filepath
+        self.durability = durability
+        self.flush_interval_ms = flush_interval_ms
         self._lock = threading.Lock()
+
+        # Mapping state: bytes [0, _cursor) hold records, [_synced, _cursor) are not yet msynced
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._capacity = 0
+        self._cursor = 0
+        self._synced = 0
+
+        # Timestamp range of the records in the current segment (None if empty)
+        self._min_ts: Optional[int] = None
+        self._max_ts: Optional[int] = None
+
+        # Sealed segments, oldest first: (path, max timestamp)
+        self._sealed: List[Tuple[str, int]] = []
+        self._next_segment = 1
+
+        # Every record at or below this timestamp is in an SSTable
+        self.checkpoint_path = filepath + ".ckpt"
+        self.checkpoint = 0
+
         self._ensure_file_exists()
-    
+        self._load_checkpoint()
+        self._load_sealed()
+        self._open()
+
+        self._flush_wakeup = threading.Event()
+        self._stopped = False
+        self._flusher: Optional[threading.Thread] = None
+        if durability == "periodic":
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                name="wal-flusher",
+                daemon=True
+            )
+            self._flusher.start()
+
     def _ensure_file_exists(self):
         """Create the WAL file if it doesn't exist."""
         if not os.path.exists(self.filepath):
             os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
-            open(self.filepath, 'w').close()
-    
+            open(self.filepath, 'wb').close()
+
+    def _segment_path(self, number: int) -> str:
+        """Path of sealed segment `number`."""
+        return f"{self.filepath}.{number:06d}"
+
+    def _load_checkpoint(self):
+        """Read the flushed-timestamp checkpoint; a missing or torn file means 0."""
+        try:
+            with open(self.checkpoint_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        if len(data) == CHECKPOINT_FORMAT.size:
+            self.checkpoint = CHECKPOINT_FORMAT.unpack(data)[0]
+
+    def _save_checkpoint(self, timestamp: int):
+        """Atomically replace the checkpoint file. Caller must hold the lock."""
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(CHECKPOINT_FORMAT.pack(timestamp))
+        os.replace(tmp_path, self.checkpoint_path)
+        self.checkpoint = timestamp
+
+    def _load_sealed(self):
+        """Find sealed segments left by a previous session."""
+        dirname = os.path.dirname(self.filepath) or "."
+        prefix = os.path.basename(self.filepath) + "."
+        numbers = []
+        for name in os.listdir(dirname):
+            suffix = name[len(prefix):]
+            if name.startswith(prefix) and suffix.isdigit():
+                numbers.append(int(suffix))
+
+        for number in sorted(numbers):
+            path = self._segment_path(number)
+            with open(path, 'rb') as f:
+                data = f.read()
+            _, _, max_ts = self._scan(data, len(data))
+            if max_ts is None or max_ts <= self.checkpoint:
+                # Empty, or fully flushed before a crash cut truncate_upto short
+                os.remove(path)
+                continue
+            self._sealed.append((path, max_ts))
+            self._next_segment = number + 1
+
+    def _open(self):
+        """
+        Map the WAL file and position the cursor after the last intact record.
+
+        A WAL in the old JSON-lines format is rewritten in the binary format
+        first. Any torn or corrupted bytes past the cursor are zeroed so later
+        appends can never be followed by stale data that parses as a record.
+        """
+        with open(self.filepath, 'rb') as f:
+            legacy = f.read(len(LEGACY_JSON_PREFIX)) == LEGACY_JSON_PREFIX
+        if legacy:
+            self._convert_legacy()
+            return
+
+        self._fd = os.open(self.filepath, os.O_RDWR | os.O_CREAT)
+        self._capacity = os.fstat(self._fd).st_size
+        if self._capacity > 0:
+            self._mm = mmap.mmap(self._fd, self._capacity)
+            end, self._min_ts, self._max_ts = self._scan(self._mm, self._capacity)
+            if end < self._capacity and self._mm[end] != 0:
+                logger.warning("Discarding corrupted WAL tail at offset %d", end)
+                self._mm[end:] = bytes(self._capacity - end)
+                self._mm.flush()
+            self._cursor = end
+            self._synced = end
+
+    def _unmap(self):
+        """Release the mapping and file descriptor. Caller must hold the lock."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._capacity = 0
+        self._cursor = 0
+        self._synced = 0
+        self._min_ts = None
+        self._max_ts = None
+
+    @staticmethod
+    def _scan(buf, limit: int) -> Tuple[int, Optional[int], Optional[int]]:
+        """
+        Walk record headers without decoding payloads.
+
+        Args:
+            buf: Buffer holding WAL bytes
+            limit: Number of bytes of buf to consider
+
+        Returns:
+            Tuple of (offset just past the last complete record,
+            min timestamp, max timestamp); timestamps are None if no records
+        """
+        offset = 0
+        min_ts = max_ts = None
+        header_size = WAL_HEADER.size
+        while offset + header_size <= limit:
+            op, key_length, value_length, timestamp = WAL_HEADER.unpack_from(buf, offset)
+            if op != OP_PUT and op != OP_DELETE:
+                break
+            end = offset + header_size + key_length + value_length
+            if end > limit:
+                break
+            if min_ts is None or timestamp < min_ts:
+                min_ts = timestamp
+            if max_ts is None or timestamp > max_ts:
+                max_ts = timestamp
+            offset = end
+        return offset, min_ts, max_ts
+
+    def _reserve(self, size: int):
+        """
+        Make room for size more bytes at the cursor. Caller must hold the lock.
+
+        Args:
+            size: Number of bytes about to be written
+        """
+        if self._fd is None:
+            # Reopened after close()/delete(): find the cursor again
+            self._ensure_file_exists()
+            self._open()
+
+        needed = self._cursor + size
+        if needed <= self._capacity:
+            return
+        if self._cursor > 0 and needed > self.SEGMENT_SIZE:
+            self._seal()
+            needed = size
+
+        step = min(max(self._capacity, self.INITIAL_SIZE), self.SEGMENT_SIZE)
+        new_capacity = max(needed, self._capacity + step)
+        granularity = mmap.ALLOCATIONGRANULARITY
+        new_capacity = -(-new_capacity // granularity) * granularity
+
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm.close()
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(self._fd, 0, new_capacity)
+        else:
+            os.ftruncate(self._fd, new_capacity)
+        self._mm = mmap.mmap(self._fd, new_capacity)
+        self._capacity = new_capacity
+
+    def _seal(self):
+        """
+        Close the current segment and start a new one. Caller must hold the lock.
+
+        The current file is trimmed to its records, msynced and renamed to the
+        next segment number; a fresh file takes its place at `filepath`.
+        """
+        if self._fd is None or self._cursor == 0:
+            return
+        self._msync()
+        end, max_ts = self._cursor, self._max_ts
+        os.ftruncate(self._fd, end)
+        self._unmap()
+
+        path = self._segment_path(self._next_segment)
+        self._next_segment += 1
+        os.rename(self.filepath, path)
+        open(self.filepath, 'wb').close()
+        self._fsync_dir()
+
+        self._sealed.append((path, max_ts))
+        self._open()
+
+    def _fsync_dir(self):
+        """Persist renames/unlinks in the WAL directory (no-op where unsupported)."""
+        try:
+            fd = os.open(os.path.dirname(self.filepath) or ".", os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def _msync(self):
+        """Flush the unsynced range of the mapping to disk. Caller must hold the lock."""
+        if self._mm is None or self._synced >= self._cursor:
+            return
+        # msync offsets must be aligned to the allocation granularity
+        start = self._synced - self._synced % mmap.ALLOCATIONGRANULARITY
+        self._mm.flush(start, self._cursor - start)
+        self._synced = self._cursor
+
     def append(self, record: WALRecord):
         """
         Append a record to the WAL.
@@ -35,67 +327,388 @@ class WAL:
         Args:
             record: The WAL record to append
         """
+        self.append_batch([record])
+
+    def append_batch(self, records: List[WALRecord]):
+        """
+        Append several records at once.
+
+        Under "sync" durability this is a single copy and a single msync.
+
+        Args:
+            records: WAL records to append, in order
+        """
+        if not records:
+            return
+        data = b''.join(record.serialize() for record in records)
+        batch_min = min(record.timestamp for record in records)
+        batch_max = max(record.timestamp for record in records)
+        with self._lock:
+            self._reserve(len(data))
+            end = self._cursor + len(data)
+            self._mm[self._cursor:end] = data
+            self._cursor = end
+            if self._min_ts is None or batch_min < self._min_ts:
+                self._min_ts = batch_min
+            if self._max_ts is None or batch_max > self._max_ts:
+                self._max_ts = batch_max
+            if self.durability == "sync":
+                self._msync()
+            elif self.durability == "periodic" and self._cursor - self._synced >= self.FLUSH_BYTES:
+                self._flush_wakeup.set()
+
+    def truncate_upto(self, timestamp: int):
+        """
+        Drop WAL data whose records all have timestamps <= timestamp.
+
+        The checkpoint is advanced first, so a crash before the unlinks
+        only leaves files that the next open (or recovery) skips. Sealed
+        segments that are fully covered are then unlinked. If the current
+        segment is fully covered it is emptied; if only some of its records
+        are covered it is sealed, so a later call can drop it whole.
+
+        Args:
+            timestamp: Every record at or below this timestamp is persisted elsewhere
+        """
+        with self._lock:
+            if timestamp > self.checkpoint:
+                self._save_checkpoint(timestamp)
+            dropped = False
+            while self._sealed and self._sealed[0][1] <= timestamp:
+                path, _ = self._sealed.pop(0)
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                dropped = True
+
+            if not self._sealed and self._max_ts is not None:
+                if self._max_ts <= timestamp:
+                    self._truncate_current()
+                elif self._min_ts <= timestamp:
+                    self._seal()
+                    dropped = False
+
+            if dropped:
+                self._fsync_dir()
+
+    def sync(self):
+        """Make all appended records durable."""
+        with self._lock:
+            self._msync()
+
+    def _flush_loop(self):
+        """Background flusher for "periodic" durability."""
+        interval = self.flush_interval_ms / 1000.0
+        while not self._stopped:
+            self._flush_wakeup.wait(interval)
+            self._flush_wakeup.clear()
+            try:
+                with self._lock:
+                    self._msync()
+            except (OSError, ValueError) as e:
+                logger.warning("Background WAL flush failed: %s", e)
+
+    def close(self):
+        """Stop the background flusher, make all appended records durable and unmap the file."""
+        self._stopped = True
+        self._flush_wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
         with self._lock:
-            with open(self.filepath, 'a') as f:
-                f.write(record.serialize())
-                f.flush()
-                os.fsync(f.fileno())
+            self._msync()
+            self._unmap()
 
     def read_all(self) -> List[WALRecord]:
         """
-        Read all records from the WAL.
+        Read all records from the WAL, oldest segment first.
 
         Returns:
             List of WAL records
         """
         with self._lock:
             records = []
-            with open(self.filepath, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            records.append(WALRecord.deserialize(line))
-                        except ValueError as e:
-                            print(f"Warning: Skipping corrupted WAL record: {e}")
+            for path, _ in self._sealed:
+                with open(path, 'rb') as f:
+                    records.extend(self._decode_records(f.read()))
+            records.extend(self._read_current())
             return records
 
-    def clear(self):
-        """Clear the WAL file."""
+    def read_all_parallel(self, workers: int = 4) -> List[WALRecord]:
+        """
+        Read all records like read_all(), decoding chunks on a thread pool.
+
+        Sealed segments are read concurrently, and segments larger than
+        PARALLEL_CHUNK_BYTES are split at record boundaries (found from the
+        length prefixes) so one big segment is decoded in pieces too.
+        Results are concatenated in log order.
+
+        Args:
+            workers: Number of decode threads
+
+        Returns:
+            List of WAL records
+        """
+        return self._read_parallel(self._decode_records, lambda records: records, workers)
+
+    def read_raw_parallel(self, workers: int = 4) -> List[RawRecord]:
+        """
+        Read all records like read_all_parallel(), as plain tuples.
+
+        Recovery only needs the fields, so this skips building a WALRecord
+        per entry.
+
+        Args:
+            workers: Number of decode threads
+
+        Returns:
+            List of (operation, key, value, timestamp) tuples
+        """
+        return self._read_parallel(
+            self._decode_raw,
+            lambda records: [(r.operation, r.key, r.value, r.timestamp) for r in records],
+            workers
+        )
+
+    def _read_parallel(self, decode, convert_tail, workers: int) -> list:
+        """
+        Shared body of read_all_parallel() and read_raw_parallel().
+
+        Args:
+            decode: Chunk decoder taking (data, start, end)
+            convert_tail: Converts WALRecords from a serial read of an
+                unmapped current segment into decode's output form
+            workers: Number of decode threads
+
+        Returns:
+            Decoded records in log order
+        """
+        def read_segment(path: str) -> bytes:
+            with open(path, 'rb') as f:
+                return f.read()
+
+        with self._lock:
+            # Without a mapping (closed WAL) the current segment is read serially
+            unmapped_tail = self._read_current() if self._mm is None else None
+
+            with ThreadPoolExecutor(max_workers=max(1, workers),
+                                    thread_name_prefix="wal-replay") as pool:
+                segments = list(pool.map(read_segment, [path for path, _ in self._sealed]))
+                if self._mm is not None:
+                    segments.append(self._mm[:self._cursor])
+
+                chunks = []
+                for data in segments:
+                    for start, end in self._chunk_bounds(data, self.PARALLEL_CHUNK_BYTES):
+                        chunks.append((data, start, end))
+
+                records = []
+                for part in pool.map(lambda chunk: decode(*chunk), chunks):
+                    records.extend(part)
+
+            if unmapped_tail is not None:
+                records.extend(convert_tail(unmapped_tail))
+            return records
+
+    @staticmethod
+    def _chunk_bounds(data: bytes, chunk_bytes: int) -> List[Tuple[int, int]]:
+        """
+        Split a segment into (start, end) ranges of roughly chunk_bytes each,
+        cutting only at record boundaries.
+
+        Args:
+            data: Raw segment contents
+            chunk_bytes: Target chunk size
+
+        Returns:
+            List of (start, end) byte ranges covering the records in order
+        """
+        if len(data) <= chunk_bytes:
+            return [(0, len(data))]
+        bounds = []
+        start = offset = 0
+        header_size = WAL_HEADER.size
+        limit = len(data)
+        while offset + header_size <= limit:
+            op, key_length, value_length, _ = WAL_HEADER.unpack_from(data, offset)
+            if op != OP_PUT and op != OP_DELETE:
+                break
+            offset += header_size + key_length + value_length
+            if offset - start >= chunk_bytes:
+                bounds.append((start, offset))
+                start = offset
+        # The remainder includes any torn tail so the decoder reports it
+        bounds.append((start, limit))
+        return bounds
+
+    def is_empty(self) -> bool:
+        """
+        Check whether the WAL holds no records, without reading it.
+
+        Returns:
+            True if no records have been written since the last clear
+        """
         with self._lock:
-            open(self.filepath, 'w').close()
+            if self._sealed:
+                return False
+            if self._mm is None and os.path.exists(self.filepath):
+                # Closed or never mapped: fall back to the file contents
+                with open(self.filepath, 'rb') as f:
+                    header = f.read(WAL_HEADER.size)
+                return len(header) == 0 or header[0] == 0
+            return self._cursor == 0
+
+    def _read_current(self) -> List[WALRecord]:
+        """
+        Decode every record in the current segment. Caller must hold the lock.
+
+        Returns:
+            List of WAL records
+        """
+        if self._mm is not None:
+            return self._decode_records(self._mm[:self._cursor])
+        if not os.path.exists(self.filepath):
+            return []
+        with open(self.filepath, 'rb') as f:
+            data = f.read()
+        if data.startswith(LEGACY_JSON_PREFIX):
+            return self._read_legacy_records(data)
+        return self._decode_records(data)
+
+    @staticmethod
+    def _decode_records(data: bytes, start: int = 0, end: Optional[int] = None) -> List[WALRecord]:
+        """
+        Decode binary WAL records.
+
+        A torn or corrupted record ends the scan: length-prefixed framing
+        cannot resynchronize past it, and everything before it is intact.
+
+        Args:
+            data: Raw segment contents
+            start: Offset of the first record to decode
+            end: Offset to stop at (default: end of data)
+
+        Returns:
+            List of WAL records
+        """
+        return [WALRecord(*raw) for raw in WAL._decode_raw(data, start, end)]
 
-    def replace_with_filtered(self, filter_fn):
+    @staticmethod
+    def _decode_raw(data: bytes, start: int = 0, end: Optional[int] = None) -> List[RawRecord]:
         """
-        Atomically read, filter, and rewrite the WAL.
-        Entire operation held under lock - prevents race with concurrent append().
-        
+        Decode binary WAL records into (operation, key, value, timestamp) tuples.
+
+        Same framing and torn-tail handling as WALRecord.deserialize(), with
+        the header parse inlined so the loop does no per-record calls
+        beyond unpack_from and the UTF-8 decodes.
+
         Args:
-            filter_fn: Callable(record) -> bool. Records where filter_fn returns True are KEPT.
+            data: Raw segment contents
+            start: Offset of the first record to decode
+            end: Offset to stop at (default: end of data)
+
+        Returns:
+            List of raw record tuples
+        """
+        records = []
+        append = records.append
+        unpack_from = WAL_HEADER.unpack_from
+        header_size = WAL_HEADER.size
+        view = memoryview(data)
+        limit = len(data)
+        offset = start
+        if end is None:
+            end = limit
+        try:
+            while offset < end and data[offset] != 0:
+                header_end = offset + header_size
+                if header_end > limit:
+                    raise ValueError("Truncated WAL record header")
+                operation, key_length, value_length, timestamp = unpack_from(data, offset)
+                key_end = header_end + key_length
+                value_end = key_end + value_length
+                if operation != OP_PUT and operation != OP_DELETE:
+                    raise ValueError(f"Unknown WAL op code: {operation}")
+                if value_end > limit:
+                    raise ValueError("Truncated WAL record payload")
+                if operation == OP_PUT:
+                    value = str(view[key_end:value_end], 'utf-8')
+                else:
+                    value = None
+                append((operation, str(view[header_end:key_end], 'utf-8'), value, timestamp))
+                offset = value_end
+        except (ValueError, UnicodeDecodeError) as e:
+            logger.warning("Stopping WAL replay at corrupted record (offset %d): %s", offset, e)
+        finally:
+            view.release()
+        return records
+
+    @staticmethod
+    def _read_legacy_records(data: bytes) -> List[WALRecord]:
         """
+        Decode a WAL written in the old JSON-lines format.
+
+        Args:
+            data: Raw WAL file contents
+
+        Returns:
+            List of WAL records
+        """
+        records = []
+        for line in data.decode('utf-8', errors='replace').splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = _json_loads(line)
+                records.append(WALRecord(
+                    operation=OP_CODES_BY_NAME[record["op"]],
+                    key=record["key"],
+                    value=record["value"],
+                    timestamp=record["ts"]
+                ))
+            except (ValueError, KeyError) as e:
+                logger.warning("Skipping corrupted WAL record: %s", e)
+        return records
+
+    def _convert_legacy(self):
+        """Atomically rewrite a JSON-lines WAL file in the binary format, then map it."""
+        with open(self.filepath, 'rb') as f:
+            records = self._read_legacy_records(f.read())
+        tmp_path = self.filepath + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b''.join(record.serialize() for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.filepath)
+        self._open()
+
+    def _truncate_current(self):
+        """Empty the current segment. Caller must hold the lock."""
+        self._unmap()
+        open(self.filepath, 'wb').close()
+        self._open()
+
+    def clear(self):
+        """Clear the WAL: remove sealed segments and empty the current one."""
         with self._lock:
-            records = []
-            with open(self.filepath, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            records.append(WALRecord.deserialize(line))
-                        except ValueError as e:
-                            print(f"Warning: Skipping corrupted WAL record: {e}")
-            
-            records_to_keep = [r for r in records if filter_fn(r)]
-            
-            tmp_path = self.filepath + ".tmp"
-            with open(tmp_path, 'w') as f:
-                for record in records_to_keep:
-                    f.write(record.serialize())
-                f.flush()
-                os.fsync(f.fileno())
-            os.replace(tmp_path, self.filepath)
+            for path, _ in self._sealed:
+                if os.path.exists(path):
+                    os.remove(path)
+            self._sealed = []
+            self._truncate_current()
 
     def delete(self):
-        """Delete the WAL file."""
+        """Delete the WAL file and all sealed segments."""
         with self._lock:
+            self._unmap()
+            for path, _ in self._sealed:
+                if os.path.exists(path):
+                    os.remove(path)
+            self._sealed = []
             if os.path.exists(self.filepath):
                 os.remove(self.filepath)
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+            self.checkpoint = 0
@@ -262,6 +262,22 @@ class TestBloomFilter:
         self.assert_true("100" in str_repr or "capacity" in str_repr, "String shows capacity")
         print(f"  String repr: {str_repr}")
     
+    def test_add_many(self):
+        """Test bulk insertion matches per-key insertion."""
+        print("\nTest 11: Bulk Add")
+        print("-" * 60)
+        
+        bf = BloomFilter(1000, 0.01)
+        keys = [f"bulk_{i}" for i in range(500)]
+        bf.add_many(keys)
+        bf.add_many([])
+        bf.add_many(f"gen_{i}" for i in range(10))
+        
+        self.assert_true(all(bf.might_contain(k) for k in keys), "All bulk-added keys found")
+        self.assert_true(bf.might_contain("gen_9"), "Keys from a generator added")
+        not_found = sum(not bf.might_contain(f"absent_{i}") for i in range(100))
+        self.assert_true(not_found >= 90, f"Most absent keys rejected ({not_found}/100)")
+    
     def run_all_tests(self):
         """Run all tests."""
         print("=" * 70)
@@ -277,6 +293,7 @@ class TestBloomFilter:
             self.test_empty_filter()
             self.test_special_characters()
             self.test_large_capacity()
+            self.test_add_many()
             self.test_save_and_load()
             self.test_copy_template()
             self.test_concurrent_lookups()
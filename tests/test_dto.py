@@ -9,7 +9,7 @@ import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from lsmkv.core.dto import Entry, WALRecord, GetResult, OperationType
+from lsmkv.core.dto import Entry, WALRecord, GetResult, OperationType, WAL_HEADER, OP_PUT, OP_DELETE, OP_CODES_BY_NAME
 
 
 class TestDTO:
@@ -122,14 +122,14 @@ class TestDTO:
         
         # PUT record
         put_record = WALRecord(OperationType.PUT, "key1", "value1", timestamp)
-        self.assert_true(put_record.operation == OperationType.PUT, "PUT operation set")
+        self.assert_true(put_record.operation == OP_PUT, "PUT operation set")
         self.assert_true(put_record.key == "key1", "Key set")
         self.assert_true(put_record.value == "value1", "Value set")
         self.assert_true(put_record.timestamp == timestamp, "Timestamp set")
         
         # DELETE record
         delete_record = WALRecord(OperationType.DELETE, "key2", None, timestamp)
-        self.assert_true(delete_record.operation == OperationType.DELETE, "DELETE operation set")
+        self.assert_true(delete_record.operation == OP_DELETE, "DELETE operation set")
         self.assert_true(delete_record.value is None, "DELETE has None value")
     
     def test_wal_record_serialization(self):
@@ -143,17 +143,16 @@ class TestDTO:
         put_record = WALRecord(OperationType.PUT, "mykey", "myvalue", timestamp)
         serialized = put_record.serialize()
         
-        self.assert_true(isinstance(serialized, str), "Serialization returns string")
-        self.assert_true("PUT" in serialized, "Contains operation type")
-        self.assert_true("mykey" in serialized, "Contains key")
-        self.assert_true("myvalue" in serialized, "Contains value")
-        self.assert_true(str(timestamp) in serialized, "Contains timestamp")
-        self.assert_true(serialized.endswith("\n"), "Ends with newline")
+        self.assert_true(isinstance(serialized, bytes), "Serialization returns bytes")
+        self.assert_true(b"mykey" in serialized, "Contains key")
+        self.assert_true(b"myvalue" in serialized, "Contains value")
+        self.assert_true(len(serialized) == WAL_HEADER.size + 5 + 7, "Header plus raw key/value bytes")
         
         # Deserialize
-        deserialized = WALRecord.deserialize(serialized)
+        deserialized, consumed = WALRecord.deserialize(serialized)
         
-        self.assert_true(deserialized.operation == OperationType.PUT, "Operation deserialized")
+        self.assert_true(consumed == len(serialized), "Whole record consumed")
+        self.assert_true(deserialized.operation == OP_PUT, "Operation deserialized")
         self.assert_true(deserialized.key == "mykey", "Key deserialized")
         self.assert_true(deserialized.value == "myvalue", "Value deserialized")
         self.assert_true(deserialized.timestamp == timestamp, "Timestamp deserialized")
@@ -168,13 +167,12 @@ class TestDTO:
         
         serialized = delete_record.serialize()
         
-        self.assert_true("DELETE" in serialized, "Contains DELETE operation")
-        self.assert_true("deleted_key" in serialized, "Contains key")
+        self.assert_true(b"deleted_key" in serialized, "Contains key")
         
         # Deserialize
-        deserialized = WALRecord.deserialize(serialized)
+        deserialized, _ = WALRecord.deserialize(serialized)
         
-        self.assert_true(deserialized.operation == OperationType.DELETE, "DELETE deserialized")
+        self.assert_true(deserialized.operation == OP_DELETE, "DELETE deserialized")
         self.assert_true(deserialized.key == "deleted_key", "Key deserialized")
         self.assert_true(deserialized.value is None or deserialized.value == "", "Value is None or empty")
     
@@ -185,23 +183,16 @@ class TestDTO:
         
         timestamp = 111111
         
-        # Record with pipes in value (pipes used as delimiter!)
-        # This is a critical edge case
-        record1 = WALRecord(OperationType.PUT, "key_with_pipe", "value|with|pipes", timestamp)
-        serialized1 = record1.serialize()
-        
-        # Deserialize should handle it
-        try:
-            deserialized1 = WALRecord.deserialize(serialized1)
-            # May have issues with pipe delimiter
-            print(f"  ⚠️  Pipe in value may cause issues: {deserialized1.value}")
-        except:
-            print(f"  ⚠️  Pipe delimiter conflict detected (expected)")
+        # Pipes and newlines need no escaping with length-prefixed framing
+        record1 = WALRecord(OperationType.PUT, "key|with|pipe", "value|with|pipes\n", timestamp)
+        deserialized1, _ = WALRecord.deserialize(record1.serialize())
+        self.assert_true(deserialized1.key == "key|with|pipe", "Key with pipes handled")
+        self.assert_true(deserialized1.value == "value|with|pipes\n", "Value with pipes/newline handled")
         
-        # Newlines, tabs (should be handled)
+        # Tabs
         record2 = WALRecord(OperationType.PUT, "key2", "value\twith\ttabs", timestamp)
         serialized2 = record2.serialize()
-        deserialized2 = WALRecord.deserialize(serialized2)
+        deserialized2, _ = WALRecord.deserialize(serialized2)
         self.assert_true(deserialized2.key == "key2", "Key with tabs handled")
     
     def test_wal_record_empty_values(self):
@@ -214,13 +205,13 @@ class TestDTO:
         # Empty key
         record1 = WALRecord(OperationType.PUT, "", "value", timestamp)
         serialized1 = record1.serialize()
-        deserialized1 = WALRecord.deserialize(serialized1)
+        deserialized1, _ = WALRecord.deserialize(serialized1)
         self.assert_true(deserialized1.key == "", "Empty key serialized")
         
         # Empty value
         record2 = WALRecord(OperationType.PUT, "key", "", timestamp)
         serialized2 = record2.serialize()
-        deserialized2 = WALRecord.deserialize(serialized2)
+        deserialized2, _ = WALRecord.deserialize(serialized2)
         self.assert_true(deserialized2.value == "" or deserialized2.value is None, "Empty value serialized")
     
     def test_get_result_found(self):
@@ -269,6 +260,12 @@ class TestDTO:
         
         self.assert_true(op1 != op2, "Different operations are different")
         self.assert_true(op1 == OperationType.PUT, "Enum equality works")
+
+        # Records normalize the enum to its integer op code
+        self.assert_true(OP_PUT != OP_DELETE, "Op codes are distinct")
+        record = WALRecord(OperationType.DELETE, "k", None, 1)
+        self.assert_true(record.operation == OP_DELETE, "Enum converted to op code")
+        self.assert_true(OP_CODES_BY_NAME == {"PUT": OP_PUT, "DELETE": OP_DELETE}, "Name lookup table bound")
     
     def test_entry_sorting(self):
         """Test that entries can be sorted."""
@@ -290,6 +287,14 @@ class TestDTO:
         # Sort by key explicitly
         sorted_by_key = sorted(entries, key=lambda e: e.key)
         self.assert_true(sorted_by_key[0].key == "key_a", "Explicit sort works")
+        
+        # Non-Entry operands are not comparable
+        self.assert_true(entries[0] != "key_c", "Entry never equals a plain string")
+        try:
+            entries[0] < "key_z"
+            self.assert_true(False, "Ordering against non-Entry raises TypeError")
+        except TypeError:
+            self.assert_true(True, "Ordering against non-Entry raises TypeError")
     
     def test_entry_timestamp_ordering(self):
         """Test entries with same key but different timestamps."""
@@ -320,14 +325,14 @@ class TestDTO:
         
         for i, original in enumerate(test_cases):
             serialized = original.serialize()
-            deserialized = WALRecord.deserialize(serialized)
+            deserialized, _ = WALRecord.deserialize(serialized)
             
             self.assert_true(deserialized.operation == original.operation, f"Case {i}: Operation matches")
             self.assert_true(deserialized.key == original.key, f"Case {i}: Key matches")
             self.assert_true(deserialized.timestamp == original.timestamp, f"Case {i}: Timestamp matches")
             
             # Value check (DELETE may have None or empty, empty strings may deserialize as empty or None)
-            if original.operation == OperationType.PUT and original.value:
+            if original.operation == OP_PUT and original.value:
                 match = deserialized.value == original.value
             else:
                 # For DELETE or empty values, be flexible
@@ -340,10 +345,11 @@ class TestDTO:
         print("\nTest 17: WALRecord Invalid Format")
         print("-" * 60)
         
+        valid = WALRecord(OperationType.PUT, "key", "value", 123).serialize()
         invalid_records = [
-            "INVALID",  # Not enough parts
-            "PUT|key",  # Missing parts
-            "INVALID|key|value|123",  # Invalid operation
+            b"INVALID",  # Shorter than header
+            valid[:-1],  # Truncated payload
+            b"\x09" + valid[1:],  # Unknown op code
         ]
         
         for invalid in invalid_records:
@@ -382,13 +388,22 @@ class TestDTO:
         self.assert_true(entry1.is_deleted == False, "is_deleted defaults to False")
         
         # Can create with keyword args
-        entry2 = Entry(key="k", value="v", timestamp=2000, is_deleted=True)
+        entry2 = Entry(key="k", value="v", timestamp=2000, is_deleted=False)
         self.assert_true(entry2.key == "k", "Keyword args work")
         
+        # Tombstones are entries whose value is None
+        self.assert_true(Entry("k", None, 3000).is_deleted, "None value is a tombstone")
+        forced = Entry("k", "v", 3000, is_deleted=True)
+        self.assert_true(forced.is_deleted and forced.value is None, "is_deleted=True drops the value")
+        self.assert_true(not Entry("k", "", 3000).is_deleted, "Empty string is not a tombstone")
+        
         # Can access as attributes
         key = entry2.key
         value = entry2.value
         self.assert_true(key == "k" and value == "v", "Attribute access works")
+        
+        # Slotted: no per-instance __dict__
+        self.assert_true(not hasattr(entry2, "__dict__"), "Entry has no per-instance __dict__")
     
     def test_wal_record_dataclass_behavior(self):
         """Test WALRecord dataclass behavior."""
@@ -397,11 +412,11 @@ class TestDTO:
         
         # Create with positional args
         record1 = WALRecord(OperationType.PUT, "key", "value", 1000)
-        self.assert_true(record1.operation == OperationType.PUT, "Positional args work")
+        self.assert_true(record1.operation == OP_PUT, "Positional args work")
         
         # Create with keyword args
         record2 = WALRecord(operation=OperationType.DELETE, key="k", value=None, timestamp=2000)
-        self.assert_true(record2.operation == OperationType.DELETE, "Keyword args work")
+        self.assert_true(record2.operation == OP_DELETE, "Keyword args work")
     
     def test_get_result_dataclass_behavior(self):
         """Test GetResult dataclass behavior."""
@@ -52,6 +52,12 @@ def test_basic_operations():
     assert result.found == False
     print("✓ DELETE operations successful")
     
+    # Allocation-free lookups
+    assert store.get_value("user:1") == "Alice"
+    assert store.get_value("user:2") is None
+    assert store.contains("user:3") and not store.contains("user:2")
+    print("✓ get_value/contains match get")
+    
     # Test UPDATE
     assert store.put("user:1", "Alice Updated") == True
     result = store.get("user:1")
@@ -184,6 +190,227 @@ def test_large_dataset():
     print("✓ Test 4 passed!\n")
 
 
+def test_group_commit():
+    """Test concurrent writers share WAL fsyncs without losing or reordering writes."""
+    print("Test 5: Group Commit")
+    print("-" * 40)
+    
+    import threading
+    
+    cleanup_test_data()
+    store = LSMKVStore(data_dir="./test_data", memtable_size=10000)
+    
+    fsync_batches = []
+    original_append_batch = store.wal.append_batch
+    
+    def counting_append_batch(records):
+        fsync_batches.append(len(records))
+        original_append_batch(records)
+    
+    store.wal.append_batch = counting_append_batch
+    
+    def writer(worker_id):
+        for i in range(50):
+            store.put(f"w{worker_id}_k{i}", f"v{i}")
+    
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert sum(fsync_batches) == 400
+    print(f"✓ 400 writes committed in {len(fsync_batches)} WAL fsyncs")
+    
+    for w in range(8):
+        for i in range(50):
+            assert store.get(f"w{w}_k{i}").value == f"v{i}"
+    
+    records = store.wal.read_all()
+    timestamps = [r.timestamp for r in records]
+    assert timestamps == sorted(timestamps)
+    print("✓ WAL order matches timestamp order")
+    
+    store.close()
+    try:
+        store.put("late", "write")
+        assert False, "put after close should fail"
+    except RuntimeError:
+        pass
+    print("✓ Writes rejected after close")
+    
+    # Adaptive delay: contended batches wait briefly for more writers
+    cleanup_test_data()
+    store = LSMKVStore(data_dir="./test_data", memtable_size=10000, group_commit_delay_us=20000)
+    store.GROUP_COMMIT_WAIT_BATCH = 2
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for w in range(8):
+        assert store.get(f"w{w}_k49").value == "v49"
+    store.close()
+    print("✓ Writes commit with a group-commit delay window")
+    
+    periodic = LSMKVStore(data_dir="./test_data", durability="periodic")
+    assert periodic._group_commit_delay == 0.0
+    periodic.close()
+    print("✓ No delay window without per-batch fsync")
+    
+    cleanup_test_data()
+    print("✓ Test 5 passed!\n")
+
+
+def test_wal_truncated_after_flush():
+    """Test flushed records leave the WAL without a rewrite and unflushed ones stay."""
+    print("Test 6: WAL Truncation After Flush")
+    print("-" * 40)
+    
+    cleanup_test_data()
+    store = LSMKVStore(data_dir="./test_data", memtable_size=1000)
+    store.put("flushed1", "v1")
+    store.put("flushed2", "v2")
+    store.flush()
+    store.put("pending", "v3")
+    
+    keys = [r.key for r in store.wal.read_all()]
+    assert keys == ["pending"]
+    assert 0 < store.wal.checkpoint < store.memtable_manager.unflushed_min_timestamp()
+    print("✓ Flushed records dropped from WAL and checkpointed")
+    
+    # Simulate a crash: reopen without close() so the WAL must be replayed
+    store.wal.close()
+    store2 = LSMKVStore(data_dir="./test_data", memtable_size=1000)
+    assert store2.get("flushed1").value == "v1"
+    assert store2.get("pending").value == "v3"
+    print("✓ SSTable and WAL data both visible after restart")
+    
+    store2.close()
+    cleanup_test_data()
+    print("✓ Test 6 passed!\n")
+
+
+def test_async_writes():
+    """Test put_async/delete_async return futures that resolve once committed."""
+    print("Test 7: Async Writes")
+    print("-" * 40)
+    
+    cleanup_test_data()
+    store = LSMKVStore(data_dir="./test_data", memtable_size=1000)
+    
+    futures = [store.put_async(f"key{i}", f"value{i}") for i in range(20)]
+    futures.append(store.delete_async("key0"))
+    assert all(f.result(timeout=5) is True for f in futures)
+    print("✓ Futures resolve to True")
+    
+    assert store.get("key0").found is False
+    assert store.get("key19").value == "value19"
+    print("✓ Writes visible once their futures resolve")
+    
+    try:
+        store.put_async("", "value")
+        assert False, "empty key should fail"
+    except ValueError:
+        pass
+    print("✓ Validation errors raised before queueing")
+    
+    # A bad key in the middle of a batch must not take the good writes down with it
+    good = [store.put_async(f"batch_good{i}", "v") for i in range(5)]
+    try:
+        store.put_async("batch_bad\ud800", "v")
+        assert False, "unencodable key should fail"
+    except ValueError:
+        pass
+    good += [store.put_async(f"batch_good{i}", "v") for i in range(5, 10)]
+    assert all(f.result(timeout=5) is True for f in good)
+    assert all(store.get(f"batch_good{i}").value == "v" for i in range(10))
+    print("✓ Invalid write in a batch fails alone")
+    
+    store.close()
+    try:
+        store.delete_async("key1")
+        assert False, "delete after close should fail"
+    except RuntimeError:
+        pass
+    print("✓ Async writes rejected after close")
+    
+    cleanup_test_data()
+    print("✓ Test 7 passed!\n")
+
+
+def test_unencodable_strings():
+    """Test keys and values that cannot be encoded as UTF-8 are rejected up front."""
+    print("Test 8: Unencodable Strings")
+    print("-" * 40)
+    
+    cleanup_test_data()
+    store = LSMKVStore(data_dir="./test_data", memtable_size=1000)
+    
+    for write in (lambda: store.put("bad\ud800", "value"),
+                  lambda: store.put("key", "bad\udfff"),
+                  lambda: store.delete("bad\ud800")):
+        try:
+            write()
+            assert False, "lone surrogate should fail"
+        except ValueError as e:
+            assert "UTF-8" in str(e)
+    print("✓ Lone surrogates raise ValueError")
+    
+    assert store.put("caf\u00e9", "\u2603") is True
+    assert store.get("caf\u00e9").value == "\u2603"
+    assert store.get("key").found is False
+    print("✓ Non-ASCII text still accepted; rejected writes not applied")
+    
+    store.close()
+    cleanup_test_data()
+    print("✓ Test 8 passed!\n")
+
+
+def test_mget():
+    """Test batched GET across memtables and SSTables."""
+    print("Test 9: Multi-Key Get")
+    print("-" * 40)
+    
+    cleanup_test_data()
+    store = LSMKVStore(data_dir="./test_data", memtable_size=1000)
+    
+    for i in range(10):
+        store.put(f"key{i}", f"disk{i}")
+    store.put("gone", "value")
+    store.flush()
+    store.put("key1", "mem1")       # newer value in the memtable
+    store.delete("key2")            # memtable tombstone shadows SSTable value
+    store.delete("gone")
+    store.flush()
+    store.put("key3", "mem3")
+    store.delete("key4")            # tombstone still in the active memtable
+    
+    keys = ["key0", "key1", "key2", "key3", "key4", "gone", "missing", "key0"]
+    results = store.mget(keys)
+    assert list(results) == ["key0", "key1", "key2", "key3", "key4", "gone", "missing"]
+    for key in results:
+        expected = store.get(key)
+        assert (results[key].found, results[key].value) == (expected.found, expected.value), key
+    assert results["key0"].value == "disk0"
+    assert results["key1"].value == "mem1"
+    assert results["key3"].value == "mem3"
+    assert not any(results[k].found for k in ("key2", "key4", "gone", "missing"))
+    print("✓ mget matches get for live, updated, deleted and missing keys")
+    
+    assert store.mget([]) == {}
+    try:
+        store.mget(["ok", ""])
+        assert False, "empty key should fail"
+    except ValueError:
+        pass
+    print("✓ Empty batch and key validation")
+    
+    store.close()
+    cleanup_test_data()
+    print("✓ Test 9 passed!\n")
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 40)
@@ -195,6 +422,11 @@ def main():
         test_wal_recovery()
         test_stats()
         test_large_dataset()
+        test_group_commit()
+        test_wal_truncated_after_flush()
+        test_async_writes()
+        test_unencodable_strings()
+        test_mget()
         
         print("=" * 40)
         print("All tests passed! ✓")
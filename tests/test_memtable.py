@@ -500,6 +500,54 @@ class TestMemtable:
         
         self.assert_true(len(memtable) == 10, "len() works with 10 entries")
     
+    def test_put_raw(self):
+        """Test put_raw inserts new keys and updates existing ones in place."""
+        print("\nTest 23: put_raw")
+        print("-" * 60)
+        
+        memtable = Memtable(max_size=100)
+        
+        memtable.put_raw("k1", "v1", 1000, False)
+        entry = memtable.get("k1")
+        self.assert_true(entry is not None and entry.value == "v1", "New key inserted")
+        
+        memtable.put_raw("k1", "v2", 2000, False)
+        self.assert_true(memtable.get("k1") is entry, "Existing entry reused")
+        self.assert_true(entry.value == "v2" and entry.timestamp == 2000, "Entry updated in place")
+        
+        memtable.put_raw("k1", None, 3000, True)
+        self.assert_true(memtable.get("k1") is None, "Tombstone hides key")
+        self.assert_true(memtable.get("k1", include_tombstones=True).is_deleted, "Tombstone stored")
+        
+        sorted_entry = memtable.get_all_entries()[0]
+        self.assert_true(sorted_entry is entry, "Skiplist and dict share the entry")
+        self.assert_true(len(memtable) == 1, "Updates do not add entries")
+    
+    def test_size_tracking(self):
+        """Test size_bytes follows inserts, overwrites, deletes and clear."""
+        print("\nTest 24: Size Tracking")
+        print("-" * 60)
+        
+        memtable = Memtable(max_size=100)
+        overhead = Memtable.ENTRY_OVERHEAD_BYTES
+        self.assert_true(memtable.size_bytes == 0, "Empty memtable has size 0")
+        
+        memtable.put(Entry("key", "value", 1000, False))
+        self.assert_true(memtable.size_bytes == 3 + 5 + overhead, "Insert adds key, value and overhead")
+        
+        memtable.put(Entry("key", "v", 2000, False))
+        self.assert_true(memtable.size_bytes == 3 + 1 + overhead, "Overwrite replaces the old value size")
+        
+        memtable.delete(Entry("key", None, 3000, True))
+        self.assert_true(memtable.size_bytes == 3 + overhead, "Tombstone keeps only key and overhead")
+        
+        memtable.put_raw("other", "abc", 4000, False)
+        memtable.put_raw("other", "abcdef", 5000, False)
+        self.assert_true(memtable.size_bytes == 2 * overhead + 3 + 5 + 6, "put_raw tracks size too")
+        
+        memtable.clear()
+        self.assert_true(memtable.size_bytes == 0, "Clear resets size")
+    
     def run_all_tests(self):
         """Run all tests."""
         print("=" * 70)
@@ -528,6 +576,8 @@ class TestMemtable:
         self.test_unicode_keys_and_values()
         self.test_clear_and_reuse()
         self.test_len_operator()
+        self.test_put_raw()
+        self.test_size_tracking()
         
         print("\n" + "=" * 70)
         print(f"RESULTS: {self.passed} passed, {self.failed} failed")
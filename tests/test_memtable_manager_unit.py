@@ -280,9 +280,9 @@ class TestMemtableManagerUnit:
         # DELETE
         manager.delete(Entry("del_key", None, 2000, True))
         
-        # GET should return None (tombstone filtered by memtable.get())
+        # GET returns the tombstone so the caller stops searching older data
         result = manager.get("del_key")
-        self.assert_true(result is None, "GET returns None for deleted key")
+        self.assert_true(result is not None and result.is_deleted, "GET returns tombstone for deleted key")
         
         # But entry exists in active with is_deleted=True
         self.assert_true("del_key" in manager.active.key_map, "Tombstone in active")
@@ -851,9 +851,9 @@ class TestMemtableManagerUnit:
         manager.put(Entry("key", "value", 1000, False))
         manager.delete(Entry("key", None, 2000, True))
         
-        # GET returns None (tombstone filtered)
+        # GET returns the tombstone (the store maps it to not found)
         result = manager.get("key")
-        self.assert_true(result is None, "Deleted key returns None")
+        self.assert_true(result is not None and result.is_deleted, "Deleted key returns tombstone")
         
         # Tombstone exists in active
         self.assert_true("key" in manager.active.key_map, "Tombstone in active")
@@ -923,7 +923,7 @@ class TestMemtableManagerUnit:
         
         # Verify state
         self.assert_true(manager.get("user:1").value == "Alice Updated", "Update worked")
-        self.assert_true(manager.get("user:2") is None, "Delete worked")
+        self.assert_true(manager.get("user:2").is_deleted, "Delete worked")
         self.assert_true(manager.get("user:3") is not None, "Unchanged entry present")
         self.assert_true(manager.get("user:4") is not None, "New entry present")
         
@@ -966,6 +966,121 @@ class TestMemtableManagerUnit:
         
         manager.close()
     
+    def test_force_flush_all_order(self):
+        """Test that force_flush_all drains everything oldest first."""
+        print("\nTest 31: Force Flush All Order")
+        print("-" * 60)
+        
+        flushed_keys = []
+        
+        def ordered_callback(memtable):
+            flushed_keys.append(memtable.get_all_entries()[0].key)
+        
+        manager = MemtableManager(
+            memtable_size=2,
+            max_immutable=10,
+            on_flush_callback=ordered_callback
+        )
+        
+        # Three immutables plus one entry left in active
+        for i in range(7):
+            manager.put(Entry(f"k{i}", f"v{i}", 1000 + i, False))
+        self.assert_true(len(manager.immutable_queue) == 3, "Three immutables queued")
+        
+        manager.force_flush_all()
+        
+        self.assert_true(flushed_keys == ["k0", "k2", "k4", "k6"], f"Flushed oldest first ({flushed_keys})")
+        self.assert_true(len(manager.immutable_queue) == 0, "Queue drained")
+        self.assert_true(len(manager.active) == 0, "Active emptied")
+        self.assert_true(manager.unflushed_min_timestamp() is None, "Nothing left unflushed")
+        
+        manager.close()
+    
+    def test_lock_free_get_sees_flushing(self):
+        """Test GET needs no lock and still sees memtables that are being flushed."""
+        print("\nTest 32: Lock-Free GET Sees Flushing Memtables")
+        print("-" * 60)
+        
+        seen_during_flush = []
+        manager = None
+        
+        def checking_callback(memtable):
+            seen_during_flush.append(manager.get("k0"))
+        
+        manager = MemtableManager(
+            memtable_size=2,
+            max_immutable=10,
+            on_flush_callback=checking_callback
+        )
+        for i in range(3):
+            manager.put(Entry(f"k{i}", f"v{i}", 1000 + i, False))
+        
+        # Readers must not block behind a writer holding the manager lock
+        results = []
+        with manager.lock:
+            reader = threading.Thread(target=lambda: results.append(manager.get("k2")))
+            reader.start()
+            reader.join(timeout=2)
+        self.assert_true(results and results[0].value == "v2", "GET does not take the manager lock")
+        
+        manager.force_flush_all()
+        self.assert_true(seen_during_flush[0] is not None and seen_during_flush[0].value == "v0",
+                         "Memtable visible while its flush runs")
+        self.assert_true(manager.get("k0") is None, "Flushed memtable dropped from read snapshot")
+        
+        manager.close()
+    
+    def test_put_raw_many(self):
+        """Test bulk replay inserts in order and rotates full memtables."""
+        print("\nTest 33: put_raw_many")
+        print("-" * 60)
+        
+        self.reset_flush_tracking()
+        manager = MemtableManager(
+            memtable_size=3,
+            max_immutable=1,
+            on_flush_callback=self.mock_flush_callback
+        )
+        
+        records = [(f"k{i}", f"v{i}", 1000 + i, False) for i in range(10)]
+        records.append(("k9", None, 2000, True))
+        manager.put_raw_many(iter(records))
+        
+        self.assert_true(manager.total_rotations == 3, f"Full memtables rotated ({manager.total_rotations})")
+        self.assert_true(manager.total_flushes == 3, f"Backed-up queue flushed ({manager.total_flushes})")
+        self.assert_true(manager.get("k9").is_deleted, "Later record wins")
+        
+        manager.close()
+    
+    def test_immutable_bytes_counter(self):
+        """Test the running immutable byte count matches the queue contents."""
+        print("\nTest 34: Immutable Byte Counter")
+        print("-" * 60)
+        
+        self.reset_flush_tracking()
+        manager = MemtableManager(
+            memtable_size=2,
+            max_immutable=3,
+            on_flush_callback=self.mock_flush_callback
+        )
+        
+        def queue_sum():
+            return sum(im.size_bytes for im in manager.immutable_queue)
+        
+        for i in range(9):
+            manager.put(Entry(f"key{i}", "x" * i, 1000 + i, False))
+        self.assert_true(manager._immutable_bytes == queue_sum(), "Counter follows rotations and pops")
+        
+        immutable = manager.flush_active_sync()
+        self.assert_true(manager._immutable_bytes == queue_sum(), "Counter follows flush_active_sync")
+        manager.remove_flushed_immutable(immutable)
+        self.assert_true(manager._immutable_bytes == queue_sum(), "Counter follows removal")
+        
+        manager.force_flush_all()
+        self.assert_true(manager._immutable_bytes == 0, "Counter reset after force flush")
+        
+        manager.close()
+    
     def run_all_tests(self):
         """Run all tests."""
         print("=" * 70)
@@ -1002,6 +1117,10 @@ class TestMemtableManagerUnit:
         self.test_rotation_sequence_numbers()
         self.test_mixed_operations_pattern()
         self.test_flush_workers_parallel_execution()
+        self.test_force_flush_all_order()
+        self.test_lock_free_get_sees_flushing()
+        self.test_put_raw_many()
+        self.test_immutable_bytes_counter()
         
         print("\n" + "=" * 70)
         print(f"RESULTS: {self.passed} passed, {self.failed} failed")
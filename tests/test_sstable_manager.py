@@ -7,12 +7,14 @@ import os
 import sys
 import shutil
 import tempfile
+import threading
 import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from lsmkv.core.sstable_manager import SSTableManager
 from lsmkv.core.dto import Entry
+from lsmkv.storage.sstable import SSTable
 
 
 class TestSSTableManager:
@@ -128,6 +130,10 @@ class TestSSTableManager:
         self.assert_true(l2_entries == 100000, f"L2 max entries: {l2_entries}")
         self.assert_true(l2_size == 104857600, f"L2 max size: {l2_size} bytes (100MB)")
         
+        # Deeper levels are filled in on first use
+        self.assert_true(manager._get_level_max_entries(5) == 1000 * 10 ** 5, "L5 max entries")
+        self.assert_true(manager._get_level_max_size_bytes(4) == 1048576 * 10 ** 4, "L4 max size")
+        
         manager.close()
     
     def test_l0_to_l1_compaction(self):
@@ -347,6 +353,18 @@ class TestSSTableManager:
         except ValueError as e:
             self.assert_true("No SSTables" in str(e), "Raises appropriate error")
         
+        # Empty list and empty iterator are both rejected without side effects
+        next_id = manager.level_manifest_manager.get_next_id()
+        on_disk = sorted(os.listdir(manager.sstables_dir))
+        for empty in ([], iter([])):
+            try:
+                manager.add_sstable(empty, level=0)
+                self.assert_true(False, "Should raise error on empty entries")
+            except ValueError:
+                self.assert_true(True, "Empty input raises ValueError")
+        self.assert_true(manager.level_manifest_manager.get_next_id() == next_id, "No SSTable ID consumed")
+        self.assert_true(sorted(os.listdir(manager.sstables_dir)) == on_disk, "Nothing written to disk")
+        
         manager.close()
     
     def test_stats(self):
@@ -372,6 +390,10 @@ class TestSSTableManager:
         self.assert_true(stats.get("l0_sstables") == 2, "L0 SSTable count correct")
         self.assert_true(stats.get("l1_sstables") == 1, "L1 SSTable count correct")
         self.assert_true(stats["total_sstable_size_bytes"] > 0, "Total size calculated")
+        self.assert_true(stats["l1_size_bytes"] == manager.levels[1][0].size_bytes(),
+                         "Level size matches SSTable size")
+        self.assert_true(stats["total_sstable_size_bytes"] == stats["l0_size_bytes"] + stats["l1_size_bytes"],
+                         "Total size is the sum of level sizes")
         
         manager.close()
     
@@ -598,6 +620,465 @@ class TestSSTableManager:
         
         manager.close()
     
+    def test_max_timestamp(self):
+        """Test max timestamp is tracked in metadata and survives reload."""
+        print("\nTest 20: Max Timestamp From Metadata")
+        print("-" * 60)
+        
+        sstables_dir = os.path.join(self.test_dir, "sstables_max_ts")
+        manifest_path = os.path.join(self.test_dir, "manifest_max_ts.json")
+        
+        manager1 = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10)
+        self.assert_true(manager1.get_max_timestamp() == 0, "Empty manager has max timestamp 0")
+        
+        older = self.create_entries(0, 5)
+        newer = self.create_entries(5, 5)
+        expected = max(e.timestamp for e in older + newer)
+        
+        metadata = manager1.add_sstable(newer, level=1, auto_compact=False)
+        manager1.add_sstable(older, level=0, auto_compact=False)
+        
+        self.assert_true(metadata.max_timestamp == max(e.timestamp for e in newer),
+                         "SSTable metadata records max timestamp")
+        self.assert_true(manager1.get_max_timestamp() == expected, "Max taken across levels")
+        manager1.close()
+        
+        manager2 = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10)
+        manager2.load_from_manifest()
+        self.assert_true(manager2.get_max_timestamp() == expected, "Max timestamp restored from manifest")
+        
+        # Manifests written before the field existed fall back to reading entries
+        for sstable in manager2.sstables:
+            sstable.metadata.max_timestamp = None
+        self.assert_true(manager2.get_max_timestamp() == expected, "Legacy metadata falls back to scan")
+        self.assert_true(all(sstable.metadata.max_timestamp is not None for sstable in manager2.sstables),
+                         "Scanned max timestamp cached in metadata")
+        
+        manager2.close()
+    
+    def test_level_stats_cached_size(self):
+        """Test level stats come from cached per-level totals."""
+        print("\nTest 21: Cached Level Totals")
+        print("-" * 60)
+        
+        # Own data dir: level manifests live next to sstables_dir
+        data_dir = os.path.join(self.test_dir, "level_stats")
+        sstables_dir = os.path.join(data_dir, "sstables")
+        manifest_path = os.path.join(data_dir, "manifest.json")
+        
+        manager = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10)
+        manager.add_sstable(self.create_entries(0, 10), level=0, auto_compact=False)
+        manager.add_sstable(self.create_entries(10, 10), level=0, auto_compact=False)
+        
+        stats = manager._get_level_stats(0)
+        self.assert_true(stats["num_sstables"] == 2, "Two SSTables in L0")
+        self.assert_true(stats["total_entries"] == 20, "Entries summed from level manifest")
+        self.assert_true(stats["total_size_bytes"] > 0, "Size measured from disk")
+        
+        sizes = [sstable._size_bytes for sstable in manager.levels[0]]
+        self.assert_true(all(size is not None and size > 0 for size in sizes), "Sizes cached per SSTable")
+        self.assert_true(sum(sizes) == stats["total_size_bytes"], "Cached sizes add up to level size")
+        self.assert_true(manager._get_level_stats(0) == stats, "Repeated stats are stable")
+        
+        manager.close()
+        
+        reloaded = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10)
+        reloaded.load_from_manifest()
+        self.assert_true(reloaded._get_level_stats(0) == stats, "Totals rebuilt on load")
+        
+        reloaded.remove_sstable(reloaded.levels[0][0].sstable_id)
+        remaining = reloaded._get_level_stats(0)
+        self.assert_true(remaining["total_entries"] == 10, "Removal updates entry total")
+        self.assert_true(remaining["total_size_bytes"] == reloaded.levels[0][0].size_bytes(),
+                         "Removal updates byte total")
+        
+        reloaded.close()
+    
+    def test_merge_sorted_runs(self):
+        """Test the k-way merge keeps the newest record per key in key order."""
+        print("\nTest 22: Merge Sorted Runs")
+        print("-" * 60)
+        
+        def record(key, timestamp, is_deleted=False):
+            return (key, timestamp, is_deleted, f"{key}@{timestamp}".encode())
+        
+        older = [record("a", 1), record("c", 1), record("d", 1)]
+        newer = [record("b", 2), record("c", 2, is_deleted=True), record("d", 2)]
+        
+        merged = list(SSTableManager._merge_sorted_runs([older, newer], drop_tombstones=False))
+        self.assert_true([r[0] for r in merged] == ["a", "b", "c", "d"], "One record per key, sorted")
+        self.assert_true(merged[2][2], "Newer tombstone shadows older value")
+        self.assert_true(merged[3][3] == b"d@2", "Newest line wins regardless of run order")
+        
+        merged = list(SSTableManager._merge_sorted_runs([iter(newer), iter(older)], drop_tombstones=True))
+        self.assert_true([r[0] for r in merged] == ["a", "b", "d"], "Tombstoned key dropped at bottom")
+        self.assert_true(merged[2][3] == b"d@2", "Run order does not affect winner")
+        
+        self.assert_true(list(SSTableManager._merge_sorted_runs([], drop_tombstones=True)) == [], "No runs merge to nothing")
+    
+    def test_streaming_write_and_iter(self):
+        """Test SSTables can be written from an iterator and read back lazily."""
+        print("\nTest 23: Streaming Write And Iteration")
+        print("-" * 60)
+        
+        sstables_dir = os.path.join(self.test_dir, "sstables_streaming")
+        entries = self.create_entries(0, 50)
+        
+        sstable = SSTable(sstables_dir, 1)
+        sstable.WRITE_BATCH_LINES = 8  # Force several batched writes
+        metadata = sstable.write(iter(entries), expected_entries=len(entries))
+        
+        self.assert_true(metadata.num_entries == 50, "Entry count tracked while streaming")
+        self.assert_true(metadata.min_key == entries[0].key and metadata.max_key == entries[-1].key,
+                         "Key range from first and last streamed entry")
+        self.assert_true(list(sstable.iter_entries()) == sstable.read_all() == entries,
+                         "iter_entries matches read_all")
+        self.assert_true(sstable.get(entries[37].key) == entries[37], "Sparse index offsets valid")
+        
+        records = list(sstable.iter_records())
+        self.assert_true([(r[0], r[1], r[2]) for r in records] ==
+                         [(e.key, e.timestamp, e.is_deleted) for e in entries], "iter_records fields")
+        copied = SSTable(sstables_dir, 4)
+        copied.write(iter(records), expected_entries=len(records))
+        with open(copied.data_filepath, 'rb') as f, open(sstable.data_filepath, 'rb') as g:
+            self.assert_true(f.read() == g.read(), "Records copied without re-encoding")
+        self.assert_true(copied.metadata.max_key == entries[-1].key, "Metadata from records")
+        copied.close()
+        
+        uncached = SSTable(sstables_dir, 3)
+        uncached.write(iter(entries), expected_entries=len(entries), bypass_page_cache=True)
+        self.assert_true(list(uncached.iter_entries(bypass_page_cache=True)) == entries,
+                         "Page-cache bypass leaves contents intact")
+        uncached.close()
+        
+        try:
+            SSTable(sstables_dir, 2).write(iter([]), expected_entries=0)
+            self.assert_true(False, "Empty stream rejected")
+        except ValueError:
+            self.assert_true(not os.path.exists(os.path.join(sstables_dir, "sstable_000002")),
+                             "Empty stream rejected before creating files")
+        
+        if __debug__:
+            unsorted = SSTable(sstables_dir, 4)
+            try:
+                unsorted.write(entries[1::-1])
+                self.assert_true(False, "Out-of-order input rejected")
+            except AssertionError:
+                self.assert_true(True, "Out-of-order input rejected")
+            unsorted.close()
+        
+        manager = SSTableManager(sstables_dir, os.path.join(self.test_dir, "manifest_streaming.json"))
+        manager.add_sstable(iter(entries[:10]), level=0, auto_compact=False, expected_entries=10)
+        lazy = manager.levels[0][0]
+        self.assert_true(list(lazy.iter_entries()) == entries[:10], "LazySSTable streams entries")
+        
+        sstable.close()
+        manager.close()
+    
+    def test_lock_free_get(self):
+        """Test lookups use the published snapshot and never wait on the lock."""
+        print("\nTest 24: Lock-Free Get")
+        print("-" * 60)
+        
+        data_dir = os.path.join(self.test_dir, "lock_free_get")
+        manager = SSTableManager(os.path.join(data_dir, "sstables"),
+                                 os.path.join(data_dir, "manifest.json"), max_l0_sstables=10)
+        
+        old = self.create_entries(0, 5)
+        new = [Entry(key=e.key, value="new", timestamp=e.timestamp + 100) for e in old[:2]]
+        manager.add_sstable(old, level=1, auto_compact=False)
+        manager.add_sstable(new, level=0, auto_compact=False)
+        
+        self.assert_true([s.sstable_id for _, _, s, _ in manager._read_snapshot] ==
+                         [manager.levels[0][0].sstable_id, manager.levels[1][0].sstable_id],
+                         "Snapshot in lookup order")
+        
+        # Out-of-range SSTables are pruned before LazySSTable.get is called
+        l0 = manager.levels[0][0]
+        accesses = l0._access_count
+        self.assert_true(manager.get(old[4].key).value == old[4].value, "Out-of-range key found in L1")
+        self.assert_true(l0._access_count == accesses, "L0 SSTable skipped by key range")
+        
+        holding = threading.Event()
+        release = threading.Event()
+        
+        def hold_lock():
+            with manager.lock:
+                holding.set()
+                release.wait(5)
+        
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        holding.wait(5)
+        try:
+            self.assert_true(manager.get(old[0].key).value == "new", "L0 shadows L1 while lock is held")
+            self.assert_true(manager.get(old[4].key).value == old[4].value, "Falls through to L1")
+            self.assert_true(manager.get("missing") is None, "Missing key returns None")
+        finally:
+            release.set()
+            holder.join()
+        
+        batch = manager.mget([old[0].key, old[4].key, "missing", old[0].key])
+        self.assert_true(set(batch) == {old[0].key, old[4].key}, "mget returns only found keys")
+        self.assert_true(batch[old[0].key].value == "new" and batch[old[4].key].value == old[4].value,
+                         "mget resolves each key like get")
+        self.assert_true(manager.mget([]) == {}, "Empty mget")
+        
+        manager.remove_sstable(manager.levels[0][0].sstable_id)
+        self.assert_true(manager.get(old[0].key).value == old[0].value, "Snapshot republished on removal")
+        
+        manager.close()
+    
+    def test_trivial_move(self):
+        """Test non-overlapping SSTables are moved down a level without a rewrite."""
+        print("\nTest 25: Trivial Move")
+        print("-" * 60)
+        
+        data_dir = os.path.join(self.test_dir, "trivial_move")
+        sstables_dir = os.path.join(data_dir, "sstables")
+        manifest_path = os.path.join(data_dir, "manifest.json")
+        manager = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10)
+        
+        manager.add_sstable(self.create_entries(0, 5, "b"), level=1, auto_compact=False)
+        manager.add_sstable(self.create_entries(0, 5, "a"), level=0, auto_compact=False)
+        manager.add_sstable(self.create_entries(0, 5, "c"), level=0, auto_compact=False)
+        l0_ids = sorted(s.sstable_id for s in manager.levels[0])
+        
+        self.assert_true(manager.levels[0][0].metadata.num_tombstones == 0, "Tombstones counted on write")
+        
+        tombstones = [Entry(key="a_0001", value=None, timestamp=1, is_deleted=True)]
+        overlapping = SSTable(sstables_dir, 999)
+        overlapping.write(self.create_entries(3, 5, "a"))
+        self.assert_true(not manager._can_trivially_move([overlapping], manager.levels[0], False),
+                         "Overlapping key ranges are merged")
+        deleted = SSTable(sstables_dir, 998)
+        deleted.write(tombstones)
+        self.assert_true(not manager._can_trivially_move([deleted], [], True),
+                         "Tombstones are not moved into the bottommost level")
+        self.assert_true(manager._can_trivially_move([deleted], [], False),
+                         "Tombstones are moved above the bottommost level")
+        overlapping.delete()
+        deleted.delete()
+        
+        manager._background_compact(*manager._take_compaction_snapshot(0))
+        
+        self.assert_true(not manager.levels[0], "L0 emptied")
+        self.assert_true(sorted(s.sstable_id for s in manager.levels[1] if s.sstable_id in l0_ids) == l0_ids,
+                         "L0 SSTables re-labelled as L1, not rewritten")
+        self.assert_true(len(manager.levels[1]) == 3, "L1 has 3 disjoint SSTables")
+        self.assert_true(manager.get("a_0002").value == "value_2", "Moved SSTable readable")
+        self.assert_true(manager._get_level_stats(1)["total_entries"] == 15, "Level totals refreshed")
+        manager.close()
+        
+        # Simulate a crash between the two manifest writes: listed at L0 and L1
+        manager = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10)
+        manager.load_from_manifest()
+        moved = manager.levels[1][-1].metadata
+        manager.level_manifest_manager.add_sstable(
+            dirname=moved.dirname, num_entries=moved.num_entries,
+            min_key=moved.min_key, max_key=moved.max_key,
+            level=0, sstable_id=moved.sstable_id
+        )
+        manager.close()
+        
+        manager = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10)
+        manager.load_from_manifest()
+        self.assert_true(not manager.levels.get(0) and len(manager.levels[1]) == 3,
+                         "Duplicate listing resolved to the deeper level")
+        self.assert_true(not manager.level_manifest_manager.get_level_entries(0),
+                         "Stale L0 manifest entry removed")
+        manager.close()
+    
+    def test_partial_compaction(self):
+        """Test compaction rewrites only the overlapping part of the next level."""
+        print("\nTest 26: Partial Compaction")
+        print("-" * 60)
+        
+        data_dir = os.path.join(self.test_dir, "partial_compaction")
+        manager = SSTableManager(os.path.join(data_dir, "sstables"),
+                                 os.path.join(data_dir, "manifest.json"), max_l0_sstables=10)
+        
+        for prefix in ("a", "c", "e"):
+            manager.add_sstable(self.create_entries(0, 5, prefix), level=2, auto_compact=False)
+        untouched = {s.sstable_id for s in manager.levels[2]
+                     if s.metadata.min_key[0] in ("a", "e")}
+        
+        updates = [Entry(key=e.key, value="new", timestamp=e.timestamp + 100)
+                   for e in self.create_entries(1, 2, "c")]
+        manager.add_sstable(updates, level=1, auto_compact=False)
+        manager.add_sstable(self.create_entries(0, 5, "g"), level=1, auto_compact=False)
+        
+        source, overlapping = manager._pick_compaction_inputs(1)
+        self.assert_true([s.metadata.min_key for s in source] == ["c_0001"], "Oldest L1 SSTable picked")
+        self.assert_true([s.metadata.min_key for s in overlapping] == ["c_0000"],
+                         "Only the overlapping L2 SSTable merged")
+        
+        metadata = manager._compact_level_to_next(1)
+        self.assert_true(metadata.num_entries == 5, "Merged SSTable has 5 entries")
+        self.assert_true(len(manager.levels[1]) == 1, "Other L1 SSTable left in place")
+        self.assert_true(len(manager.levels[2]) == 3, "L2 still has 3 SSTables")
+        self.assert_true(untouched <= {s.sstable_id for s in manager.levels[2]},
+                         "Non-overlapping L2 SSTables not rewritten")
+        self.assert_true(manager.get("c_0001").value == "new" and manager.get("c_0004").value == "value_4",
+                         "Merged SSTable has latest values")
+        self.assert_true(manager._get_level_stats(2)["total_entries"] == 15, "Level totals refreshed")
+        manifest = manager.level_manifest_manager
+        self.assert_true(sorted(e.sstable_id for e in manifest.get_level_entries(2)) ==
+                         sorted(s.sstable_id for s in manager.levels[2]), "L2 manifest swapped in place")
+        self.assert_true([e.min_key for e in manifest.get_level_entries(1)] == ["g_0000"],
+                         "Merged L1 SSTable removed from manifest")
+        
+        # L0 compacts all its SSTables, against the overlapping L1 SSTables only
+        manager.add_sstable(self.create_entries(0, 2, "g"), level=0, auto_compact=False)
+        manager.add_sstable(self.create_entries(3, 2, "g"), level=0, auto_compact=False)
+        source, overlapping = manager._pick_compaction_inputs(0)
+        self.assert_true(len(source) == 2 and len(overlapping) == 1, "All L0 plus overlapping L1")
+        
+        manager.close()
+    
+    def test_optimize_filters_for_hits(self):
+        """Test bottom-level lookups skip the Bloom filter when asked to."""
+        print("\nTest 27: Optimize Filters For Hits")
+        print("-" * 60)
+        
+        data_dir = os.path.join(self.test_dir, "filters_for_hits")
+        sstables_dir = os.path.join(data_dir, "sstables")
+        manifest_path = os.path.join(data_dir, "manifest.json")
+        manager = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10)
+        manager.add_sstable(self.create_entries(0, 5), level=0, auto_compact=False)
+        self.assert_true(all(use for *_, use in manager._read_snapshot), "Filters used by default")
+        manager.add_sstable(self.create_entries(5, 5), level=1, auto_compact=False)
+        manager.close()
+        
+        manager = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10,
+                                 optimize_filters_for_hits=True)
+        manager.load_from_manifest()
+        self.assert_true([use for *_, use in manager._read_snapshot] == [True, False],
+                         "Only the bottom level skips its filter")
+        
+        self.assert_true(manager.get("key_0007").value == "value_7", "Bottom-level hit found")
+        self.assert_true(manager.get("key_0002").value == "value_2", "L0 hit found")
+        self.assert_true(manager.get("key_0005x") is None, "Bottom-level miss returns None")
+        self.assert_true(manager.levels[1][0]._sstable._bloom_filter is None,
+                         "Bottom-level Bloom filter never loaded")
+        manager.close()
+    
+    def test_disjoint_level_bisect(self):
+        """Test lookups bisect into levels whose key ranges are disjoint."""
+        print("\nTest 28: Disjoint Level Bisect")
+        print("-" * 60)
+        
+        data_dir = os.path.join(self.test_dir, "level_bisect")
+        manager = SSTableManager(os.path.join(data_dir, "sstables"),
+                                 os.path.join(data_dir, "manifest.json"), max_l0_sstables=10)
+        
+        for prefix in ("e", "a", "c"):
+            manager.add_sstable(self.create_entries(0, 5, prefix), level=1, auto_compact=False)
+        old = self.create_entries(0, 3, "x")
+        new = [Entry(key=e.key, value="new", timestamp=e.timestamp + 100) for e in old[1:]]
+        manager.add_sstable(old, level=2, auto_compact=False)
+        manager.add_sstable(new, level=2, auto_compact=False)
+        
+        (pivots, run), (overlap_pivots, _) = manager._read_levels
+        self.assert_true(pivots == ["a_0000", "c_0000", "e_0000"], "Disjoint level indexed by min_key")
+        self.assert_true(overlap_pivots is None, "Overlapping level not indexed")
+        
+        accesses = {item[2].sstable_id: item[2]._access_count for item in run}
+        self.assert_true(manager.get("c_0003").value == "value_3", "Key found by bisection")
+        probed = [item[2].sstable_id for item in run if item[2]._access_count != accesses[item[2].sstable_id]]
+        self.assert_true(probed == [run[1][2].sstable_id], "Only the candidate SSTable probed")
+        self.assert_true(manager.get("b_0000") is None, "Key between ranges not found")
+        self.assert_true(manager.get("0") is None, "Key before all ranges not found")
+        self.assert_true(manager.get("x_0001").value == "new", "Overlapping level scanned newest first")
+        self.assert_true(manager.get("x_0000").value == "value_0", "Overlapping level falls through")
+        
+        manager.close()
+    
+    def test_prewarm(self):
+        """Test SSTables are loaded in the background after a reload when asked."""
+        print("\nTest 29: Prewarm After Load")
+        print("-" * 60)
+        
+        data_dir = os.path.join(self.test_dir, "prewarm")
+        sstables_dir = os.path.join(data_dir, "sstables")
+        manifest_path = os.path.join(data_dir, "manifest.json")
+        manager = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10)
+        manager.add_sstable(self.create_entries(0, 5), level=0, auto_compact=False)
+        manager.add_sstable(self.create_entries(5, 5), level=1, auto_compact=False)
+        manager.close()
+        
+        manager = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10)
+        manager.load_from_manifest()
+        self.assert_true(manager._prewarm_future is None, "No prewarm by default")
+        self.assert_true(manager.get_lazy_load_stats()["loaded_sstables"] == 0, "SSTables stay unloaded")
+        manager.close()
+        
+        manager = SSTableManager(sstables_dir, manifest_path, max_l0_sstables=10,
+                                 optimize_filters_for_hits=True, prewarm_sstables=True)
+        manager.load_from_manifest()
+        manager._prewarm_future.result(timeout=10)
+        l0, l1 = manager.levels[0][0], manager.levels[1][0]
+        self.assert_true(l0.is_loaded() and l1.is_loaded(), "All SSTables loaded in background")
+        self.assert_true(l0._sstable._sparse_index is not None and l0._sstable._mmap is not None,
+                         "Sparse index and mmap ready")
+        self.assert_true(l0._sstable._bloom_filter is not None, "L0 Bloom filter loaded")
+        self.assert_true(l1._sstable._bloom_filter is None, "Skipped bottom-level filter not loaded")
+        self.assert_true(manager.get("key_0007").value == "value_7", "Lookups served after prewarm")
+        manager.shutdown()
+        manager.close()
+    
+    def test_per_level_compaction_executors(self):
+        """Test each source level gets its own compaction worker."""
+        print("\nTest 30: Per-Level Compaction Executors")
+        print("-" * 60)
+        
+        data_dir = os.path.join(self.test_dir, "per_level_executors")
+        manager = SSTableManager(os.path.join(data_dir, "sstables"),
+                                 os.path.join(data_dir, "manifest.json"))
+        self.assert_true(manager._compaction_executors == {}, "No executors before first compaction")
+        l0 = manager._get_compaction_executor(0)
+        l1 = manager._get_compaction_executor(1)
+        self.assert_true(l0 is manager._get_compaction_executor(0), "Executor reused for same level")
+        self.assert_true(l0 is not l1, "Separate executor per level")
+        
+        worker_names = set()
+        block = threading.Event()
+        l1.submit(block.wait, 10)
+        l0.submit(lambda: worker_names.add(threading.current_thread().name)).result(timeout=10)
+        self.assert_true(worker_names.pop().startswith("compact-L0"), "L0 work not queued behind L1")
+        block.set()
+        
+        manager.shutdown()
+        manager.close()
+    
+    def test_background_deletion(self):
+        """Test compaction inputs are deleted in the background and waited for."""
+        print("\nTest 31: Background Deletion of Compaction Inputs")
+        print("-" * 60)
+        
+        data_dir = os.path.join(self.test_dir, "background_deletion")
+        sstables_dir = os.path.join(data_dir, "sstables")
+        manager = SSTableManager(sstables_dir, os.path.join(data_dir, "manifest.json"),
+                                 max_l0_sstables=2)
+        # Overlapping key ranges, so L0 -> L1 merges rather than moves
+        inputs = [manager.add_sstable(self.create_entries(0, 10), level=1, auto_compact=False).dirname,
+                  manager.add_sstable(self.create_entries(5, 10), level=0).dirname]
+        self.assert_true(manager.wait_for_compaction(timeout=10), "Compaction and deletions finish")
+        self.assert_true(not manager._pending_deletions, "No deletions left in flight")
+        self.assert_true(not any(os.path.exists(os.path.join(sstables_dir, d)) for d in inputs),
+                         "Input SSTable directories removed")
+        self.assert_true(manager.get("key_0005").value == "value_5", "Merged data readable")
+        
+        # After shutdown, compact() deletes its inputs inline
+        manager.shutdown()
+        inputs = [s.dirname for sstables in manager.levels.values() for s in sstables]
+        inputs.append(manager.add_sstable(self.create_entries(20, 5), level=0, auto_compact=False).dirname)
+        metadata = manager.compact()
+        self.assert_true(not any(os.path.exists(os.path.join(sstables_dir, d)) for d in inputs),
+                         "compact() after shutdown removes input directories")
+        self.assert_true(os.path.exists(os.path.join(sstables_dir, metadata.dirname)), "Output kept")
+        manager.close()
+    
     def run_all_tests(self):
         """Run all tests."""
         print("=" * 70)
@@ -626,6 +1107,18 @@ class TestSSTableManager:
             self.test_get_all_entries()
             self.test_edge_case_all_deleted()
             self.test_property_access()
+            self.test_max_timestamp()
+            self.test_level_stats_cached_size()
+            self.test_merge_sorted_runs()
+            self.test_streaming_write_and_iter()
+            self.test_lock_free_get()
+            self.test_trivial_move()
+            self.test_partial_compaction()
+            self.test_optimize_filters_for_hits()
+            self.test_disjoint_level_bisect()
+            self.test_prewarm()
+            self.test_per_level_compaction_executors()
+            self.test_background_deletion()
             
         finally:
             self.teardown()
@@ -7,12 +7,13 @@ import os
 import sys
 import tempfile
 import shutil
+import struct
 import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from lsmkv.storage.wal import WAL
-from lsmkv.core.dto import WALRecord, OperationType
+from lsmkv.core.dto import WALRecord, OperationType, OP_PUT, OP_DELETE
 
 
 class TestWAL:
@@ -106,7 +107,7 @@ class TestWAL:
         self.assert_true(read_records[0].key == "key1", "First record correct")
         self.assert_true(read_records[1].key == "key2", "Second record correct")
         self.assert_true(read_records[2].key == "key3", "Third record correct")
-        self.assert_true(read_records[2].operation == OperationType.DELETE, "DELETE op preserved")
+        self.assert_true(read_records[2].operation == OP_DELETE, "DELETE op preserved")
     
     def test_clear_wal(self):
         """Test clearing WAL."""
@@ -115,6 +116,7 @@ class TestWAL:
         
         filepath = os.path.join(self.test_dir, f"test_{time.time()}.log")
         wal = WAL(filepath)
+        self.assert_true(wal.is_empty(), "New WAL reports empty")
         
         # Add records
         wal.append(WALRecord(OperationType.PUT, "key1", "value1", 1000))
@@ -122,12 +124,14 @@ class TestWAL:
         
         size_before = os.path.getsize(filepath)
         self.assert_true(size_before > 0, "WAL has content before clear")
+        self.assert_true(not wal.is_empty(), "WAL with records is not empty")
         
         # Clear
         wal.clear()
         
         size_after = os.path.getsize(filepath)
         self.assert_true(size_after == 0, "WAL empty after clear")
+        self.assert_true(wal.is_empty(), "Cleared WAL reports empty")
         
         # Read should return empty
         records = wal.read_all()
@@ -416,9 +420,9 @@ class TestWAL:
         
         final_state = {}
         for record in recovered_records:
-            if record.operation == OperationType.PUT:
+            if record.operation == OP_PUT:
                 final_state[record.key] = record.value
-            elif record.operation == OperationType.DELETE:
+            elif record.operation == OP_DELETE:
                 final_state.pop(record.key, None)
         
         self.assert_true("user:2" in final_state, "user:2 in final state")
@@ -504,6 +508,160 @@ class TestWAL:
         for i, ts in enumerate(timestamps):
             self.assert_true(records[i].timestamp == ts, f"Timestamp {ts} preserved exactly")
     
+    def test_torn_tail_and_legacy_format(self):
+        """Test torn final record is dropped and old JSON-lines WALs still replay."""
+        print("\nTest 21: Torn Tail and Legacy Format")
+        print("-" * 60)
+        
+        filepath = os.path.join(self.test_dir, "torn.log")
+        
+        # Simulate a crash mid-append: only part of the second record hits disk
+        intact = WALRecord(OperationType.PUT, "intact", "v1", 1000).serialize()
+        partial = WALRecord(OperationType.PUT, "torn", "v2", 2000).serialize()
+        with open(filepath, 'wb') as f:
+            f.write(intact + partial[:len(partial) // 2])
+        
+        wal = WAL(filepath)
+        records = wal.read_all()
+        self.assert_true(len(records) == 1, "Torn tail record dropped")
+        self.assert_true(records[0].key == "intact", "Records before tear preserved")
+        
+        # New appends land right after the intact record, over the torn bytes
+        wal.append(WALRecord(OperationType.PUT, "after", "v3", 3000))
+        wal.close()
+        records = WAL(filepath).read_all()
+        self.assert_true([r.key for r in records] == ["intact", "after"], "Append overwrites torn tail")
+        
+        legacy_path = os.path.join(self.test_dir, "legacy.log")
+        with open(legacy_path, 'w') as f:
+            f.write('{"op":"PUT","key":"k1","value":"v1","ts":10}\n')
+            f.write('{"op":"DELETE","key":"k2","value":null,"ts":20}\n')
+        
+        legacy = WAL(legacy_path).read_all()
+        self.assert_true(len(legacy) == 2, "Legacy JSON records read")
+        self.assert_true(legacy[1].operation == OP_DELETE, "Legacy DELETE preserved")
+    
+    def test_durability_levels(self):
+        """Test periodic/async durability buffer writes and sync() persists them."""
+        print("\nTest 22: Durability Levels")
+        print("-" * 60)
+        
+        filepath = os.path.join(self.test_dir, "periodic.log")
+        wal = WAL(filepath, durability="periodic", flush_interval_ms=60000)
+        wal.append(WALRecord(OperationType.PUT, "buffered", "v1", 1000))
+        
+        self.assert_true(len(wal.read_all()) == 1, "Unsynced record visible to read_all")
+        self.assert_true(len(WAL(filepath).read_all()) == 1, "Unsynced record visible through the page cache")
+        
+        wal.append(WALRecord(OperationType.PUT, "buffered2", "v2", 2000))
+        wal.sync()
+        self.assert_true(len(WAL(filepath).read_all()) == 2, "sync() persists buffered records")
+        wal.close()
+        
+        async_path = os.path.join(self.test_dir, "async.log")
+        async_wal = WAL(async_path, durability="async")
+        async_wal.append(WALRecord(OperationType.PUT, "k", "v", 1000))
+        self.assert_true(os.path.getsize(async_path) > 0, "Async append reaches the OS immediately")
+        async_wal.close()
+        
+        try:
+            WAL(os.path.join(self.test_dir, "bad.log"), durability="never")
+            self.assert_true(False, "Unknown durability rejected")
+        except ValueError:
+            self.assert_true(True, "Unknown durability rejected")
+    
+    def test_segments(self):
+        """Test sealing, truncation by timestamp and reopening sealed segments."""
+        print("\nTest 23: Segments")
+        print("-" * 60)
+        
+        filepath = os.path.join(self.test_dir, "segments", "wal.log")
+        wal = WAL(filepath)
+        for ts in (1000, 2000, 3000):
+            wal.append(WALRecord(OperationType.PUT, f"key_{ts}", "v", ts))
+        
+        # Partially covered current segment is sealed, not rewritten
+        wal.truncate_upto(2000)
+        self.assert_true(os.path.exists(filepath + ".000001"), "Partially flushed segment sealed")
+        self.assert_true(len(wal.read_all()) == 3, "Sealed segment still replayed")
+        
+        wal.append(WALRecord(OperationType.PUT, "key_4000", "v", 4000))
+        wal.close()
+        
+        reopened = WAL(filepath)
+        keys = [r.key for r in reopened.read_all()]
+        self.assert_true(keys == ["key_1000", "key_2000", "key_3000", "key_4000"],
+                         "Reopen reads sealed segments then current")
+        self.assert_true(not reopened.is_empty(), "Sealed segments count as non-empty")
+        
+        reopened.truncate_upto(3000)
+        self.assert_true(not os.path.exists(filepath + ".000001"), "Fully flushed segment unlinked")
+        self.assert_true([r.key for r in reopened.read_all()] == ["key_4000"], "Newer records kept")
+        
+        reopened.truncate_upto(4000)
+        self.assert_true(reopened.is_empty(), "Fully flushed current segment emptied")
+        reopened.close()
+    
+    def test_read_all_parallel(self):
+        """Test parallel replay matches read_all across segments and chunks."""
+        print("\nTest 24: Parallel Read")
+        print("-" * 60)
+        
+        filepath = os.path.join(self.test_dir, "parallel", "wal.log")
+        wal = WAL(filepath)
+        wal.PARALLEL_CHUNK_BYTES = 512
+        for i in range(300):
+            wal.append(WALRecord(OperationType.PUT, f"key{i:04d}", f"value{i}", 1000 + i))
+            if i == 100:
+                wal.truncate_upto(1050)  # seals the first segment
+        
+        serial = wal.read_all()
+        parallel = wal.read_all_parallel(workers=4)
+        self.assert_true(len(parallel) == 300, "All records read in parallel")
+        self.assert_true(parallel == serial, "Parallel order matches serial order")
+        
+        raw = [(r.operation, r.key, r.value, r.timestamp) for r in serial]
+        self.assert_true(wal.read_raw_parallel(workers=4) == raw, "Raw tuples match records")
+        
+        wal.close()
+        reopened = WAL(filepath)
+        self.assert_true(reopened.read_all_parallel() == serial, "Parallel read after reopen")
+        self.assert_true(reopened.read_raw_parallel() == raw, "Raw read after reopen")
+    
+    def test_checkpoint(self):
+        """Test the flushed-timestamp checkpoint is persisted and honoured on reopen."""
+        print("\nTest 25: Checkpoint")
+        print("-" * 60)
+        
+        filepath = os.path.join(self.test_dir, "checkpoint", "wal.log")
+        wal = WAL(filepath)
+        self.assert_true(wal.checkpoint == 0, "New WAL has checkpoint 0")
+        for ts in (1000, 2000, 3000):
+            wal.append(WALRecord(OperationType.PUT, f"key_{ts}", "v", ts))
+        wal.truncate_upto(2000)
+        wal.truncate_upto(1000)
+        self.assert_true(wal.checkpoint == 2000, "Checkpoint only moves forward")
+        wal.close()
+        
+        reopened = WAL(filepath)
+        self.assert_true(reopened.checkpoint == 2000, "Checkpoint survives reopen")
+        reopened.close()
+        
+        # A crash between the checkpoint write and the unlink leaves a covered segment
+        with open(filepath + ".ckpt", 'wb') as f:
+            f.write(struct.pack('<Q', 3000))
+        reopened = WAL(filepath)
+        self.assert_true(not os.path.exists(filepath + ".000001"), "Covered segment dropped on open")
+        self.assert_true(reopened.is_empty(), "Nothing left to replay")
+        reopened.delete()
+        self.assert_true(not os.path.exists(filepath + ".ckpt"), "delete() removes checkpoint")
+        
+        # A torn checkpoint file is ignored
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath + ".ckpt", 'wb') as f:
+            f.write(b'\x01\x02')
+        self.assert_true(WAL(filepath).checkpoint == 0, "Torn checkpoint reads as 0")
+    
     def run_all_tests(self):
         """Run all tests."""
         print("=" * 70)
@@ -533,6 +691,11 @@ class TestWAL:
             self.test_wal_corruption_handling()
             self.test_wal_file_permissions()
             self.test_wal_timestamp_preservation()
+            self.test_torn_tail_and_legacy_format()
+            self.test_durability_levels()
+            self.test_segments()
+            self.test_read_all_parallel()
+            self.test_checkpoint()
             
         finally:
             self.teardown()